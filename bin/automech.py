@@ -8,6 +8,8 @@
 import sys
 # import argparse
 from mechlib.filesys import prefix_fs
+from mechlib.filesys import lease
+from mechlib.filesys import ledger
 from mechlib.amech_io import parser as ioparser
 from mechlib.amech_io import printer as ioprinter
 from drivers import esdriver, thermodriver, ktpdriver, transdriver, procdriver
@@ -52,6 +54,10 @@ ioparser.run.check_inputs(
 
 # Build the Run-Save Filesystem Directories
 prefix_fs(INP_KEY_DCT['run_prefix'], INP_KEY_DCT['save_prefix'])
+if INP_KEY_DCT['job_ledger']:
+    ledger.activate(INP_KEY_DCT['run_prefix'])
+if INP_KEY_DCT['job_leases']:
+    lease.activate()
 
 # Run Drivers Requested by User
 ES_TSKS = TSK_LST_DCT.get('es')
@@ -62,6 +68,7 @@ if ES_TSKS is not None:
         ES_TSKS,
         SPC_DCT, GLOB_DCT, THY_DCT,
         INP_KEY_DCT['run_prefix'], INP_KEY_DCT['save_prefix'],
+        njobs=INP_KEY_DCT['es_njobs'],
         print_debug=INP_KEY_DCT['print_debug']
     )
     ioprinter.program_exit('es')
@@ -10,9 +10,26 @@
         (1) Search for electronic structure data in save filesystem
         (2) Write, Run, Parse electronic structure job(s) in run fs
         (3) Write final data into save filesystem
+
+    If more than one job is requested, the species of each task are run
+    concurrently on a pool of worker processes. Tasks are still executed in
+    the order given in the run.dat, so all species finish a task before any
+    species moves on to the next one.
+
+    If job leases are active, several instances of the driver can share the
+    same run list and prefixes: each instance claims a lease on running a
+    task for a species before running it, and waits on the species claimed
+    by the other instances before moving on to the next task. Species are
+    only skipped as done if they were finished by an instance running at
+    the same time (see filesys.lease.start_session).
 """
 
+import time
+import hashlib
+import traceback
+from autorun import execute_function_in_parallel
 from mechroutines.es import run_tsk
+from mechlib import filesys
 from mechlib.amech_io import parser
 from mechlib.amech_io import printer as ioprinter
 
@@ -21,7 +38,7 @@ def run(pes_rlst, spc_rlst,
         es_tsk_lst,
         spc_dct, glob_dct, thy_dct,
         run_prefix, save_prefix,
-        print_debug=False):
+        njobs=1, print_debug=False):
     """ Executes all electronic structure tasks.
 
         :param pes_rlst: species from PESs to run
@@ -46,6 +63,10 @@ def run(pes_rlst, spc_rlst,
         :type run_prefix: str
         :param save_prefix: root-path to the save-filesystem
         :type save_prefix: str
+        :param njobs: number of species to run concurrently for each task
+        :type njobs: int
+        :param print_debug: option to print extra debug information
+        :type print_debug: bool
     """
 
     # -------------------------------- #
@@ -56,45 +77,184 @@ def run(pes_rlst, spc_rlst,
     # Runs through PESs, then SPC
     run_rlst = parser.rlst.combine(pes_rlst, spc_rlst)
 
-    for (fml, pes_idx, subpes_idx), run_lst in run_rlst.items():
-
-        # Print what is being run PESs that are being run
-        ioprinter.runlst((fml, pes_idx, subpes_idx), run_lst)
-
-        # Initialize an empty ts_dct for the PES
-        ts_dct = None
-
-        # Loop over the tasks
-        for tsk_lst in es_tsk_lst:
-
-            # Build a TS dictionary and add it to the spc dct if needed
-            # will only build a ts dct for 1st ts task on the PES
-            if (fml != 'SPC' and tsk_lst[0] in ('ts', 'all')):
-                if ts_dct is None:
-                    ts_dct = parser.spc.ts_dct_from_estsks(
-                        pes_idx, es_tsk_lst, run_lst,
-                        thy_dct, spc_dct,
-                        run_prefix, save_prefix)
-                    spc_dct = parser.spc.combine_sadpt_spc_dcts(
-                        ts_dct, spc_dct, glob_dct)
-            ts_queue = tuple(x for x in ts_dct) if ts_dct is not None else ()
-
-            # Unpack the options
-            [obj, tsk, es_keyword_dct] = tsk_lst
-
-            # Build the queue of species based on user request
-            if obj == 'all':
-                obj_queue = parser.rlst.spc_queue(run_lst, fml) + ts_queue
-            elif obj == 'spc':
-                obj_queue = parser.rlst.spc_queue(run_lst, fml)
-            elif obj == 'ts':
-                obj_queue = ts_queue
-            elif obj == 'vdw':
-                obj_queue = ()
-
-            # Run the electronic structure task for all spc in queue
-            for spc_name in obj_queue:
+    # Join the other instances of the driver running against the prefixes,
+    # so that species they have finished in this session are skipped
+    filesys.lease.start_session(run_prefix)
+    try:
+        for (fml, pes_idx, subpes_idx), run_lst in run_rlst.items():
+
+            # Print what is being run PESs that are being run
+            ioprinter.runlst((fml, pes_idx, subpes_idx), run_lst)
+
+            # Initialize an empty ts_dct for the PES
+            ts_dct = None
+
+            # Loop over the tasks
+            for tsk_lst in es_tsk_lst:
+
+                # Build a TS dictionary and add it to the spc dct if needed
+                # will only build a ts dct for 1st ts task on the PES
+                if (fml != 'SPC' and tsk_lst[0] in ('ts', 'all')):
+                    if ts_dct is None:
+                        ts_dct = parser.spc.ts_dct_from_estsks(
+                            pes_idx, es_tsk_lst, run_lst,
+                            thy_dct, spc_dct,
+                            run_prefix, save_prefix)
+                        spc_dct = parser.spc.combine_sadpt_spc_dcts(
+                            ts_dct, spc_dct, glob_dct)
+                ts_queue = (
+                    tuple(x for x in ts_dct) if ts_dct is not None else ())
+
+                # Unpack the options
+                [obj, tsk, es_keyword_dct] = tsk_lst
+
+                # Build the queue of species based on user request
+                if obj == 'all':
+                    obj_queue = parser.rlst.spc_queue(run_lst, fml) + ts_queue
+                elif obj == 'spc':
+                    obj_queue = parser.rlst.spc_queue(run_lst, fml)
+                elif obj == 'ts':
+                    obj_queue = ts_queue
+                elif obj == 'vdw':
+                    obj_queue = ()
+
+                # Run the electronic structure task for all spc in queue
+                # that are not claimed by another instance of the driver,
+                # then wait on those that are (see _claim_queue)
+                lease_paths = {
+                    spc_name: filesys.lease.task_lease_path(
+                        run_prefix, _task_lease_name(tsk_lst, spc_name))
+                    for spc_name in obj_queue}
+                pending = obj_queue
+                while pending:
+                    leases, pending = _claim_queue(pending, lease_paths)
+                    try:
+                        ran_spc = _run_queue(
+                            tuple(leases), tsk, spc_dct,
+                            thy_dct, es_keyword_dct,
+                            run_prefix, save_prefix,
+                            njobs=njobs, print_debug=print_debug)
+                        for spc_name in ran_spc:
+                            leases[spc_name].mark_done()
+                    finally:
+                        for lease in leases.values():
+                            lease.release()
+                    if pending:
+                        ioprinter.info_message(
+                            f'Waiting on {tsk} for species run by other '
+                            f'instances: {", ".join(pending)}')
+                        time.sleep(filesys.lease.POLL_TIME)
+    finally:
+        filesys.lease.end_session()
+
+
+def _run_queue(obj_queue, tsk, spc_dct, thy_dct, es_keyword_dct,
+               run_prefix, save_prefix, njobs=1, print_debug=False):
+    """ Run a task for all of the species in a queue, concurrently
+        if more than one job is requested.
+
+        An error raised by the task for a species stops the run in both
+        cases: a worker stops at the species that failed and reports the
+        error, which is raised once all of the workers have finished.
+
+        :returns: the species the task was run for without an error
+        :rtype: tuple(str)
+    """
+
+    if njobs > 1 and len(obj_queue) > 1:
+        args = (tsk, spc_dct, thy_dct, es_keyword_dct,
+                run_prefix, save_prefix, print_debug)
+        ret_lst = execute_function_in_parallel(
+            _run_tsk_queue, tuple(enumerate(obj_queue)), args,
+            nprocs=njobs)
+        ran_spc = sum((ran for ran, _ in ret_lst), ())
+        errs = tuple(err for _, err in ret_lst if err is not None)
+        if errs:
+            raise RuntimeError(
+                f'Task {tsk} failed in a worker process:\n' +
+                '\n'.join(errs))
+    else:
+        ran_spc = ()
+        for spc_name in obj_queue:
+            run_tsk(tsk, spc_dct, spc_name,
+                    thy_dct, es_keyword_dct,
+                    run_prefix, save_prefix,
+                    print_debug=print_debug)
+            ran_spc += (spc_name,)
+
+    return ran_spc
+
+
+def _claim_queue(obj_queue, lease_paths):
+    """ Claim leases on running a task for the species in a queue.
+
+        Species whose lease is held by another instance of the driver are
+        left pending, so that the task is finished for all species before
+        the next task starts. Species marked as done by the instance that
+        ran them are dropped, and a pending species is claimed if its lease
+        is released without being marked as done, or expires because the
+        instance running it has died.
+
+        :param obj_queue: species to claim
+        :type obj_queue: tuple(str)
+        :param lease_paths: path to the lease file for each species
+        :type lease_paths: dict[str: str]
+        :returns: (started lease on each claimed species, pending species)
+        :rtype: (dict[str: filesys.lease.Lease], tuple(str))
+    """
+
+    leases, pending = {}, ()
+    for spc_name in obj_queue:
+        if filesys.lease.is_done(lease_paths[spc_name]):
+            continue
+        lease = filesys.lease.claim(lease_paths[spc_name])
+        if lease is None:
+            pending += (spc_name,)
+        elif filesys.lease.is_done(lease_paths[spc_name]):
+            # Finished by another instance just before it was claimed
+            lease.release()
+        else:
+            lease.start()
+            leases[spc_name] = lease
+
+    return leases, pending
+
+
+def _task_lease_name(tsk_lst, spc_name):
+    """ Name for the lease on running a task for a species, unique to the
+        task, its keywords, and the species
+    """
+    obj, tsk, es_keyword_dct = tsk_lst
+    key = repr((obj, tsk, sorted(es_keyword_dct.items()), spc_name))
+    return f'{tsk}-{hashlib.sha1(key.encode()).hexdigest()[:16]}'
+
+
+def _run_tsk_queue(tsk, spc_dct, thy_dct, es_keyword_dct,
+                   run_prefix, save_prefix, print_debug,
+                   obj_lst, output_queue=None):
+    """ Run a task for the subset of the species queue handed to a worker.
+
+        Each line of output is prefixed with the position of the species in
+        the full queue and its name so the log of each species can be
+        recovered from the interleaved output of all the workers.
+
+        :param obj_lst: (idx in queue, species name) for worker to run
+        :type obj_lst: tuple((int, str))
+        :returns: (species run without an error, traceback of the error
+            that stopped the worker or None)
+    """
+
+    ran_spc, err = (), None
+    try:
+        for idx, spc_name in obj_lst:
+            with ioprinter.prefixed_output(f'[es-{idx+1:03d} {spc_name}] '):
                 run_tsk(tsk, spc_dct, spc_name,
                         thy_dct, es_keyword_dct,
                         run_prefix, save_prefix,
                         print_debug=print_debug)
+            ran_spc += (spc_name,)
+    except Exception:  # pylint: disable=broad-except
+        err = f'{spc_name}: {traceback.format_exc()}'
+    finally:
+        # Always report back so the parent is not left waiting on the queue
+        output_queue.put(((ran_spc, err),))
@@ -13,6 +13,7 @@
 
 from mechroutines.ktp import tsk as ktp_tasks
 from mechroutines.ktp import label as ktp_label
+from mechroutines.models import build
 from mechlib.amech_io import parser
 from mechlib.amech_io import rate_paths
 from mechlib.amech_io import printer as ioprinter
@@ -57,6 +58,9 @@ def run(pes_rlst, pes_grp_dct,
     # Group the PESs into lists
     pes_grps_rlst = parser.rlst.pes_groups(pes_rlst, pes_grp_dct)
 
+    # Read the data for each species from the SAVE filesystem once per run
+    build.clear_data_cache()
+
     # --------------------------------------- #
     # LOOP OVER ALL OF THE SUBPES in PES_RLST #
     # --------------------------------------- #
@@ -79,9 +83,9 @@ def run(pes_rlst, pes_grp_dct,
             spc_mod_dct, spc_dct, glob_dct,
             run_prefix, save_prefix)
 
-        # ---------------------------------------- #
-        # WRITE AND RUN TASK FOR EACH PES IN GROUP #
-        # ---------------------------------------- #
+        # ---------------------------------- #
+        # WRITE TASK FOR EACH PES IN GROUP   #
+        # ---------------------------------- #
         for pesgrp_num, (pes_inf, rxn_lst) in enumerate(pes_grp_rlst.items()):
 
             # Print PES Channels that are being run
@@ -98,9 +102,15 @@ def run(pes_rlst, pes_grp_dct,
                     all_instab_chnls[pesgrp_num], label_dct,
                     rate_paths_dct, run_prefix, save_prefix)
 
-            # Run mess to produce rates (urrently nothing from tsk lst used)
-            if run_rate_tsk is not None:
-                ktp_tasks.run_messrate_task(rate_paths_dct, pes_inf)
+        # --------------------------------------------- #
+        # RUN TASK FOR ALL PESS IN GROUP CONCURRENTLY   #
+        # --------------------------------------------- #
+
+        # Run mess to produce rates
+        if run_rate_tsk is not None:
+            ktp_tasks.run_messrate_task(
+                rate_paths_dct, tuple(pes_grp_rlst.keys()),
+                nprocs=run_rate_tsk[-1]['nprocs'])
 
         # ---------------------------------------- #
         # FIT THE COMBINES RATES FOR ENTIRE GROUP  #
@@ -5,6 +5,7 @@
 
 from mechroutines.proc import run_tsk
 from mechroutines.proc import write_missing_data_report
+from mechroutines.proc import write_job_ledger_report
 from mechlib.amech_io import parser
 from mechlib.amech_io import printer as ioprinter
 
@@ -82,3 +83,6 @@ def run(pes_rlst, spc_rlst,
 
     # Write a report that details what data is missing
     write_missing_data_report(missing_data)
+
+    # Write a report of the electronic structure jobs, if they are recorded
+    write_job_ledger_report()
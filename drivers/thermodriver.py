@@ -18,6 +18,7 @@
 """
 
 from mechroutines.thermo import tsk as thermo_tasks
+from mechroutines.models import build
 from mechlib import filesys
 from mechlib.amech_io import writer
 from mechlib.amech_io import parser
@@ -82,6 +83,9 @@ def run(pes_rlst, spc_rlst,
     # RUN THE REQUESTED THERMDRIVER TASKS #
     # ----------------------------------- #
 
+    # Read the data for each species from the SAVE filesystem once per run
+    build.clear_data_cache()
+
     # Write and Run MESSPF inputs to generate the partition functions
     if write_messpf_tsk is not None:
         thermo_tasks.write_messpf_task(
@@ -119,7 +123,8 @@ def run(pes_rlst, spc_rlst,
         # Write the NASA polynomials in CHEMKIN format
         ckin_nasa_str_dct, ckin_path = thermo_tasks.nasa_polynomial_task(
             mdriver_path, spc_locs_dct, thm_paths_dct, spc_dct,
-            spc_mod_dct, spc_mods, sort_info_lst, ref_scheme)
+            spc_mod_dct, spc_mods, sort_info_lst, ref_scheme,
+            nprocs=run_fit_tsk[-1]['nprocs'])
 
         for idx, nasa_str in ckin_nasa_str_dct.items():
             ioprinter.print_thermo(
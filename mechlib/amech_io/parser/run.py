@@ -42,6 +42,9 @@ RUN_INP_VAL_DCT = {
     'out_spc': ((str,), ('csv',), 'csv'),
     'print_mech': ((bool,), (True, False), False),
     'print_debug': ((bool,), (True, False), False),
+    'es_njobs': ((int,), (), 1),
+    'job_ledger': ((bool,), (True, False), False),
+    'job_leases': ((bool,), (True, False), False),
     'run_prefix': ((str,), (), None),
     'save_prefix': ((str,), (), None)
 }
@@ -63,9 +66,11 @@ SUPP_OBJS = ('spc', 'ts')
 TSK_KEY_DCT = {
     # Electronic Structure Driver Tasks
     'init_geom': (('spc',), BASE),
-    'find_ts': (('spc', 'ts'), BASE + MREF + ('nobarrier',)),  # 're_id')),
+    'find_ts': (('spc', 'ts'), BASE + MREF + ('nobarrier',
+                                              'adapt_scan',)),  # 're_id')),
     'conf_pucker': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
-    'conf_samp': (('spc', 'ts'), BASE + ('cnf_range', 'sort', 'resave',)),
+    'conf_samp': (('spc', 'ts'), BASE + ('cnf_range', 'sort', 'resave',
+                                         'njobs',)),
     'conf_energy': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
     'conf_grad': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
     'conf_hess': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
@@ -73,14 +78,16 @@ TSK_KEY_DCT = {
     'conf_prop': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
     'conf_opt': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
     'hr_scan': (('spc', 'ts'), BASE + ('tors_model', 'resamp_min',
-                                       'cnf_range', 'sort',)),
+                                       'cnf_range', 'sort', 'njobs',
+                                       'full_sweep',)),
     'hr_grad': (('spc', 'ts'), BASE + ('tors_model', 'cnf_range', 'sort',)),
     'hr_hess': (('spc', 'ts'), BASE + ('tors_model', 'cnf_range', 'sort',)),
     'hr_energy': (('spc', 'ts'), BASE + ('tors_model', 'cnf_range', 'sort',)),
     'hr_vpt2': (('spc', 'ts'), BASE + ('tors_model', 'cnf_range', 'sort',)),
     'hr_reopt': (('spc', 'ts'), BASE + ('tors_model', 'hrthresh',
                                         'cnf_range', 'sort',)),
-    'tau_samp': (('spc', 'ts'), BASE + ('resave',)),
+    'tau_samp': (('spc', 'ts'), BASE + ('resave', 'pf_tol', 'njobs',
+                                        'seed')),
     'tau_energy': (('spc', 'ts'), BASE),
     'tau_grad': (('spc', 'ts'), BASE),
     'tau_hess': (('spc', 'ts'), BASE + ('hessmax',)),
@@ -101,6 +108,7 @@ TSK_KEY_DCT = {
     'enthalpy': (('spc', 'ts'), PRNT),
     'pf': (('spc', 'ts'), PRNT),
     'messpf_inp': (('spc', 'ts'), PRNT),
+    'tau_conv': (('spc', 'ts'), PRNT),
     'coeffs': (('spc', 'ts'), ()),
     # KTP/Therm
     'write_mess': ((), ('kin_model', 'spc_model', 'overwrite',
@@ -108,7 +116,7 @@ TSK_KEY_DCT = {
                         'cnf_range', 'sort')),
     'run_mess': ((), ('kin_model', 'spc_model', 'nprocs',
                       'cnf_range', 'sort')),
-    'run_fits': ((), ('kin_model', 'cnf_range', 'sort')),
+    'run_fits': ((), ('kin_model', 'cnf_range', 'sort', 'nprocs')),
 }
 
 # tsk: (object types, (allowed values), default)  # use functions for weird
@@ -131,10 +139,14 @@ TSK_VAL_DCT = {
                    ('1dhr', '1dhrf', '1dhrfa', 'mdhr', 'mdhrv'), '1dhr'),
     'resamp_min': ((bool,), (True, False), False),
     'hrthresh': ((float,), (), -0.2),
+    'full_sweep': ((bool,), (True, False), False),
     'potthresh': ((float,), (), 0.3),
     'rxncoord': ((str,), ('irc', 'auto'), 'auto'),
+    'adapt_scan': ((bool,), (True, False), False),
     'nobarrier': ((str,), ('pst', 'rpvtst', 'vrctst'), None),
     're_id': ((bool,), (True, False), False),
+    'pf_tol': ((float,), (), None),
+    'seed': ((int,), (), None),
     # Trans
     'njobs': ((int,), (), 1),
     'nsamp': ((int,), (), 1),
@@ -148,7 +160,7 @@ TSK_VAL_DCT = {
     # KTP/Therm
     'kin_model': ((str,), (), None),
     'spc_model': ((str,), (), None),
-    'nprocs': ((int,), (), 10),
+    'nprocs': ((int,), (), 1),
     'use_well_extension': ((bool,), (), False),
     'linked_pes': ((tuple,), (), None),
     'float_precision': ((str,), ('double', 'quadruple'), 'double'),
@@ -9,6 +9,7 @@ from mechlib.amech_io.printer._print import debug_message
 from mechlib.amech_io.printer._print import info_message
 from mechlib.amech_io.printer._print import error_message
 from mechlib.amech_io.printer._print import warning_message
+from mechlib.amech_io.printer._print import prefixed_output
 
 # General MechDriver Runtime Messages
 from mechlib.amech_io.printer._run import runlst
@@ -83,6 +84,7 @@ __all__ = [
     'info_message',
     'error_message',
     'warning_message',
+    'prefixed_output',
 
     # General Runtime Messages
     'runlst',
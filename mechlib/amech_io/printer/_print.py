@@ -2,6 +2,8 @@
   Various status messages
 """
 
+import sys
+import contextlib
 from mechlib.amech_io.printer._format import format_message
 
 
@@ -52,3 +54,42 @@ def warning_message(message_label, *args, newline=None, indent=None):
         print('WARNING: ', _msg, *args)
     else:
         print('WARNING: ', _msg)
+
+
+class _PrefixedStream():
+    """ Wraps an output stream so that every line written to it
+        starts with a fixed prefix.
+    """
+
+    def __init__(self, stream, prefix):
+        self.stream = stream
+        self.prefix = prefix
+        self._at_line_start = True
+
+    def write(self, string):
+        """ Write the string, adding the prefix to the start of each line
+        """
+        for line in string.splitlines(keepends=True):
+            if self._at_line_start:
+                self.stream.write(self.prefix)
+            self.stream.write(line)
+            self._at_line_start = line.endswith('\n')
+
+    def flush(self):
+        """ Flush the underlying stream
+        """
+        self.stream.flush()
+
+
+@contextlib.contextmanager
+def prefixed_output(prefix):
+    """ Within the context, prepend `prefix` to every line printed to
+        stdout. Used to label output of concurrently running workers.
+    """
+    _stdout = sys.stdout
+    sys.stdout = _PrefixedStream(_stdout, prefix)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        sys.stdout = _stdout
@@ -7,10 +7,18 @@ from mechlib.filesys._build import prefix_fs
 from mechlib.filesys._build import reaction_fs
 from mechlib.filesys._build import root_locs
 from mechlib.filesys._rct import rcts_cnf_fs
+from mechlib.filesys import cnfidx
+from mechlib.filesys import dedup
+from mechlib.filesys import lease
+from mechlib.filesys import ledger
+from mechlib.filesys import manifest
 from mechlib.filesys import mincnf
 from mechlib.filesys import models
+from mechlib.filesys import parsed
 from mechlib.filesys import read
 from mechlib.filesys import save
+from mechlib.filesys import scantab
+from mechlib.filesys import taupf
 
 
 __all__ = [
@@ -19,8 +27,16 @@ __all__ = [
     'reaction_fs',
     'root_locs',
     'rcts_cnf_fs',
+    'cnfidx',
+    'dedup',
+    'lease',
+    'ledger',
+    'manifest',
     'mincnf',
     'models',
+    'parsed',
     'read',
-    'save'
+    'save',
+    'scantab',
+    'taupf'
 ]
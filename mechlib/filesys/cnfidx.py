@@ -0,0 +1,249 @@
+"""
+  In-memory index of the conformers saved in a CONFS layer of the
+  save filesystem
+
+  The geometries and energies of the saved conformers are read once and
+  then kept up to date as new conformers are saved, so that the uniqueness
+  checks run after every optimization do not re-read the whole layer.
+
+  The index is keyed by the CONFS path and the energy theory locators.
+  It keeps the modification time of each ring directory, which changes
+  whenever a conformer is added to or removed from the ring. A lookup only
+  lists the ring directories whose time has changed, and then only reads
+  the conformers that are new to the index. Conformers are saved to new
+  directories, so the files of an indexed conformer are not checked again.
+"""
+
+import os
+import time
+import collections
+import autofile
+from mechlib.amech_io import printer as ioprinter
+
+
+# Modification times this recent may hide a later change with the same
+# stamp on filesystems with coarse time resolution, so always recheck them
+STAMP_RESOLUTION = 2.0
+
+# Wait time for energies of conformers whose geometry was just saved
+ENERGY_WAIT_TIME = 120.0
+
+# Number of indices (CONFS layers and levels of theory) kept in memory;
+# the least recently used index is dropped beyond this
+MAX_INDICES = 16
+
+_INDEX_DCT = collections.OrderedDict()
+
+
+def saved_info(cnf_save_fs, mod_thy_info, orig_locs=None):
+    """ Get the locs, geos and enes for the saved conformers
+        that have an energy at the given level of theory.
+
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :param mod_thy_info: theory info for the energies
+        :type mod_thy_info: tuple(str)
+        :param orig_locs: locs of a conformer to leave out of the lists
+        :type orig_locs: tuple(str)
+        :rtype: (list(tuple(str)), list(automol.geom object), list(float))
+    """
+
+    idx_dct = _synced_index(cnf_save_fs, mod_thy_info)
+
+    saved_locs, saved_geos, saved_enes = [], [], []
+    for locs, (geo, ene) in idx_dct['cnfs'].items():
+        if orig_locs is None or list(locs) != list(orig_locs):
+            saved_locs.append(list(locs))
+            saved_geos.append(geo)
+            saved_enes.append(ene)
+
+    return saved_locs, saved_geos, saved_enes
+
+
+def add(cnf_save_fs, mod_thy_info, locs, geo, ene):
+    """ Add a conformer just saved into the filesystem to the index
+        without having to read it back.
+
+        :param locs: locs of the saved conformer
+        :type locs: tuple(str)
+        :param geo: geometry of the saved conformer
+        :type geo: automol.geom object
+        :param ene: energy of the saved conformer
+        :type ene: float
+    """
+
+    key = _index_key(cnf_save_fs, mod_thy_info)
+    idx_dct = _INDEX_DCT.get(key)
+    if idx_dct is not None:
+        locs = tuple(locs)
+        idx_dct['cnfs'][locs] = (geo, ene)
+
+        # Other processes may have saved to the ring since the last sync,
+        # so relist it rather than just advancing its stamp
+        rid = locs[0]
+        ring_mtime = _mtime(cnf_save_fs[1].path([rid]))
+        if ring_mtime is not None:
+            idx_dct['pending'] = tuple(
+                pend_locs for pend_locs in idx_dct['pending']
+                if pend_locs[0] != rid)
+            idx_dct['pending'] += _sync_ring(
+                idx_dct, cnf_save_fs, mod_thy_info, rid)
+            idx_dct['stamp'][rid] = ring_mtime
+
+
+def clear():
+    """ Remove all of the conformer indices held in memory
+    """
+    _INDEX_DCT.clear()
+
+
+# Build and update the index
+def _synced_index(cnf_save_fs, mod_thy_info):
+    """ Get the index for the CONFS layer, reading any conformers
+        added to the filesystem since the index was last synced
+    """
+
+    key = _index_key(cnf_save_fs, mod_thy_info)
+    idx_dct = _INDEX_DCT.get(key)
+    if idx_dct is None:
+        idx_dct = {'stamp': {}, 'cnfs': {}, 'pending': ()}
+        _INDEX_DCT[key] = idx_dct
+        while len(_INDEX_DCT) > MAX_INDICES:
+            _INDEX_DCT.popitem(last=False)
+    else:
+        _INDEX_DCT.move_to_end(key)
+
+    # Drop the conformers of any rings removed from the filesystem
+    stamp = _stamp(cnf_save_fs)
+    for locs in tuple(idx_dct['cnfs']):
+        if locs[0] not in stamp:
+            del idx_dct['cnfs'][locs]
+
+    # Relist the rings whose directories have changed; the stamp is
+    # taken before listing, so a later change is seen by the next sync
+    changed_rids = tuple(
+        rid for rid, mtime in stamp.items()
+        if idx_dct['stamp'].get(rid) != mtime or not _stable_time(mtime))
+    pending = ()
+    for rid in changed_rids:
+        pending += _sync_ring(idx_dct, cnf_save_fs, mod_thy_info, rid)
+
+    # Recheck conformers of the other rings whose energies were not yet
+    # saved (those of the relisted rings were just read)
+    pending += _read_cnfs(
+        idx_dct,
+        tuple(locs for locs in idx_dct['pending']
+              if locs[0] in stamp and locs[0] not in changed_rids),
+        cnf_save_fs, mod_thy_info, wait=False)
+    idx_dct['pending'] = pending
+    idx_dct['stamp'] = stamp
+
+    return idx_dct
+
+
+def _sync_ring(idx_dct, cnf_save_fs, mod_thy_info, rid):
+    """ List the conformers of a ring, dropping those removed from the
+        filesystem and reading those new to the index. Returns the locs
+        for which no energy has been saved yet.
+    """
+
+    existing_locs = tuple(
+        tuple(locs) for locs in cnf_save_fs[-1].existing([rid]))
+    for locs in tuple(idx_dct['cnfs']):
+        if locs[0] == rid and locs not in existing_locs:
+            del idx_dct['cnfs'][locs]
+
+    new_locs = tuple(locs for locs in existing_locs
+                     if locs not in idx_dct['cnfs'])
+    return _read_cnfs(idx_dct, new_locs, cnf_save_fs, mod_thy_info)
+
+
+def _read_cnfs(idx_dct, locs_lst, cnf_save_fs, mod_thy_info, wait=True):
+    """ Read the geometries and energies of conformers into the index.
+        Returns the locs for which no energy has been saved yet.
+    """
+
+    pending = ()
+    for locs in locs_lst:
+        path = cnf_save_fs[-1].path(locs)
+        sp_save_fs = autofile.fs.single_point(path)
+        ene = None
+        if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
+            ene = sp_save_fs[-1].file.energy.read(mod_thy_info[1:4])
+        else:
+            ioprinter.info_message(
+                f'No energy saved in single point directory for {path}')
+            if wait:
+                ene = _wait_for_energy(
+                    cnf_save_fs, locs, sp_save_fs, mod_thy_info)
+
+        if ene is not None:
+            geo = cnf_save_fs[-1].file.geometry.read(locs)
+            idx_dct['cnfs'][locs] = (geo, ene)
+        else:
+            pending += (locs,)
+
+    return pending
+
+
+def _wait_for_energy(cnf_save_fs, locs, sp_save_fs, mod_thy_info):
+    """ Wait for the energy of a conformer whose geometry was saved
+        recently by another process
+    """
+
+    ene = None
+    geo_inf_obj = cnf_save_fs[-1].file.geometry_info.read(locs)
+    geo_end_time = geo_inf_obj.utc_end_time
+    current_time = autofile.schema.utc_time()
+    if (current_time - geo_end_time).total_seconds() < ENERGY_WAIT_TIME:
+        last_time = (current_time - geo_end_time).total_seconds()
+        wait_time = ENERGY_WAIT_TIME - last_time
+        ioprinter.info_message(
+            f'Geo was saved in the last {last_time:3.2f} seconds, '
+            f'waiting for {wait_time:3.2f} seconds')
+        time.sleep(wait_time)
+        if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
+            ene = sp_save_fs[-1].file.energy.read(mod_thy_info[1:4])
+            ioprinter.info_message('the energy is now found')
+        else:
+            ioprinter.info_message('waiting helped nothing')
+
+    return ene
+
+
+# Stamps to detect changes to the filesystem
+def _index_key(cnf_save_fs, mod_thy_info):
+    """ Key for the index of a CONFS layer at some level of theory
+    """
+    return (cnf_save_fs[0].path(), tuple(mod_thy_info[1:4]))
+
+
+def _stamp(cnf_save_fs):
+    """ Modification times of each of the ring directories of the CONFS
+        layer, which change whenever a conformer is added or removed
+    """
+
+    stamp = {}
+    if os.path.exists(cnf_save_fs[0].path()):
+        for rng_locs in cnf_save_fs[1].existing():
+            mtime = _mtime(cnf_save_fs[1].path(rng_locs))
+            if mtime is not None:
+                stamp[rng_locs[0]] = mtime
+
+    return stamp
+
+
+def _mtime(path):
+    """ Modification time of a directory (None if missing)
+    """
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _stable_time(mtime):
+    """ Assess if a modification time is old enough that a later change
+        would be guaranteed to change it
+    """
+    return time.time() - mtime > STAMP_RESOLUTION
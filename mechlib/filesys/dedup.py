@@ -0,0 +1,150 @@
+"""
+  Batched screening of conformer geometries for duplicates
+
+  Comparisons of a new geometry against every saved geometry with
+  automol.geom.is_unique scale poorly for species with many conformers.
+  Here the saved set is first reduced with NumPy to the candidates that
+  could possibly match, and only those are passed to the exact automol
+  comparison:
+
+    (1) energy window: the saved energies are compared in one shot
+    (2) distance fingerprints: the sorted interatomic distances of two
+        geometries that agree to within some threshold in their distance
+        matrices also agree to within that threshold element-wise, so any
+        saved geometry whose fingerprint differs by more than the
+        threshold (plus the relative tolerance of the allclose-style
+        comparison automol makes) cannot be similar and is dropped.
+
+  Both filters only remove geometries that the exact check would reject,
+  so the results match running automol.geom.is_unique over the full set.
+"""
+
+import functools
+import numpy
+import automol
+
+
+# Thresholds used by the conformer uniqueness checks
+DIST_THRESH = 0.3
+# Relative tolerance added by the (numpy.allclose) distance comparison
+DIST_RTOL = 1.0e-5
+COULOMB_RTOL = 1.0e-2
+GEO_ETHRESH = 1.0e-5
+SYM_ETHRESH = 1.0e-5
+
+
+def geo_unique(geo, ene, seen_geos, seen_enes, zrxn=None,
+               ethresh=GEO_ETHRESH):
+    """ Assess if a geometry is unique to the seen geometries: it is if no
+        seen energy is within ethresh of its energy, or if it differs from
+        all seen geometries in the distance (and torsion, for minima)
+        checks.
+
+        :param geo: geometry to assess
+        :type geo: automol.geom object
+        :param ene: energy of the geometry
+        :type ene: float
+        :param seen_geos: geometries to compare against
+        :type seen_geos: tuple(automol.geom object)
+        :param seen_enes: energies of the geometries to compare against
+        :type seen_enes: tuple(float)
+        :param zrxn: reaction object, if geometry is a transition state
+        :type zrxn: automol.reac.Reaction object
+        :rtype: bool
+    """
+
+    if zrxn is None:
+        check_dct = {'dist': DIST_THRESH, 'tors': None}
+    else:
+        check_dct = {'dist': DIST_THRESH}
+
+    unique = True
+    if energy_candidates(ene, seen_enes, ethresh).size > 0:
+        idxs = fingerprint_candidates(geo, seen_geos, DIST_THRESH)
+        if idxs.size > 0:
+            unique, _ = automol.geom.is_unique(
+                geo, [seen_geos[idx] for idx in idxs], check_dct=check_dct)
+
+    return unique
+
+
+def sym_unique(geo, ene, saved_geos, saved_enes, ethresh=SYM_ETHRESH):
+    """ Find a saved geometry that is symmetrically equivalent to the
+        geometry, comparing only to those with an energy within ethresh.
+
+        :param geo: geometry to assess
+        :type geo: automol.geom object
+        :param ene: energy of the geometry
+        :type ene: float
+        :param saved_geos: geometries to compare against
+        :type saved_geos: tuple(automol.geom object)
+        :param saved_enes: energies of the geometries to compare against
+        :type saved_enes: tuple(float)
+        :returns: index of the equivalent saved geometry, None if unique
+        :rtype: int
+    """
+
+    sym_idx = None
+    idxs = energy_candidates(ene, saved_enes, ethresh)
+    if idxs.size > 0:
+        _, like_idx = automol.geom.is_unique(
+            geo, [saved_geos[idx] for idx in idxs],
+            check_dct={'coulomb': COULOMB_RTOL})
+        if like_idx is not None:
+            sym_idx = int(idxs[like_idx])
+
+    return sym_idx
+
+
+def energy_candidates(ene, enes, ethresh):
+    """ Get the indices of the energies within ethresh of an energy
+
+        :rtype: numpy.ndarray
+    """
+
+    enes = numpy.asarray(enes, dtype=float)
+    if enes.size == 0:
+        return numpy.array([], dtype=int)
+
+    return numpy.flatnonzero(numpy.abs(enes - ene) < ethresh)
+
+
+def fingerprint_candidates(geo, geos, thresh):
+    """ Get the indices of the geometries whose sorted interatomic
+        distances all agree with those of geo to within thresh. Like the
+        exact check, the comparison is inclusive and allows the relative
+        tolerance DIST_RTOL, so a geometry exactly at the threshold is
+        kept as a candidate.
+
+        :rtype: numpy.ndarray
+    """
+
+    fpt = distance_fingerprint(geo)
+    fpts = [distance_fingerprint(geoi) for geoi in geos]
+    keep = [idx for idx, fpti in enumerate(fpts) if fpti.shape == fpt.shape]
+    if not keep:
+        return numpy.array([], dtype=int)
+
+    keep = numpy.array(keep, dtype=int)
+    kept_fpts = numpy.vstack([fpts[idx] for idx in keep])
+    diffs = numpy.abs(kept_fpts - fpt)
+    tols = thresh + DIST_RTOL * numpy.max(kept_fpts, axis=1, initial=0.0)
+    return keep[numpy.max(diffs, axis=1, initial=0.0) <= tols]
+
+
+@functools.lru_cache(maxsize=100000)
+def distance_fingerprint(geo):
+    """ Sorted vector of all interatomic distances of a geometry, which
+        is invariant to atom ordering
+
+        :param geo: geometry
+        :type geo: automol.geom object
+        :rtype: numpy.ndarray
+    """
+
+    xyzs = numpy.array(automol.geom.coordinates(geo), dtype=float)
+    dist_mat = numpy.linalg.norm(xyzs[:, None, :] - xyzs[None, :, :], axis=2)
+    fpt = numpy.sort(dist_mat[numpy.triu_indices(len(xyzs), k=1)])
+    fpt.flags.writeable = False
+
+    return fpt
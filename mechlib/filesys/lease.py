@@ -0,0 +1,365 @@
+"""
+  Leases on work in the run filesystem, for several instances of MechDriver
+  running against the same run and save prefixes (e.g., on separate nodes
+  sharing a filesystem)
+
+  A lease is a small file that is created atomically (O_CREAT | O_EXCL), so
+  only one process can hold it at a time. While the work runs, a thread in
+  the process that holds the lease touches the file every HEARTBEAT seconds.
+  A lease whose file has not been touched for TIMEOUT seconds belongs to a
+  process that has died, so it is considered stale and may be reclaimed by
+  another process. This replaces relying on the RUNNING status in the info
+  files alone, which can be read by two processes at the same time and is
+  left behind forever by a crashed process.
+
+  Work that has been finished is marked by a done file next to its lease,
+  written before the lease is released, so that other processes waiting on
+  the lease skip the work rather than claiming it again once it is free.
+  Done files only count for the session they were written in. A driver
+  joins the session of the instances already running against the run
+  prefix, or starts a new one if there are none (see start_session), so
+  running the same input again redoes the work rather than skipping it.
+
+  Leases are only taken once activated; otherwise claims always succeed
+  and no lease or done files are written.
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import threading
+
+
+# Seconds between heartbeats, and without a heartbeat until a lease expires
+HEARTBEAT = 60.0
+TIMEOUT = 600.0
+
+# Seconds to wait between checks on leases held by other processes
+POLL_TIME = 30.0
+
+JOB_LEASE_NAME = 'job.lease'
+DONE_SUFFIX = '.done'
+LEASE_DIR_NAME = 'LEASES'
+
+# Files of the session shared by the running instances of a driver
+SESSION_NAME = 'session.json'
+SESSION_LEASE_NAME = 'session.lease'
+INSTANCE_DIR_NAME = 'INSTANCES'
+
+# Seconds to wait between attempts to claim the lease on the session
+SESSION_POLL_TIME = 1.0
+
+_LEASES = {'active': False, 'session': None, 'instance': None}
+
+
+class Lease:
+    """ Lease held on some work by this process
+    """
+
+    def __init__(self, path):
+        """ :param path: path to the lease file, None for a lease that is
+                not written to the filesystem (leases not active)
+            :type path: str
+        """
+        self.path = path
+        self.token = uuid.uuid4().hex
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """ Start the heartbeat that keeps the lease from expiring
+        """
+        if self.path is not None and self._thread is None:
+            self._thread = threading.Thread(
+                target=self._heartbeat, daemon=True)
+            self._thread.start()
+
+    def mark_done(self):
+        """ Mark the work held by the lease as finished
+        """
+        if self.path is not None:
+            _write(done_path(self.path), self.token,
+                   {'session': _LEASES['session']})
+
+    def release(self):
+        """ Stop the heartbeat and remove the lease file, if it is still
+            the one written by this lease
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.path is not None and _lease_token(self.path) == self.token:
+            _remove(self.path)
+
+    def _heartbeat(self):
+        """ Touch the lease file until the lease is released
+        """
+        while not self._stop.wait(HEARTBEAT):
+            try:
+                os.utime(self.path)
+            except OSError:
+                break
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+
+def activate():
+    """ Start taking leases on work
+    """
+    _LEASES['active'] = True
+
+
+def deactivate():
+    """ Stop taking leases on work
+    """
+    _LEASES['active'] = False
+
+
+def is_active():
+    """ Assess if leases are being taken on work
+
+        :rtype: bool
+    """
+    return _LEASES['active']
+
+
+def start_session(run_prefix):
+    """ Join the session of the instances of the driver running against
+        the run prefix, or start a new session if none are running. The
+        instance is kept registered in the session until end_session.
+
+        :param run_prefix: root-path to the run-filesystem
+        :type run_prefix: str
+        :returns: id of the session, None if leases are not active
+        :rtype: str
+    """
+
+    if not is_active():
+        return None
+
+    lease_dir = os.path.join(run_prefix, LEASE_DIR_NAME)
+    inst_dir = os.path.join(lease_dir, INSTANCE_DIR_NAME)
+    os.makedirs(inst_dir, exist_ok=True)
+
+    session_lease = claim(os.path.join(lease_dir, SESSION_LEASE_NAME))
+    while session_lease is None:
+        time.sleep(SESSION_POLL_TIME)
+        session_lease = claim(os.path.join(lease_dir, SESSION_LEASE_NAME))
+
+    with session_lease:
+        # Remove the instances that have died, then join the session if
+        # any instances are left
+        inst_paths = tuple(
+            os.path.join(inst_dir, name) for name in os.listdir(inst_dir)
+            if name.endswith('.lease'))
+        for inst_path in inst_paths:
+            if not is_held(inst_path):
+                _remove(inst_path)
+        session_path = os.path.join(lease_dir, SESSION_NAME)
+        session = _read(session_path).get('session')
+        if session is None or not any(map(is_held, inst_paths)):
+            session = uuid.uuid4().hex
+            _write(session_path, session, {'session': session})
+
+        inst_lease = claim(
+            os.path.join(inst_dir, f'{uuid.uuid4().hex}.lease'))
+        inst_lease.start()
+
+    end_session()
+    _LEASES['session'] = session
+    _LEASES['instance'] = inst_lease
+
+    return session
+
+
+def end_session():
+    """ Leave the session joined by start_session
+    """
+    if _LEASES['instance'] is not None:
+        _LEASES['instance'].release()
+    _LEASES['session'] = None
+    _LEASES['instance'] = None
+
+
+def claim(path):
+    """ Try to claim a lease on some work. A stale lease left by a dead
+        process is broken and claimed.
+
+        :param path: path to the lease file
+        :type path: str
+        :returns: the lease (not yet started), None if held by another process
+        :rtype: Lease
+    """
+
+    if not is_active():
+        return Lease(None)
+
+    lease = Lease(path)
+    if not _create(path, lease.token):
+        if not (is_stale(path) and _break(path)):
+            return None
+        if not _create(path, lease.token):
+            return None
+
+    return lease
+
+
+def is_held(path):
+    """ Assess if a live (not stale) lease is held on some work
+
+        :param path: path to the lease file
+        :type path: str
+        :rtype: bool
+    """
+    age = _lease_age(path)
+    return age is not None and age < TIMEOUT
+
+
+def is_stale(path):
+    """ Assess if the lease on some work was left behind by a process
+        that is no longer sending heartbeats
+
+        :param path: path to the lease file
+        :type path: str
+        :rtype: bool
+    """
+    age = _lease_age(path)
+    return age is not None and age >= TIMEOUT
+
+
+def is_done(path):
+    """ Assess if the work of a lease has been marked as finished in the
+        current session
+
+        :param path: path to the lease file
+        :type path: str
+        :rtype: bool
+    """
+    done_dct = _read(done_path(path))
+    return bool(done_dct) and done_dct.get('session') == _LEASES['session']
+
+
+def done_path(path):
+    """ Path to the file marking the work of a lease as finished
+
+        :param path: path to the lease file
+        :type path: str
+        :rtype: str
+    """
+    return path + DONE_SUFFIX
+
+
+def job_lease_path(run_path):
+    """ Path to the lease on a job in the RUN filesys
+
+        :param run_path: path to the RUN directory of the job
+        :type run_path: str
+        :rtype: str
+    """
+    return os.path.join(run_path, JOB_LEASE_NAME)
+
+
+def task_lease_path(run_prefix, name):
+    """ Path to the lease on a task run by a driver
+
+        :param run_prefix: root-path to the run-filesystem
+        :type run_prefix: str
+        :param name: name for the task, unique across all tasks
+        :type name: str
+        :rtype: str
+    """
+    lease_dir = os.path.join(run_prefix, LEASE_DIR_NAME)
+    if is_active():
+        os.makedirs(lease_dir, exist_ok=True)
+    return os.path.join(lease_dir, f'{name}.lease')
+
+
+def _create(path, token):
+    """ Atomically create a lease file, returning False if it exists
+    """
+    try:
+        fdesc = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fdesc, 'w', encoding='utf-8') as lease_file:
+        json.dump({'token': token, 'host': socket.gethostname(),
+                   'pid': os.getpid(), 'time': time.time()}, lease_file)
+    return True
+
+
+def _break(path):
+    """ Break a stale lease by moving it aside. Only one process can move
+        the file, and if the lease was renewed after it was found to be
+        stale, it is put back.
+    """
+    broken_path = f'{path}.{socket.gethostname()}.{os.getpid()}.broken'
+    try:
+        os.rename(path, broken_path)
+    except OSError:
+        return False
+
+    broken = is_stale(broken_path)
+    if not broken:
+        try:
+            os.link(broken_path, path)
+        except OSError:
+            pass
+    _remove(broken_path)
+
+    return broken
+
+
+def _lease_age(path):
+    """ Seconds since the last heartbeat of a lease, None if no lease
+    """
+    try:
+        age = time.time() - os.stat(path).st_mtime
+    except OSError:
+        age = None
+    return age
+
+
+def _lease_token(path):
+    """ Token of the lease that wrote a lease file, None if unreadable
+    """
+    return _read(path).get('token')
+
+
+def _read(path):
+    """ Read a JSON file written by _write, empty if missing or unreadable
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as json_file:
+            dct = json.load(json_file)
+    except (OSError, ValueError):
+        dct = {}
+    return dct
+
+
+def _write(path, token, dct):
+    """ Atomically write a JSON file, along with the host and process
+    """
+    dct = dict(dct, host=socket.gethostname(), pid=os.getpid(),
+               time=time.time())
+    tmp_path = f'{path}.{token}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as json_file:
+        json.dump(dct, json_file)
+    os.replace(tmp_path, path)
+
+
+def _remove(path):
+    """ Remove a file, if it still exists
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
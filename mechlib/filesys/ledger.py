@@ -0,0 +1,326 @@
+"""
+  Optional ledger of the electronic structure jobs in the run filesystem
+
+  The status of a job is normally found by checking for and reading the
+  info YAML file in its RUN directory, and finding which jobs are running
+  takes a walk over the run filesystem. When the ledger is activated, every
+  job launched by es.runner.run_job is also recorded in an SQLite database
+  under the run prefix, along with its status, host, start and end times,
+  and path, so that the status of a job, or of all jobs under a directory,
+  is a single indexed query.
+
+  Each host writes to a database of its own in the LEDGER_DIR directory,
+  since SQLite locking cannot be relied on across the hosts of a network
+  filesystem. Only processes on the same host write to a database; the
+  databases of the other hosts are opened read-only, and the latest record
+  of a job over all of them is taken as its status.
+
+  The info files remain the record of the job; the ledger is only consulted
+  for jobs that it has a record of. Jobs left as running by a process on
+  this host that has died are marked as stale by mark_stale, so that they
+  are rerun and are reported apart from the jobs that are still running.
+"""
+
+import os
+import time
+import socket
+import sqlite3
+import pathlib
+import contextlib
+import autofile
+
+
+LEDGER_DIR = 'job_ledger'
+
+# Seconds to wait for another process to release a lock on the database
+LOCK_TIMEOUT = 60.0
+
+# Status of a running job, and of a job left running by a dead process
+RUNNING = str(autofile.schema.RunStatus.RUNNING)
+STALE = 'stale'
+
+_LEDGER = {'dir': None, 'path': None}
+
+
+def activate(run_prefix):
+    """ Start recording jobs in the ledger under the run prefix
+
+        :param run_prefix: root-path to the run-filesystem
+        :type run_prefix: str
+    """
+
+    _LEDGER['dir'] = os.path.join(run_prefix, LEDGER_DIR)
+    _LEDGER['path'] = os.path.join(
+        _LEDGER['dir'], f'{socket.gethostname()}.sqlite')
+    os.makedirs(_LEDGER['dir'], exist_ok=True)
+    with _connect() as conn:
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            ' path TEXT NOT NULL,'
+            ' job TEXT NOT NULL,'
+            ' status TEXT NOT NULL,'
+            ' host TEXT,'
+            ' pid INTEGER,'
+            ' start_time REAL,'
+            ' end_time REAL,'
+            ' PRIMARY KEY (path, job))')
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)')
+
+
+def deactivate():
+    """ Stop recording jobs in the ledger
+    """
+    _LEDGER['dir'] = None
+    _LEDGER['path'] = None
+
+
+def is_active():
+    """ Assess if jobs are being recorded in the ledger
+
+        :rtype: bool
+    """
+    return _LEDGER['path'] is not None
+
+
+def record_start(path, job, status):
+    """ Record that a job has been launched
+
+        :param path: path to the RUN directory of the job
+        :type path: str
+        :param job: label for the job
+        :type job: str
+        :param status: status of the job
+        :type status: str
+    """
+    if is_active():
+        with _connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO jobs '
+                '(path, job, status, host, pid, start_time, end_time) '
+                'VALUES (?, ?, ?, ?, ?, ?, NULL)',
+                (path, job, str(status), socket.gethostname(),
+                 os.getpid(), time.time()))
+
+
+def record_end(path, job, status):
+    """ Record the final status of a job
+
+        :param path: path to the RUN directory of the job
+        :type path: str
+        :param job: label for the job
+        :type job: str
+        :param status: status of the job
+        :type status: str
+    """
+    if is_active():
+        with _connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, end_time = ? '
+                'WHERE path = ? AND job = ?',
+                (str(status), time.time(), path, job))
+
+
+def status(path, job):
+    """ Get the status of a job from the ledger
+
+        :param path: path to the RUN directory of the job
+        :type path: str
+        :param job: label for the job
+        :type job: str
+        :returns: the status, None if the job is not in the ledger
+        :rtype: str
+    """
+
+    job_status = None
+    rows = _latest_rows('path = ? AND job = ?', (path, job))
+    if rows:
+        job_status = rows[0][2]
+
+    return job_status
+
+
+def statuses(root_path, job=None):
+    """ Get the status of every job in the ledger in directories under
+        some path, for checks over many jobs at once
+
+        :param root_path: path to search under
+        :type root_path: str
+        :param job: only get jobs with this label
+        :type job: str
+        :returns: the status of each job, keyed by its path
+        :rtype: dict[str: str]
+    """
+
+    where = 'path LIKE ? ESCAPE ?'
+    params = (_like_prefix(root_path), '\\')
+    if job is not None:
+        where += ' AND job = ?'
+        params += (job,)
+
+    return {row[0]: row[2] for row in _latest_rows(where, params)}
+
+
+def jobs(job_status, root_path=None, job=None):
+    """ Get the jobs in the ledger with a given status
+
+        :param job_status: status of the jobs
+        :type job_status: str
+        :param root_path: only get the jobs in directories under this path
+        :type root_path: str
+        :param job: only get jobs with this label
+        :type job: str
+        :returns: (path, job, host, start time, end time) for each job
+        :rtype: tuple(tuple(str, str, str, float, float))
+    """
+
+    where = '1'
+    params = ()
+    if root_path is not None:
+        where += ' AND path LIKE ? ESCAPE ?'
+        params += (_like_prefix(root_path), '\\')
+    if job is not None:
+        where += ' AND job = ?'
+        params += (job,)
+
+    # Filter on the latest record of each job, not any of its records
+    return tuple(
+        (row[0], row[1], row[3], row[5], row[6])
+        for row in _latest_rows(where, params)
+        if row[2] == str(job_status))
+
+
+def summary():
+    """ Count the jobs in the ledger with each status
+
+        :rtype: dict[str: int]
+    """
+
+    count_dct = {}
+    for row in _latest_rows('1', ()):
+        count_dct[row[2]] = count_dct.get(row[2], 0) + 1
+
+    return count_dct
+
+
+def mark_stale(path=None, job=None):
+    """ Mark the jobs recorded as running on this host by a process that
+        no longer exists as stale. Jobs run on other hosts are left to the
+        leases on them (see lease.job_lease_path).
+
+        :param path: only check the job in this RUN directory
+        :type path: str
+        :param job: only check jobs with this label
+        :type job: str
+        :returns: (path, job) of each job marked as stale
+        :rtype: tuple(tuple(str, str))
+    """
+
+    stale = ()
+    if is_active():
+        query = 'SELECT path, job, pid FROM jobs WHERE status = ?'
+        params = (RUNNING,)
+        if path is not None:
+            query += ' AND path = ?'
+            params += (path,)
+        if job is not None:
+            query += ' AND job = ?'
+            params += (job,)
+        with _connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+            for row_path, row_job, pid in rows:
+                if not _pid_exists(pid):
+                    # Only mark the job if it has not ended in the meantime
+                    cur = conn.execute(
+                        'UPDATE jobs SET status = ? WHERE path = ? AND '
+                        'job = ? AND status = ? AND pid = ?',
+                        (STALE, row_path, row_job, RUNNING, pid))
+                    if cur.rowcount:
+                        stale += ((row_path, row_job),)
+
+    return stale
+
+
+def _latest_rows(where, params):
+    """ Get the latest record of each job matching a condition over the
+        ledgers of all hosts. The ledgers of other hosts that cannot be
+        read (e.g., while being written over the network) are skipped.
+
+        :returns: (path, job, status, host, pid, start time, end time)
+        :rtype: tuple(tuple)
+    """
+
+    row_dct = {}
+    if is_active():
+        query = ('SELECT path, job, status, host, pid, start_time, end_time '
+                 f'FROM jobs WHERE {where}')
+        for ledger_path in _ledger_paths():
+            own = ledger_path == _LEDGER['path']
+            try:
+                with _connect(ledger_path, read_only=not own) as conn:
+                    rows = conn.execute(query, params).fetchall()
+            except sqlite3.DatabaseError:
+                if own:
+                    raise
+                rows = ()
+            for row in rows:
+                key = (row[0], row[1])
+                if key not in row_dct or (row[5] or 0.0) > (
+                        row_dct[key][5] or 0.0):
+                    row_dct[key] = tuple(row)
+
+    return tuple(row_dct.values())
+
+
+def _ledger_paths():
+    """ Paths to the ledgers of all hosts, starting with this one
+    """
+    paths = (_LEDGER['path'],)
+    for name in sorted(os.listdir(_LEDGER['dir'])):
+        path = os.path.join(_LEDGER['dir'], name)
+        if name.endswith('.sqlite') and path != _LEDGER['path']:
+            paths += (path,)
+    return paths
+
+
+@contextlib.contextmanager
+def _connect(ledger_path=None, read_only=False):
+    """ Open a short-lived connection to a ledger (that of this host by
+        default) that commits on exit
+    """
+    ledger_path = ledger_path or _LEDGER['path']
+    if read_only:
+        conn = sqlite3.connect(
+            pathlib.Path(ledger_path).as_uri() + '?mode=ro',
+            uri=True, timeout=LOCK_TIMEOUT)
+    else:
+        conn = sqlite3.connect(ledger_path, timeout=LOCK_TIMEOUT)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _like_prefix(root_path):
+    """ LIKE pattern for all paths under a directory
+    """
+    root_path = os.path.join(root_path, '')
+    for char in ('\\', '%', '_'):
+        root_path = root_path.replace(char, '\\' + char)
+    return root_path + '%'
+
+
+def _pid_exists(pid):
+    """ Assess if a process exists on this host
+    """
+    if pid is None:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # The process exists but belongs to another user
+        return True
+    return True
@@ -0,0 +1,94 @@
+"""
+  Manifest of the jobs in the run filesystem that have been saved
+
+  The save passes over a layer of the run filesystem (e.g., save_tau and
+  save_scan) read and save every job in the layer each time they are run.
+  Here, the output file of each job that has been harvested is recorded in
+  a JSON manifest in the matching directory of the save filesystem, along
+  with its modification time and size, so that a pass only has to process
+  the jobs that are new or have been rerun since the last pass.
+
+  The manifest is kept in the save filesystem so that removing the saved
+  data also removes the record of it having been saved.
+"""
+
+import os
+import json
+from mechlib.amech_io import printer as ioprinter
+
+
+MANIFEST_NAME = 'save_manifest.json'
+
+
+def load(save_path):
+    """ Read the manifest of a directory in the save filesys, returning
+        an empty manifest if there is none
+
+        :param save_path: directory of the save filesys holding the manifest
+        :type save_path: str
+        :rtype: dict[str: list]
+    """
+
+    man_path = os.path.join(save_path, MANIFEST_NAME)
+    man_dct = {}
+    if os.path.exists(man_path):
+        try:
+            with open(man_path, 'r', encoding='utf-8') as man_file:
+                man_dct = json.load(man_file)
+        except (OSError, ValueError):
+            ioprinter.warning_message(f'Could not read manifest {man_path}')
+            man_dct = {}
+
+    return man_dct
+
+
+def dump(save_path, man_dct):
+    """ Write the manifest of a directory in the save filesys
+
+        :param save_path: directory of the save filesys holding the manifest
+        :type save_path: str
+        :param man_dct: the manifest
+        :type man_dct: dict[str: list]
+    """
+
+    man_path = os.path.join(save_path, MANIFEST_NAME)
+    if os.path.isdir(save_path):
+        tmp_path = f'{man_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as man_file:
+                json.dump(man_dct, man_file)
+            os.replace(tmp_path, man_path)
+        except OSError:
+            ioprinter.warning_message(f'Could not write manifest {man_path}')
+
+
+def entry(run_root, out_path):
+    """ Build the manifest entry for the output file of a job
+
+        :param run_root: directory of the run filesys that the layer of
+            jobs is under, which the keys of the manifest are relative to
+        :type run_root: str
+        :param out_path: path to the output file of the job
+        :type out_path: str
+        :returns: (key, signature); signature is None if no output exists
+        :rtype: (str, list)
+    """
+
+    key = os.path.relpath(out_path, run_root)
+    try:
+        stat = os.stat(out_path)
+        sig = [stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        sig = None
+
+    return key, sig
+
+
+def is_saved(man_dct, key, sig):
+    """ Assess if the output of a job has been saved and not changed since
+
+        :param man_dct: the manifest
+        :type man_dct: dict[str: list]
+        :rtype: bool
+    """
+    return sig is not None and man_dct.get(key) == sig
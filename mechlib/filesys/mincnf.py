@@ -3,6 +3,7 @@
 """
 
 import os
+import json
 import time
 import numpy
 import autofile
@@ -16,6 +17,7 @@ from automol.geom import hydrogen_bonded_structure
 from autorun import execute_function_in_parallel
 from mechanalyzer.inf import thy as tinfo
 from mechlib.amech_io import printer as ioprinter
+from mechlib.filesys import dedup
 
 
 def min_energy_conformer_locators(
@@ -193,6 +195,10 @@ def _sorted_cnf_lsts(
         The conformers are sorted such that the energies are sorted
         in ascedning order.
 
+        The sort energy of each conformer is kept in a cache file in the
+        CONFS layer and is only recalculated if any of the files it was
+        calculated from have been modified since.
+
         :param cnf_locs_lst:
         :type cnf_locs_lst: tuple(tuple(tuple(str),tuple(str)))
         :param cnf_save_fs: CONF object with save filesys prefix
@@ -202,78 +208,59 @@ def _sorted_cnf_lsts(
         :rtype (tuple(tuple(tuple(str),tuple(str))), tuple(float))
     """
 
-    def _parallel_get_sort_energy_parameters(
-            cnf_save_fs, mod_thy_info, freq_info,
-            sp_info, sort_prop_dct, cnf_locs_lst,
-            output_queue=None):
-        locs_enes_dct = {}
-        first_enes = None
-        for locs in cnf_locs_lst:
-            sort_ene, first_enes = _sort_energy_parameter(
-                locs, cnf_save_fs, mod_thy_info, freq_info,
-                sp_info, sort_prop_dct, first_enes=first_enes)
-            if first_enes is not None:
-                locs_enes_dct[tuple(locs)] = (sort_ene, sum(first_enes))
-            else:
-                locs_enes_dct[tuple(locs)] = (sort_ene, first_enes)
-        output_queue.put((locs_enes_dct,))
-
     fnd_cnf_enes_lst = []
     fnd_cnf_locs_lst = []
     if len(cnf_locs_lst) == 1:
         fnd_cnf_enes_lst = [10]
         fnd_cnf_locs_lst = cnf_locs_lst
     else:
-        args = (
-                cnf_save_fs, mod_thy_info, freq_info,
-                sp_info, sort_prop_dct
-                )
-        locs_enes_dct_lst = execute_function_in_parallel(
-            _parallel_get_sort_energy_parameters, cnf_locs_lst,
-            args, nprocs=nprocs)
+        # Read what sort energies can be from the cache
+        sort_key = _sort_cache_key(
+            mod_thy_info, freq_info, sp_info, sort_prop_dct)
+        cache_dct = _read_sort_cache(cnf_save_fs)
+        key_cache_dct = cache_dct.setdefault(sort_key, {})
+
+        locs_enes_dct = {}
+        miss_locs_lst = []
+        for locs in cnf_locs_lst:
+            entry = key_cache_dct.get(_sort_cache_locs(locs))
+            if entry is not None and _sort_cache_entry_is_current(entry):
+                locs_enes_dct[tuple(locs)] = (entry[0], entry[1])
+            else:
+                miss_locs_lst.append(locs)
+
+        # Calculate the rest from the filesystem and update the cache
+        if miss_locs_lst:
+            args = (
+                    cnf_save_fs, mod_thy_info, freq_info,
+                    sp_info, sort_prop_dct
+                    )
+            entry_dct_lst = execute_function_in_parallel(
+                _parallel_sort_energy_entries, miss_locs_lst,
+                args, nprocs=nprocs)
+            for entry_dct in entry_dct_lst:
+                for locs, entry in entry_dct.items():
+                    locs_enes_dct[locs] = (entry[0], entry[1])
+                    if entry[0] is not None:
+                        key_cache_dct[_sort_cache_locs(locs)] = entry
+            _write_sort_cache(cnf_save_fs, cache_dct)
+
+        # Put the sort energies relative to a common reference
         first_ene = None
-        print('locs enes dct', locs_enes_dct_lst)
-        for locs_enes_dct in locs_enes_dct_lst:
-            for locs in locs_enes_dct:
-                _, locs_first_ene = locs_enes_dct[locs]
-                if locs_first_ene is not None:
-                    first_ene = locs_first_ene
+        for locs in cnf_locs_lst:
+            _, locs_first_ene = locs_enes_dct[tuple(locs)]
+            if locs_first_ene is not None:
+                first_ene = locs_first_ene
                 break
- 
+
         for locs in cnf_locs_lst:
-            for locs_enes_dct in locs_enes_dct_lst:
-                if tuple(locs) in locs_enes_dct:
-                    sort_ene, tmp_first_ene = locs_enes_dct[tuple(locs)]
-                    if sort_ene is not None:
-                        if first_ene is not None:
-                            sort_ene = sort_ene + (
-                                (tmp_first_ene - first_ene) / phycon.EH2KCAL)
-                        fnd_cnf_enes_lst.append(sort_ene)
-                        fnd_cnf_locs_lst.append(locs)
-            # commenting out from merge conflict
-            # elif cnf_save_fs[-1].file.geometry_info.exists(locs):
-            #     ioprinter.info_message(
-            #         'No energy saved in single point directory for '
-            #         f'{cnf_path}')
-            #     geo_inf_obj = cnf_save_fs[-1].file.geometry_info.read(
-            #         locs)
-            #     geo_end_time = geo_inf_obj.utc_end_time
-            #     current_time = autofile.schema.utc_time()
-            #     save_time = (current_time - geo_end_time).total_seconds()
-            #     if save_time < 120:
-            #         wait_time = 120 - save_time
-            #         ioprinter.info_message(
-            #             f'Geo saved in the last {save_time:3.2f} seconds,'
-            #             f' waiting for {wait_time:3.2f} seconds')
-            #         time.sleep(wait_time)
-            #         if sp_fs[-1].file.energy.exists(mod_thy_info[1:4]):
-            #             fnd_cnf_enes_lst.append(sp_fs[-1].file.energy.read(
-            #                 mod_thy_info[1:4]))
-            #             fnd_cnf_locs_lst.append(cnf_locs_lst[idx])
-            #             ioprinter.info_message('the energy is now found')
-            #         else:
-            #             ioprinter.info_message('waiting helped nothing')
-            # print('found', fnd_cnf_enes_lst, fnd_cnf_locs_lst)
+            sort_ene, tmp_first_ene = locs_enes_dct[tuple(locs)]
+            if sort_ene is not None:
+                if first_ene is not None and tmp_first_ene is not None:
+                    sort_ene = sort_ene + (
+                        (tmp_first_ene - first_ene) / phycon.EH2KCAL)
+                fnd_cnf_enes_lst.append(sort_ene)
+                fnd_cnf_locs_lst.append(locs)
 
     # Sort the cnf locs and cnf enes
     if fnd_cnf_locs_lst:
@@ -285,6 +272,25 @@ def _sorted_cnf_lsts(
     return cnf_locs_lst, cnf_enes_lst
 
 
+def _parallel_sort_energy_entries(
+        cnf_save_fs, mod_thy_info, freq_info,
+        sp_info, sort_prop_dct, cnf_locs_lst,
+        output_queue=None):
+    """ Calculate the sort energy of each conformer relative to itself,
+        along with the modification times of the files it was read from
+    """
+    locs_entry_dct = {}
+    for locs in cnf_locs_lst:
+        geo, freqs, sp_ene, paths = _collect_rrho_params_and_paths(
+            cnf_save_fs, locs, sp_info, freq_info, mod_thy_info)
+        sort_ene, first_enes = _sort_energy_from_params(
+            geo, freqs, sp_ene, sort_prop_dct, locs)
+        first_ene = sum(first_enes) if first_enes is not None else None
+        locs_entry_dct[tuple(locs)] = (
+            sort_ene, first_ene, _file_mtimes(paths))
+    output_queue.put((locs_entry_dct,))
+
+
 def _wait_for_energy_to_be_saved(cnf_save_fs, locs, sp_fs, sp_info):
     """ in case a geo was just written and its about to write and ene
     """
@@ -698,20 +704,11 @@ def _sym_unique(geo, ene, saved_geos, saved_enes, ethresh=1.0e-5):
         existing conformers in the filesystem
     """
 
-    sym_idx = None
-    new_saved_geos = []
-    idx_dct = {}
-    for i, (sene, sgeo) in enumerate(zip(saved_enes, saved_geos)):
-        if abs(ene - sene) < ethresh:
-            idx_dct[len(new_saved_geos)] = i
-            new_saved_geos.append(sgeo)
-    if new_saved_geos:
-        _, sym_idx = automol.geom.is_unique(
-            geo, new_saved_geos, check_dct={'coulomb': 1e-2})
+    sym_idx = dedup.sym_unique(
+        geo, ene, saved_geos, saved_enes, ethresh=ethresh)
 
     if sym_idx is not None:
         print(' - Structure is not symmetrically unique.')
-        sym_idx = idx_dct[sym_idx]
 
     return sym_idx
 
@@ -720,11 +717,23 @@ def collect_rrho_params(
         cnf_save_fs, locs, sp_info, freq_info, mod_thy_info):
     """ get geo, freqs, and elec. ene from filesystem
     """
+    geo, freqs, ene, _ = _collect_rrho_params_and_paths(
+        cnf_save_fs, locs, sp_info, freq_info, mod_thy_info)
+    return geo, freqs, ene
+
+
+def _collect_rrho_params_and_paths(
+        cnf_save_fs, locs, sp_info, freq_info, mod_thy_info):
+    """ get geo, freqs, and elec. ene from filesystem, along with
+        the paths of the files they are read from
+    """
     geo = None
     freqs = None
     ene = None
+    paths = ()
     if cnf_save_fs[-1].file.geometry.exists(locs):
         geo = cnf_save_fs[-1].file.geometry.read(locs)
+        paths += (cnf_save_fs[-1].file.geometry.path(locs),)
         if freq_info is None or freq_info == mod_thy_info:
             freq_fs = cnf_save_fs
             freq_locs = locs
@@ -732,6 +741,7 @@ def collect_rrho_params(
             freq_fs, freq_locs = get_freq_location(cnf_save_fs, geo, freq_info[1:4], locs)
 
         if freq_locs is not None:
+            paths += (freq_fs[-1].file.harmonic_frequencies.path(freq_locs),)
             if freq_fs[-1].file.harmonic_frequencies.exists(freq_locs):
                 freqs = freq_fs[-1].file.harmonic_frequencies.read(freq_locs)
 
@@ -741,6 +751,7 @@ def collect_rrho_params(
                 sp_thy_info = sp_info[1:4]
             else:
                 sp_thy_info = mod_thy_info[1:4]
+            paths += (sp_fs[-1].file.energy.path(sp_thy_info),)
             if sp_fs[-1].file.energy.exists(sp_thy_info):
                 ene = sp_fs[-1].file.energy.read(sp_thy_info)
             else:
@@ -750,7 +761,7 @@ def collect_rrho_params(
     if freqs is not None:
         freqs = [freq for freq in freqs if freq > 0.]
 
-    return geo, freqs, ene
+    return geo, freqs, ene, paths
 
 
 def get_freq_location(cnf_fs, geo, freq_thy_locs, cnf_locs):
@@ -828,9 +839,18 @@ def _sort_energy_parameter(
     """ find the correct energy (gibbs, entropy, enthalpy)
         at the zpe and sp or inp lvls of theory
     """
-    sort_ene = None
     geo, freqs, sp_ene = collect_rrho_params(
         cnf_save_fs, locs, sp_info, freq_info, mod_thy_info)
+    return _sort_energy_from_params(
+        geo, freqs, sp_ene, sort_prop_dct, locs, first_enes=first_enes)
+
+
+def _sort_energy_from_params(
+            geo, freqs, sp_ene, sort_prop_dct, locs, first_enes=None):
+    """ find the correct energy (gibbs, entropy, enthalpy)
+        from the geo, freqs, and elec. ene of a conformer
+    """
+    sort_ene = None
     sort_prop = _check_prop_requirements(
         sort_prop_dct, geo, freqs, sp_ene, locs)
     if sort_prop in ['electronic', 'ground']:
@@ -897,3 +917,88 @@ def fs_confs_dict(cnf_save_fs, cnf_save_locs_lst,
                 match_dct[tuple(ini_locs)] = tuple(locs)
                 break
     return match_dct
+
+
+# Cache of the conformer sort energies
+SORT_CACHE_NAME = 'sort_energies.json'
+
+
+def _sort_cache_path(cnf_save_fs):
+    """ Path to the sort-energy cache file in the CONFS layer
+    """
+    return os.path.join(cnf_save_fs[0].path(), SORT_CACHE_NAME)
+
+
+def _read_sort_cache(cnf_save_fs):
+    """ Read the sort-energy cache of the CONFS layer, returning
+        an empty cache if it is missing or unreadable
+    """
+    cache_dct = {}
+    cache_path = _sort_cache_path(cnf_save_fs)
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as cache_file:
+                cache_dct = json.load(cache_file)
+        except (OSError, ValueError):
+            ioprinter.warning_message(
+                f'Could not read sort-energy cache {cache_path}')
+            cache_dct = {}
+    return cache_dct
+
+
+def _write_sort_cache(cnf_save_fs, cache_dct):
+    """ Write the sort-energy cache of the CONFS layer. The file is
+        written to a temporary path and then moved so that other
+        processes never read a partially written cache.
+    """
+    cache_path = _sort_cache_path(cnf_save_fs)
+    if os.path.isdir(os.path.dirname(cache_path)):
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+                json.dump(cache_dct, cache_file)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            ioprinter.warning_message(
+                f'Could not write sort-energy cache {cache_path}')
+
+
+def _sort_cache_key(mod_thy_info, freq_info, sp_info, sort_prop_dct):
+    """ Key for the sort energies of a given set of sort options
+    """
+    sort_props = (tuple(sorted(sort_prop_dct.items()))
+                  if sort_prop_dct else None)
+    return repr((_as_tuple(mod_thy_info), _as_tuple(freq_info),
+                 _as_tuple(sp_info), sort_props))
+
+
+def _sort_cache_locs(locs):
+    """ Key for the conformer locators in the cache
+    """
+    return '/'.join(locs)
+
+
+def _sort_cache_entry_is_current(entry):
+    """ Assess if none of the files a cached sort energy was read from
+        have been modified since
+    """
+    _, _, mtimes = entry
+    return all(_file_mtime(path) == mtime for path, mtime in mtimes)
+
+
+def _file_mtimes(paths):
+    """ Pairs of (path, modification time) for files
+    """
+    return tuple((path, _file_mtime(path)) for path in paths)
+
+
+def _file_mtime(path):
+    """ Modification time of a file, None if it does not exist
+    """
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
+def _as_tuple(info):
+    """ Convert a theory info object to a tuple so it has a stable repr
+    """
+    return tuple(info) if info is not None else None
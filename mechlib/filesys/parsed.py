@@ -0,0 +1,202 @@
+"""
+  Sidecar cache of the quantities parsed from electronic structure outputs
+
+  Saving the jobs in the RUN filesys parses the energies, geometries,
+  gradients, and Hessians out of the output strings with elstruct.reader,
+  and the save passes over a filesystem (e.g., save_tau, save_scan, and the
+  conformer save routines) parse the same outputs again each time they are
+  run. Here, each quantity is parsed once and written to a JSON file in the
+  RUN directory of the job, next to its output file, so that later passes
+  read it back rather than parsing the output again.
+
+  The quantities saved from each type of job (JOB_QUANTITY_DCT) are parsed
+  together when the job is read with es.runner.read_parsed_job, and the
+  sidecar is written once for them.
+  Other quantities are parsed as they are requested and kept with the
+  record of the job, but are not written to the sidecar.
+
+  The values in the sidecar are keyed by a hash of the output string, so a
+  job that is rerun has its sidecar rebuilt rather than returning values
+  parsed from the old output.
+"""
+
+import os
+import json
+import hashlib
+import numpy
+import elstruct
+from mechlib.amech_io import printer as ioprinter
+
+
+SIDECAR_NAME = 'parsed_output.json'
+
+# Readers for the quantities, each called as reader(prog, method, out_str)
+READER_DCT = {
+    'energy': elstruct.reader.energy,
+    'opt_geometry': (
+        lambda prog, _, out_str: elstruct.reader.opt_geometry(
+            prog, out_str)),
+    'opt_zmatrix': (
+        lambda prog, _, out_str: elstruct.reader.opt_zmatrix(
+            prog, out_str)),
+    'inp_zmatrix': (
+        lambda prog, _, out_str: elstruct.reader.inp_zmatrix(
+            prog, out_str)),
+    'gradient': (
+        lambda prog, _, out_str: elstruct.reader.gradient(
+            prog, out_str)),
+    'hessian': (
+        lambda prog, _, out_str: elstruct.reader.hessian(
+            prog, out_str)),
+    'harmonic_frequencies': (
+        lambda prog, _, out_str: elstruct.reader.harmonic_frequencies(
+            prog, out_str)),
+}
+
+# Quantities saved from each type of job
+JOB_QUANTITY_DCT = {
+    elstruct.Job.ENERGY: ('energy',),
+    elstruct.Job.GRADIENT: ('gradient',),
+    elstruct.Job.HESSIAN: ('hessian', 'harmonic_frequencies'),
+    elstruct.Job.OPTIMIZATION: ('energy', 'opt_geometry', 'opt_zmatrix'),
+}
+
+
+class ParsedOutput:
+    """ Quantities parsed from the output of a job, read from the sidecar
+        of the job and written to it by parse
+    """
+
+    def __init__(self, run_path, prog, method, out_str):
+        """ :param run_path: path to the RUN directory of the job
+            :type run_path: str
+            :param prog: electronic structure program of the job
+            :type prog: str
+            :param method: electronic structure method of the job
+            :type method: str
+            :param out_str: string for job output file
+            :type out_str: str
+        """
+        self.path = os.path.join(run_path, SIDECAR_NAME)
+        self.prog = prog
+        self.method = method
+        self.out_str = out_str
+        self.out_hash = hashlib.sha256(out_str.encode()).hexdigest()
+        self._values = _read_sidecar(self.path, self.out_hash)
+        self._unsaved = False
+
+    def get(self, name, reader=None):
+        """ Get a quantity, parsing it from the output if it is not
+            already in the sidecar. A parsed quantity is only written to
+            the sidecar by the next call to parse.
+
+            :param name: name of the quantity (key of READER_DCT)
+            :type name: str
+            :param reader: reader for a quantity not in READER_DCT, called
+                as reader(prog, method, out_str)
+            :type reader: function
+        """
+        if name not in self._values:
+            if reader is None:
+                reader = READER_DCT[name]
+            self._values[name] = _encode(
+                reader(self.prog, self.method, self.out_str))
+            self._unsaved = True
+
+        return _decode(self._values[name])
+
+    def parse(self, names):
+        """ Get several quantities, then write all of the quantities parsed
+            since the sidecar was read to the sidecar at once
+
+            :param names: names of the quantities (keys of READER_DCT)
+            :type names: tuple(str)
+            :rtype: tuple
+        """
+        vals = tuple(self.get(name) for name in names)
+        if self._unsaved:
+            _write_sidecar(self.path, self.out_hash, self._values)
+            self._unsaved = False
+
+        return vals
+
+
+def value(ret, name):
+    """ Get a quantity from the ret of a job, from its parsed record if
+        it has one (see es.runner.read_parsed_job) or else by parsing
+        the output string
+
+        :param ret: (inf_obj, inp_str, out_str[, parsed record])
+        :type ret: tuple
+        :param name: name of the quantity (key of READER_DCT)
+        :type name: str
+    """
+
+    if len(ret) > 3 and ret[3] is not None:
+        val = ret[3].get(name)
+    else:
+        inf_obj, _, out_str = ret[:3]
+        val = READER_DCT[name](inf_obj.prog, inf_obj.method, out_str)
+
+    return val
+
+
+def _read_sidecar(path, out_hash):
+    """ Read the values of a sidecar, if it was built for the output
+    """
+    values = {}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as sc_file:
+                sc_dct = json.load(sc_file)
+            if sc_dct.get('hash') == out_hash:
+                values = sc_dct.get('values', {})
+        except (OSError, ValueError):
+            ioprinter.warning_message(f'Could not read parsed output {path}')
+    return values
+
+
+def _write_sidecar(path, out_hash, values):
+    """ Write a sidecar to a temporary path and then move it into place
+        so that other processes never read a partially written sidecar
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as sc_file:
+            json.dump({'hash': out_hash, 'values': values}, sc_file)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        ioprinter.warning_message(f'Could not write parsed output {path}')
+
+
+def _encode(val):
+    """ Convert a parsed value into JSON data, marking NumPy arrays so
+        that they are restored as arrays
+    """
+    if isinstance(val, numpy.ndarray):
+        enc = {'ndarray': val.tolist()}
+    elif isinstance(val, numpy.generic):
+        enc = val.item()
+    elif isinstance(val, (tuple, list)):
+        enc = [_encode(sub) for sub in val]
+    elif isinstance(val, dict):
+        enc = {'dict': [[_encode(key), _encode(sub)]
+                        for key, sub in val.items()]}
+    else:
+        enc = val
+    return enc
+
+
+def _decode(enc):
+    """ Convert JSON data back into a parsed value, with the sequences
+        as tuples (as returned by the elstruct readers)
+    """
+    if isinstance(enc, dict) and 'ndarray' in enc:
+        val = numpy.array(enc['ndarray'])
+    elif isinstance(enc, dict) and 'dict' in enc:
+        val = {_decode(key): _decode(sub) for key, sub in enc['dict']}
+    elif isinstance(enc, list):
+        val = tuple(_decode(sub) for sub in enc)
+    else:
+        val = enc
+    return val
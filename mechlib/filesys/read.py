@@ -13,6 +13,7 @@ from mechanalyzer.inf import thy as tinfo
 from mechanalyzer.inf import rxn as rinfo
 from mechlib.filesys._build import build_fs
 from mechlib.filesys.mincnf import min_energy_conformer_locators
+from mechlib.filesys import scantab
 
 
 def potential(names, grid_vals, cnf_save_path,
@@ -38,22 +39,32 @@ def potential(names, grid_vals, cnf_save_path,
         scn_fs = autofile.fs.scan(zma_path)
     else:
         scn_fs = autofile.fs.cscan(zma_path)
+    # Set the locs for the points and their backsteps
+    locs_lst, back_locs_lst = [], []
+    for vals, back_vals in zip(grid_coords, back_coords):
+        locs = [names, vals]
+        back_locs = [names, back_vals]
+        if constraint_dct is not None:
+            locs = [constraint_dct] + locs
+            back_locs = [constraint_dct] + back_locs
+        locs_lst.append(locs)
+        back_locs_lst.append(back_locs)
+
+    # Read all of the energies from the energy table of the scan
+    npts = len(locs_lst)
+    scn_enes = scantab.energies(
+        scn_fs, locs_lst + back_locs_lst, mod_tors_ene_info[1:4])
+    enes, back_enes = scn_enes[:npts], scn_enes[npts:]
+
     # Read the filesystem
     for idx, vals in enumerate(grid_coords):
 
         # Get angles in degrees for potential for now
         vals_conv = tuple(val*phycon.RAD2DEG for val in vals)
-
-        # Get locs for reading filesysten
-        locs = [names, vals]
-        back_locs = [names, back_coords[idx]]
-        if constraint_dct is not None:
-            locs = [constraint_dct] + locs
-            back_locs = [constraint_dct] + back_locs
+        locs = locs_lst[idx]
 
         # Read values of interest
-        ene = energy(scn_fs, locs, mod_tors_ene_info)
-        back_ene = energy(scn_fs, back_locs, mod_tors_ene_info)
+        ene, back_ene = enes[idx], back_enes[idx]
         step_ene = None
         if ene is not None:
             if back_ene is not None:
@@ -6,6 +6,7 @@ import automol
 import elstruct
 import autofile
 from mechlib.amech_io import printer as ioprinter
+from mechlib.filesys import parsed
 
 
 def atom(sp_ret, cnf_fs, thy_locs, zma,
@@ -310,16 +311,15 @@ def read_job_zma(ret, init_zma=None, rebuild=False):
     #     else:
     #         zma = automol.reac.ts_zmatrix(zrxn, geo)
 
-    _, _, out_str, prog, _ = _unpack_ret(ret)
-    zma = elstruct.reader.opt_zmatrix(prog, out_str)
+    zma = parsed.value(ret, 'opt_zmatrix')
     if zma is None or rebuild:
         print('Getting ZMA from a geometry...')
-        geo = elstruct.reader.opt_geometry(prog, out_str)
+        geo = parsed.value(ret, 'opt_geometry')
         if init_zma is not None:
             print('Resetting ZMA coords using opt geoms...')
             zma = rebuild_zma_from_opt_geo(init_zma, geo)
         else:
-            init_zma = elstruct.reader.inp_zmatrix(prog, out_str)
+            init_zma = parsed.value(ret, 'inp_zmatrix')
             if init_zma is not None:
                 print('Resetting ZMA coords using opt geoms...')
                 zma = rebuild_zma_from_opt_geo(init_zma, geo)
@@ -358,8 +358,8 @@ def _save_geom(ret, cnf_fs, cnf_locs):
     """
 
     print(" - Reading geometry from output...")
-    inf_obj, inp_str, out_str, prog, _ = _unpack_ret(ret)
-    geo = elstruct.reader.opt_geometry(prog, out_str)
+    inf_obj, inp_str, _, _, _ = _unpack_ret(ret)
+    geo = parsed.value(ret, 'opt_geometry')
     _save_geom_parsed(geo, inf_obj, inp_str, cnf_fs, cnf_locs)
 
 
@@ -368,9 +368,9 @@ def _save_grad(ret, cnf_fs, cnf_locs):
     """
 
     print(" - Reading gradient from output...")
-    inf_obj, inp_str, out_str, prog, _ = _unpack_ret(ret)
+    inf_obj, inp_str, _, _, _ = _unpack_ret(ret)
 
-    grad = elstruct.reader.gradient(prog, out_str)
+    grad = parsed.value(ret, 'gradient')
 
     cnf_fs[-1].create(cnf_locs)
     cnf_path = cnf_fs[-1].path(cnf_locs)
@@ -401,11 +401,11 @@ def _save_zmatrix(ret, zma_fs, zma_locs, init_zma=None):
     """
 
     print(" - Reading Z-Matrix from output...")
-    inf_obj, inp_str, out_str, prog, _ = _unpack_ret(ret)
+    inf_obj, inp_str, _, _, _ = _unpack_ret(ret)
     zma = None
     if init_zma is not None:
         print('using opt geo fro zma')
-        geo = elstruct.reader.opt_geometry(prog, out_str)
+        geo = parsed.value(ret, 'opt_geometry')
         zma = read_zma_from_geo(init_zma, geo)
     if zma is None:
         zma = read_job_zma(ret, init_zma=init_zma)
@@ -429,9 +429,9 @@ def _save_energy(ret, sp_fs, sp_locs):
     """
 
     print(" - Reading energy from output...")
-    inf_obj, inp_str, out_str, prog, method = _unpack_ret(ret)
+    inf_obj, inp_str, _, _, _ = _unpack_ret(ret)
 
-    ene = elstruct.reader.energy(prog, method, out_str)
+    ene = parsed.value(ret, 'energy')
     _save_energy_parsed(ene, inf_obj, inp_str, sp_fs, sp_locs)
 
 
@@ -453,10 +453,10 @@ def _save_hessian(ret, cnf_fs, cnf_locs):
     """
 
     print(" - Reading hessian and harmonic frequencies from output...")
-    inf_obj, inp_str, out_str, prog, _ = _unpack_ret(ret)
+    inf_obj, inp_str, _, _, _ = _unpack_ret(ret)
 
-    hess = elstruct.reader.hessian(prog, out_str)
-    freqs = elstruct.reader.harmonic_frequencies(prog, out_str)
+    hess = parsed.value(ret, 'hessian')
+    freqs = parsed.value(ret, 'harmonic_frequencies')
     _save_hessian_parsed(hess, freqs, inf_obj, inp_str, cnf_fs, cnf_locs)
 
 
@@ -538,7 +538,7 @@ def _unpack_ret(ret):
     """ Unpack ret object and get other commonly useful data
     """
 
-    inf_obj, inp_str, out_str = ret
+    inf_obj, inp_str, out_str = ret[:3]
     prog = inf_obj.prog
     method = inf_obj.method
 
@@ -0,0 +1,160 @@
+"""
+  Table of the energies saved along each scan of a SCAN/CSCAN layer
+
+  Reading a torsional potential from the filesystem takes several small
+  file reads per grid point (the point and its backstep point, each with
+  existence checks). Here, the energies of all of the points of a scan are
+  collected into a single JSON file in the directory of the scan, which is
+  built when the scan is saved and read back by filesys.read.potential.
+
+  The table is only written on the save path (scantab.update, called as
+  scans, backsteps, and single points along a scan are saved), so readers
+  never write to the filesystem. The table of each level of theory carries
+  the names of the point directories of the scan at the time it was built.
+  A reader compares this to a single listing of the scan directory and
+  falls back to reading the energy files of the scan directly if any point
+  has been added or removed since.
+"""
+
+import os
+import json
+import autofile
+from mechlib.amech_io import printer as ioprinter
+
+
+TABLE_NAME = 'energy_table.json'
+
+
+def energies(scn_fs, locs_lst, thy_locs):
+    """ Read the energies of the points of a scan at some level of theory,
+        using the table of the scan where it is current.
+
+        :param scn_fs: SCAN/CSCAN object with save filesys prefix
+        :type scn_fs: autofile.fs.scan or autofile.fs.cscan object
+        :param locs_lst: locs of the points of the scan
+        :type locs_lst: tuple(tuple)
+        :param thy_locs: method, basis, and orbital label of the energies
+        :type thy_locs: tuple(str)
+        :returns: the energy of each point; None if none was saved
+        :rtype: tuple(float)
+    """
+
+    thy_key = repr(tuple(thy_locs[:3]))
+    tables = {}
+
+    enes = ()
+    for locs in locs_lst:
+        tab_path = table_path(scn_fs, locs)
+        if tab_path not in tables:
+            thy_tab = _read_table(tab_path).get(thy_key)
+            if (thy_tab is not None and
+                    thy_tab['sig'] != _dir_signature(tab_path)):
+                thy_tab = None
+            tables[tab_path] = thy_tab
+
+        path = scn_fs[-1].path(locs)
+        if tables[tab_path] is not None:
+            ene = tables[tab_path]['enes'].get(os.path.basename(path))
+        else:
+            ene = _read_energy(path, thy_locs)
+        enes += (ene,)
+
+    return enes
+
+
+def update(scn_fs, locs_lst, thy_locs):
+    """ Rebuild the tables of the scans holding the points from the
+        energies saved in the filesystem
+
+        :param scn_fs: SCAN/CSCAN object with save filesys prefix
+        :type scn_fs: autofile.fs.scan or autofile.fs.cscan object
+        :param locs_lst: locs of the points of the scan
+        :type locs_lst: tuple(tuple)
+        :param thy_locs: method, basis, and orbital label of the energies
+        :type thy_locs: tuple(str)
+    """
+
+    thy_key = repr(tuple(thy_locs[:3]))
+    for tab_path in set(table_path(scn_fs, locs) for locs in locs_lst):
+
+        # Take the signature before reading so that points saved in the
+        # meantime leave the table out of date rather than missing
+        sig = _dir_signature(tab_path)
+        scn_path = os.path.dirname(tab_path)
+        enes = {}
+        for name in sig:
+            if os.path.isdir(os.path.join(scn_path, name)):
+                ene = _read_energy(os.path.join(scn_path, name), thy_locs)
+                if ene is not None:
+                    enes[name] = ene
+
+        tab_dct = _read_table(tab_path)
+        tab_dct[thy_key] = {'sig': sig, 'enes': enes}
+        _write_table(tab_path, tab_dct)
+
+
+def table_path(scn_fs, locs):
+    """ Path to the table of the scan that holds a point, which sits
+        in the directory holding the directories of the points
+
+        :param scn_fs: SCAN/CSCAN object with save filesys prefix
+        :type scn_fs: autofile.fs.scan or autofile.fs.cscan object
+        :param locs: locs of the point of the scan
+        :type locs: tuple
+        :rtype: str
+    """
+    return os.path.join(
+        os.path.dirname(scn_fs[-1].path(list(locs))), TABLE_NAME)
+
+
+def _read_table(tab_path):
+    """ Read a table, returning an empty table if it is missing
+        or unreadable
+    """
+    tab_dct = {}
+    if os.path.exists(tab_path):
+        try:
+            with open(tab_path, 'r', encoding='utf-8') as tab_file:
+                tab_dct = json.load(tab_file)
+        except (OSError, ValueError):
+            ioprinter.warning_message(
+                f'Could not read scan energy table {tab_path}')
+            tab_dct = {}
+    return tab_dct
+
+
+def _write_table(tab_path, tab_dct):
+    """ Write a table to a temporary path and then move it into place
+        so that other processes never read a partially written table
+    """
+    if os.path.isdir(os.path.dirname(tab_path)):
+        tmp_path = f'{tab_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as tab_file:
+                json.dump(tab_dct, tab_file)
+            os.replace(tmp_path, tab_path)
+        except OSError:
+            ioprinter.warning_message(
+                f'Could not write scan energy table {tab_path}')
+
+
+def _dir_signature(tab_path):
+    """ Sorted names of the entries of the scan directory holding a table,
+        leaving out the table itself
+    """
+    try:
+        names = os.listdir(os.path.dirname(tab_path))
+    except OSError:
+        names = []
+    return sorted(name for name in names if not name.startswith(TABLE_NAME))
+
+
+def _read_energy(path, thy_locs):
+    """ Read the energy of a scan point from its energy file,
+        None if it does not exist
+    """
+    sp_fs = autofile.fs.single_point(path)
+    ene = None
+    if sp_fs[-1].file.energy.exists(thy_locs[:3]):
+        ene = sp_fs[-1].file.energy.read(thy_locs[:3])
+    return ene
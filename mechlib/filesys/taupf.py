@@ -0,0 +1,182 @@
+"""
+  Read the samples of a TAU layer and assess the convergence of the
+  Monte Carlo partition function they give
+
+  All of the samples are read in a single pass (with read_all for the JSON
+  database), and the Boltzmann sums for all of the temperatures are built
+  at once as NumPy arrays, for models.build.tau_data and the proc driver.
+  During es tau_samp, the sums are kept as samples are run and only the
+  energies of the new samples are added to them (see add_samples).
+"""
+
+import numpy
+from phydat import phycon
+
+
+# Temperatures (K) at which the convergence of the MC PF is assessed
+PF_TEMPS = (300., 500., 750., 1000., 1500.)
+
+# Boltzmann exponent of an energy in kcal/mol at a temperature in K:
+# 349.7 cm-1 per kcal/mol, 0.695 cm-1 per K
+KCAL2KT = 349.7 / 0.695
+
+
+def saved_locs(tau_save_fs, db_style='jsondb', with_hessian=False):
+    """ Get the locs of the saved samples of the TAU layer
+
+        :param tau_save_fs: TAU object with save filesys prefix
+        :type tau_save_fs: autofile.fs.tau object
+        :param db_style: format of the layer ('directory' or 'jsondb')
+        :type db_style: str
+        :param with_hessian: only get the samples with a Hessian
+        :type with_hessian: bool
+        :rtype: tuple(tuple(str))
+    """
+
+    if db_style == 'jsondb':
+        locs_lst = tau_save_fs[-1].json_existing()
+        if with_hessian:
+            locs_lst = [locs for locs in locs_lst
+                        if tau_save_fs[-1].json.hessian.exists(locs)]
+    else:
+        locs_lst = tau_save_fs[-1].existing()
+        if with_hessian:
+            locs_lst = [locs for locs in locs_lst
+                        if tau_save_fs[-1].file.hessian.exists(locs)]
+
+    return tuple(locs_lst)
+
+
+def saved_data(tau_save_fs, locs_lst, name, db_style='jsondb'):
+    """ Read one type of data (e.g., 'energy', 'geometry', 'hessian')
+        for all of the samples in a single pass
+
+        :param tau_save_fs: TAU object with save filesys prefix
+        :type tau_save_fs: autofile.fs.tau object
+        :param locs_lst: locs of the samples to read
+        :type locs_lst: tuple(tuple(str))
+        :param name: name of the data file of the layer
+        :type name: str
+        :param db_style: format of the layer ('directory' or 'jsondb')
+        :type db_style: str
+        :rtype: tuple
+    """
+
+    if not locs_lst:
+        return ()
+
+    if db_style == 'jsondb':
+        vals = getattr(tau_save_fs[-1].json, name).read_all(list(locs_lst))
+    else:
+        data_file = getattr(tau_save_fs[-1].file, name)
+        vals = [data_file.read(locs) for locs in locs_lst]
+
+    return tuple(vals)
+
+
+def pf_convergence(enes, ref_ene, temps=PF_TEMPS):
+    """ Assess the convergence of the Monte Carlo estimate of the partition
+        function at several temperatures from the energies of the samples
+
+        :param enes: energies of the samples (Hartree)
+        :type enes: tuple(float)
+        :param ref_ene: reference energy (Hartree)
+        :type ref_ene: float
+        :param temps: temperatures (K)
+        :type temps: tuple(float)
+        :returns: dictionary of
+            'temps': the temperatures,
+            'nsamp': number of samples,
+            'qsum', 'q2sum': sums of the Boltzmann factors and their squares,
+            'sigma': standard error of the mean Boltzmann factor,
+            'rel_err': sigma relative to the mean (inf if no samples)
+        :rtype: dict[str: numpy.ndarray]
+    """
+
+    temps = numpy.asarray(temps, dtype=float)
+    rel_enes = (numpy.asarray(enes, dtype=float) - ref_ene) * phycon.EH2KCAL
+
+    boltz = numpy.exp(-numpy.outer(KCAL2KT / temps, rel_enes))
+
+    return _convergence(
+        temps, rel_enes.size,
+        numpy.sum(boltz, axis=1), numpy.sum(boltz**2, axis=1))
+
+
+def add_samples(conv_dct, enes, ref_ene):
+    """ Add the energies of new samples to the sums of an assessment of
+        the convergence of the Monte Carlo partition function, without
+        reading the energies of the samples already in it
+
+        :param conv_dct: assessment of the samples so far (see
+            pf_convergence)
+        :type conv_dct: dict[str: numpy.ndarray]
+        :param enes: energies of the new samples (Hartree)
+        :type enes: tuple(float)
+        :param ref_ene: reference energy (Hartree)
+        :type ref_ene: float
+        :rtype: dict[str: numpy.ndarray]
+    """
+
+    new_dct = pf_convergence(enes, ref_ene, temps=conv_dct['temps'])
+
+    return _convergence(
+        conv_dct['temps'],
+        conv_dct['nsamp'] + new_dct['nsamp'],
+        conv_dct['qsum'] + new_dct['qsum'],
+        conv_dct['q2sum'] + new_dct['q2sum'])
+
+
+def _convergence(temps, nsamp, qsum, q2sum):
+    """ Build the assessment of the convergence from the Boltzmann sums
+    """
+
+    if nsamp > 0:
+        sigma = numpy.sqrt(
+            numpy.abs(q2sum/nsamp - (qsum/nsamp)**2) / nsamp)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            rel_err = numpy.where(qsum > 0.0, sigma*nsamp/qsum, numpy.inf)
+    else:
+        sigma = numpy.full(temps.shape, numpy.inf)
+        rel_err = numpy.full(temps.shape, numpy.inf)
+
+    return {
+        'temps': temps,
+        'nsamp': nsamp,
+        'qsum': qsum,
+        'q2sum': q2sum,
+        'sigma': sigma,
+        'rel_err': rel_err,
+    }
+
+
+def assess(tau_save_fs, ref_ene, temps=PF_TEMPS, db_style='jsondb',
+           locs_lst=None):
+    """ Read the energies of the saved samples and assess the convergence
+        of the Monte Carlo partition function (see pf_convergence)
+
+        Adds to the results
+            'ntot': the number of samples attempted (incl. those rejected),
+            'ratio': the ratio of the saved samples to those attempted.
+
+        :param tau_save_fs: TAU object with save filesys prefix
+        :type tau_save_fs: autofile.fs.tau object
+        :param locs_lst: locs of the samples to use, all if None
+        :type locs_lst: tuple(tuple(str))
+        :rtype: dict[str: numpy.ndarray]
+    """
+
+    if locs_lst is None:
+        locs_lst = saved_locs(tau_save_fs, db_style=db_style)
+    enes = saved_data(tau_save_fs, locs_lst, 'energy', db_style=db_style)
+
+    conv_dct = pf_convergence(enes, ref_ene, temps=temps)
+
+    ntot = None
+    if tau_save_fs[0].file.info.exists():
+        ntot = tau_save_fs[0].file.info.read().nsamp
+    conv_dct['ntot'] = ntot
+    conv_dct['ratio'] = (conv_dct['nsamp'] / float(ntot)
+                         if ntot else None)
+
+    return conv_dct
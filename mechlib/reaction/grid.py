@@ -48,6 +48,42 @@ def grid_maximum_zmatrices(typ, ts_zma, scan_grids, scan_names, scn_save_fs,
     return max_zmas
 
 
+def grid_maximum_index(grid, scan_name, scn_save_fs,
+                       mod_thy_info, constraint_dct, include_endpts=True):
+    """ Find the index in a one-dimensional grid of the point at the
+        maximum of the energies saved for the points of the grid.
+
+        :param grid: set of points that comprise the grid
+        :type grid: tuple(float)
+        :param scan_name: name of coordinate in zma along which scan conducted
+        :type scan_name: str
+        :param scn_save_fs: SCAN/CSCAN object with save filesys prefix
+        :type scn_save_fs: autofile.fs.scan or autofile.fs.cscan object
+        :param constraint_dct: values of coordinates to constrain during scan
+        :type constraint_dct: dict[str: float]
+        :rtype: int
+    """
+
+    # Keep the grid index of each point that has been saved
+    grid_idxs, enes_lst = [], []
+    for grid_idx, grid_val in enumerate(grid):
+        _, enes = _grid_vals(
+            (grid_val,), scan_name, scn_save_fs,
+            mod_thy_info, constraint_dct)
+        if enes:
+            grid_idxs.append(grid_idx)
+            enes_lst.extend(enes)
+
+    max_idx = None
+    if enes_lst:
+        max_pos = automol.pot.find_max1d(
+            enes_lst, 'sadpt-global', include_endpts=include_endpts)
+        if max_pos is not None:
+            max_idx = grid_idxs[max_pos]
+
+    return max_idx
+
+
 # Max Finder Functions
 def _find_max_1d(typ, grid, ts_zma, scan_name,
                  mod_thy_info, scn_save_fs, constraint_dct,
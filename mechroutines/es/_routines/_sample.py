@@ -0,0 +1,468 @@
+""" Generate the torsional values of the sample Z-Matrices used in
+    the conformer, ring, and tau searches, and pre-screen them for
+    high intramolecular repulsion
+
+    The strategy used to place the samples in torsional space is set by an
+    optional seventh element of the mc_nsamp and tau_nsamp species keywords:
+        'random': independent uniform draws (default)
+        'halton': Halton low-discrepancy sequence
+        'lhs': stratified Latin hypercube over the torsions
+
+    Every point is generated from its index in the sequence of samples of a
+    species. The conformer search saves the index of the next point of the
+    sequence in the run filesystem (see next_index), and the tau search
+    counts every sample it builds, so a search that is restarted continues
+    the sequence rather than issuing the same points again.
+
+    Candidates are screened in batches by RepulsionScreen, which converts
+    all of their torsion values to Cartesian coordinates and sums pairwise
+    Lennard-Jones potentials with NumPy in one pass. The screen only drops
+    candidates far beyond its calibration against automol.pot; the others
+    are built into Z-Matrices and checked with automol.pot. It is used by
+    the conformer search, which draws candidates until one passes; the tau
+    search checks every sample with automol.pot, so that no sample is
+    recorded as repulsive without the exact check.
+"""
+
+import os
+import json
+import numpy
+import automol
+from mechlib.amech_io.printer import warning_message
+
+
+SAMP_STRATEGIES = ('random', 'halton', 'lhs')
+
+# File in a run directory holding the index of the next point of the
+# sequence of each sampling strategy
+INDEX_NAME = 'sample_index.json'
+
+# Number of candidate samples screened for repulsion at once
+SCREEN_BATCH = 100
+
+# Number of samples, and the seed of their torsions, at which the screen is
+# calibrated against automol.pot.intramol_interaction_potential_sum
+CALIB_NSAMP = 50
+CALIB_SEED = 0
+
+# Fraction by which the excess potential of the screen must exceed the
+# cutoff found in the calibration before a candidate is rejected
+SCREEN_MARGIN = 1.0
+
+# UFF Lennard-Jones parameters of each element: (distance at the minimum
+# in Angstrom, well depth in kcal/mol); other elements use those of carbon
+LJ_PARAMS = {
+    'H': (2.886, 0.044),
+    'C': (3.851, 0.105),
+    'N': (3.660, 0.069),
+    'O': (3.500, 0.060),
+    'F': (3.364, 0.050),
+    'Si': (4.295, 0.402),
+    'P': (4.147, 0.305),
+    'S': (4.035, 0.274),
+    'Cl': (3.947, 0.227),
+    'Br': (4.189, 0.251),
+    'I': (4.500, 0.339),
+    'X': (0.0, 0.0),
+}
+
+
+def strategy(nsamp_par):
+    """ Get the sampling strategy from the nsamp parameters of a species
+
+        :param nsamp_par: (use_formula, A, B, C, max, fixed[, strategy])
+        :type nsamp_par: tuple
+        :rtype: str
+    """
+
+    samp_strategy = nsamp_par[6] if len(nsamp_par) > 6 else 'random'
+    if samp_strategy not in SAMP_STRATEGIES:
+        warning_message(
+            f'Unknown sampling strategy {samp_strategy},',
+            f'must be one of {SAMP_STRATEGIES}. Using random sampling.')
+        samp_strategy = 'random'
+
+    return samp_strategy
+
+
+def unit_points(ndim, idxs, samp_strategy='random', nsamp=None, seed=None):
+    """ Build the points of a set of samples in the unit hypercube
+
+        :param ndim: number of torsions
+        :type ndim: int
+        :param idxs: indices of the samples in the sequence
+        :type idxs: tuple(int)
+        :param samp_strategy: sampling strategy (see SAMP_STRATEGIES)
+        :type samp_strategy: str
+        :param nsamp: size of each Latin hypercube (lhs only)
+        :type nsamp: int
+        :param seed: seed for the points; a seed gives each random sample a
+            stream seeded by (seed, idx), shifts the Halton sequence, and
+            sets the permutations of the Latin hypercubes (seed 0 if None,
+            so that they are the same over restarts)
+        :type seed: int
+        :rtype: numpy.ndarray
+    """
+
+    idxs = tuple(idxs)
+    if samp_strategy == 'halton':
+        pnts = _halton(ndim, numpy.asarray(idxs) + 1)
+        if seed is not None:
+            shift = numpy.random.default_rng(seed).random(ndim)
+            pnts = numpy.mod(pnts + shift, 1.0)
+    elif samp_strategy == 'lhs':
+        nsamp = max(nsamp or len(idxs), 1)
+        seed = 0 if seed is None else seed
+        blocks = {}
+        pnts = numpy.empty((len(idxs), ndim))
+        for row, idx in enumerate(idxs):
+            blk_idx = idx // nsamp
+            if blk_idx not in blocks:
+                blocks[blk_idx] = _latin_hypercube(
+                    ndim, nsamp, (seed, blk_idx))
+            pnts[row] = blocks[blk_idx][idx % nsamp]
+    elif seed is not None:
+        pnts = numpy.array([
+            numpy.random.default_rng((seed, idx)).random(ndim)
+            for idx in idxs]).reshape(len(idxs), ndim)
+    else:
+        pnts = numpy.random.random_sample((len(idxs), ndim))
+
+    return pnts
+
+
+def next_index(path, samp_strategy, default=0):
+    """ Read the index of the next point in the sequence of samples of a
+        strategy saved in a directory by save_next_index
+
+        :param path: directory holding the index
+        :type path: str
+        :param samp_strategy: sampling strategy (see SAMP_STRATEGIES)
+        :type samp_strategy: str
+        :param default: index if none has been saved
+        :type default: int
+        :rtype: int
+    """
+    idx_dct = _read_index(os.path.join(path, INDEX_NAME))
+    return int(idx_dct.get(samp_strategy, default))
+
+
+def save_next_index(path, samp_strategy, idx):
+    """ Save the index of the next point in the sequence of samples of a
+        strategy in a directory
+
+        :param path: directory holding the index
+        :type path: str
+        :param samp_strategy: sampling strategy (see SAMP_STRATEGIES)
+        :type samp_strategy: str
+        :param idx: index of the next point
+        :type idx: int
+    """
+    idx_path = os.path.join(path, INDEX_NAME)
+    idx_dct = _read_index(idx_path)
+    idx_dct[samp_strategy] = int(idx)
+    tmp_path = f'{idx_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as idx_file:
+            json.dump(idx_dct, idx_file)
+        os.replace(tmp_path, idx_path)
+    except OSError:
+        warning_message(f'Could not write sample index {idx_path}')
+
+
+def torsion_values(tors_range_dct, idxs, samp_strategy='random',
+                   nsamp=None, seed=None):
+    """ Build the values of the torsions for a set of indices in the
+        sequence of samples, placed by the sampling strategy
+
+        :param tors_range_dct: (min, max) of each torsion to sample
+        :type tors_range_dct: dict[str: (float, float)]
+        :param idxs: indices of the samples in the sequence
+        :type idxs: tuple(int)
+        :returns: (names of the torsions, values for each sample)
+        :rtype: (tuple(str), numpy.ndarray)
+    """
+
+    idxs = tuple(idxs)
+    names = tuple(sorted(tors_range_dct)) if tors_range_dct else ()
+    lows = numpy.array([tors_range_dct[name][0] for name in names])
+    highs = numpy.array([tors_range_dct[name][1] for name in names])
+    pnts = unit_points(
+        len(names), idxs, samp_strategy=samp_strategy,
+        nsamp=nsamp, seed=seed)
+
+    return names, lows + pnts * (highs - lows)
+
+
+def zmas_from_values(zma, names, vals):
+    """ Build the Z-Matrices with the torsions set to each row of values
+
+        :param zma: reference Z-Matrix
+        :type zma: automol.zmat object
+        :param names: names of the torsions
+        :type names: tuple(str)
+        :param vals: values of the torsions for each sample (radians)
+        :type vals: numpy.ndarray
+        :rtype: tuple(automol.zmat object)
+    """
+    if not names:
+        return tuple(zma for _ in vals)
+    return tuple(
+        automol.zmat.set_values_by_name(
+            zma, dict(zip(names, row)), angstrom=False, degree=False)
+        for row in vals)
+
+
+class RepulsionScreen:
+    """ Batched screen of sample torsion values for high intramolecular
+        repulsion relative to a reference Z-Matrix
+
+        The pairwise potential is a UFF Lennard-Jones sum over all pairs
+        of atoms more than two bonds apart in the reference geometry (the
+        other pairs do not change with the torsions). This is not the
+        potential of automol.pot.intramol_interaction_potential_sum, and
+        it is not a bound on it: the two can rank samples differently.
+
+        The screen is calibrated at CALIB_NSAMP random samples, where both
+        potentials are evaluated. This is only done the first time a
+        candidate is above the lowest possible cutoff, so a screen that
+        rejects nothing costs no automol evaluations. The cutoff for a
+        threshold is the larger of the threshold and the highest excess of
+        the screen over the reference among the calibration samples that
+        automol accepts. Only candidates whose excess is more than
+        SCREEN_MARGIN beyond the cutoff are rejected, i.e. samples far more
+        repulsive than any that automol was seen to accept; the rest are
+        left to the automol check.
+    """
+
+    def __init__(self, zma, tors_range_dct=None):
+        """ :param zma: reference Z-Matrix
+            :type zma: automol.zmat object
+            :param tors_range_dct: torsions that are sampled, whose values
+                are given in the (sorted) order used by torsion_values
+            :type tors_range_dct: dict[str: (float, float)]
+        """
+
+        symbs = automol.zmat.symbols(zma)
+        self.key_mat = numpy.array(
+            [[-1 if key is None else key for key in row]
+             for row in automol.zmat.key_matrix(zma)], dtype=int)
+        self.val_mat = numpy.nan_to_num(numpy.array(
+            [[numpy.nan if val is None else val for val in row]
+             for row in automol.zmat.value_matrix(
+                 zma, angstrom=True, degree=False)], dtype=float))
+
+        name_mat = automol.zmat.name_matrix(zma)
+        self.names = tuple(sorted(tors_range_dct)) if tors_range_dct else ()
+        self.tors_pos = tuple(
+            tuple((row, col)
+                  for row, name_row in enumerate(name_mat)
+                  for col, coo_name in enumerate(name_row)
+                  if coo_name == name)
+            for name in self.names)
+
+        # Pairs of real atoms more than two bonds apart, with LJ parameters
+        real_keys = [key for key, symb in enumerate(symbs) if symb != 'X']
+        gra = automol.geom.connectivity_graph(automol.zmat.geometry(zma))
+        ngb_dct = {}
+        for bnd_key in automol.graph.bond_keys(gra):
+            key1, key2 = sorted(bnd_key)
+            ngb_dct.setdefault(key1, set()).add(key2)
+            ngb_dct.setdefault(key2, set()).add(key1)
+        near_pairs = set()
+        for key, ngbs in ngb_dct.items():
+            near_pairs |= {frozenset((key, ngb)) for ngb in ngbs}
+            near_pairs |= {frozenset((ngb1, ngb2))
+                           for ngb1 in ngbs for ngb2 in ngbs if ngb1 != ngb2}
+        pairs = [(idx1, idx2)
+                 for idx1 in range(len(real_keys))
+                 for idx2 in range(idx1+1, len(real_keys))
+                 if frozenset((idx1, idx2)) not in near_pairs]
+        self.pair_keys = numpy.array(
+            [(real_keys[idx1], real_keys[idx2]) for idx1, idx2 in pairs],
+            dtype=int).reshape(-1, 2)
+        params = numpy.array([LJ_PARAMS.get(symb, LJ_PARAMS['C'])
+                              for symb in symbs]).reshape(-1, 2)
+        self.rmin = numpy.sqrt(
+            params[self.pair_keys[:, 0], 0] * params[self.pair_keys[:, 1], 0])
+        self.eps = numpy.sqrt(
+            params[self.pair_keys[:, 0], 1] * params[self.pair_keys[:, 1], 1])
+
+        ref_vals = numpy.array(
+            [[self.val_mat[pos[0]] if pos else 0.0
+              for pos in self.tors_pos]], dtype=float)
+        self.ref_pot = self.potentials(ref_vals)[0]
+
+        # Excess potentials of the screen and of automol over the reference
+        # at the calibration samples, evaluated when first needed
+        self.zma = zma
+        self.tors_range_dct = tors_range_dct
+        self.calib_pots = None
+
+    def potentials(self, vals):
+        """ Sums of the pairwise potentials (kcal/mol) for each sample
+
+            :param vals: values of the torsions for each sample (radians)
+            :type vals: numpy.ndarray
+            :rtype: numpy.ndarray
+        """
+
+        vals = numpy.atleast_2d(numpy.asarray(vals, dtype=float))
+        val_mats = numpy.repeat(
+            self.val_mat[numpy.newaxis], len(vals), axis=0)
+        for col, pos in enumerate(self.tors_pos):
+            for row_key, col_key in pos:
+                val_mats[:, row_key, col_key] = vals[:, col]
+
+        xyzs = _cartesians(self.key_mat, val_mats)
+        dists = numpy.linalg.norm(
+            xyzs[:, self.pair_keys[:, 0]] - xyzs[:, self.pair_keys[:, 1]],
+            axis=2)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            ratio6 = (self.rmin / dists)**6
+            pots = numpy.sum(self.eps * (ratio6**2 - 2.0 * ratio6), axis=1)
+
+        return pots
+
+    def cutoff(self, repulsion_thresh=40.0):
+        """ Excess potential of the screen (kcal/mol) above which samples
+            are rejected for a threshold of automol.pot
+
+            :param repulsion_thresh: threshold of the automol check
+            :type repulsion_thresh: float
+            :rtype: float
+        """
+        if self.calib_pots is None:
+            self._calibrate()
+        scrn_pots, exact_pots = self.calib_pots.T
+        accepted = scrn_pots[
+            (exact_pots <= repulsion_thresh) & numpy.isfinite(scrn_pots)]
+        cutoff = max([repulsion_thresh] + list(accepted))
+        return cutoff + SCREEN_MARGIN * abs(cutoff)
+
+    def low_repulsion(self, vals, repulsion_thresh=40.0):
+        """ Assess which samples may pass the automol check at the threshold
+            (kcal/mol), i.e. all but those whose screen excess is above the
+            cutoff. Samples whose potential could not be evaluated
+            (degenerate Z-Matrix references) pass the screen, leaving them
+            to the full check.
+
+            :param vals: values of the torsions for each sample (radians)
+            :type vals: numpy.ndarray
+            :rtype: numpy.ndarray(bool)
+        """
+        with numpy.errstate(invalid='ignore'):
+            excess = self.potentials(vals) - self.ref_pot
+            # The cutoff is never below the threshold plus the margin
+            if not numpy.any(excess > repulsion_thresh +
+                             SCREEN_MARGIN * abs(repulsion_thresh)):
+                return numpy.ones(excess.shape, dtype=bool)
+            return ~(excess > self.cutoff(repulsion_thresh))
+
+    def _calibrate(self):
+        """ Evaluate the excess potentials of the screen and of automol
+            over the reference at the calibration samples
+        """
+
+        self.calib_pots = numpy.empty((0, 2))
+        if self.names:
+            _, calib_vals = torsion_values(
+                self.tors_range_dct, range(CALIB_NSAMP), seed=CALIB_SEED)
+            ref_pot = automol.pot.intramol_interaction_potential_sum(
+                automol.zmat.geometry(self.zma))
+            exact_pots = [
+                automol.pot.intramol_interaction_potential_sum(
+                    automol.zmat.geometry(samp_zma)) - ref_pot
+                for samp_zma in zmas_from_values(
+                    self.zma, self.names, calib_vals)]
+            self.calib_pots = numpy.column_stack(
+                (self.potentials(calib_vals) - self.ref_pot, exact_pots))
+
+
+def _read_index(idx_path):
+    """ Read the indices saved for each strategy, empty if there are none
+    """
+    idx_dct = {}
+    if os.path.exists(idx_path):
+        try:
+            with open(idx_path, 'r', encoding='utf-8') as idx_file:
+                idx_dct = json.load(idx_file)
+        except (OSError, ValueError):
+            warning_message(f'Could not read sample index {idx_path}')
+            idx_dct = {}
+    return idx_dct
+
+
+def _cartesians(key_mat, val_mats):
+    """ Convert a batch of Z-Matrix values into Cartesian coordinates,
+        placing each atom from its references for all samples at once.
+        The orientation is arbitrary, which leaves all distances unchanged.
+    """
+
+    nsamp, natm = val_mats.shape[:2]
+    xyzs = numpy.zeros((nsamp, natm, 3))
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        for key in range(1, natm):
+            dist, ang, dih = (val_mats[:, key, col] for col in range(3))
+            key_a, key_b, key_c = key_mat[key]
+            pos_a = xyzs[:, key_a]
+            if key == 1:
+                xyzs[:, key, 2] = pos_a[:, 2] + dist
+                continue
+            pos_b = xyzs[:, key_b]
+            pos_c = (xyzs[:, key_c] if key > 2 else
+                     pos_b + numpy.array([1.0, 0.0, 0.0]))
+            if key == 2:
+                dih = numpy.zeros(nsamp)
+
+            u_ba = _unit(pos_a - pos_b)
+            u_nrm = _unit(numpy.cross(pos_b - pos_c, u_ba))
+            u_prp = numpy.cross(u_nrm, u_ba)
+            xyzs[:, key] = (
+                pos_a
+                - (dist * numpy.cos(ang))[:, None] * u_ba
+                + (dist * numpy.sin(ang) * numpy.cos(dih))[:, None] * u_prp
+                + (dist * numpy.sin(ang) * numpy.sin(dih))[:, None] * u_nrm)
+
+    return xyzs
+
+
+def _unit(vecs):
+    """ Normalize each of a set of vectors
+    """
+    return vecs / numpy.linalg.norm(vecs, axis=-1)[..., None]
+
+
+def _halton(ndim, nums):
+    """ Points of the Halton sequence for a set of (1-based) indices
+    """
+    pnts = numpy.zeros((len(nums), ndim))
+    for dim, base in enumerate(_primes(ndim)):
+        rem = numpy.array(nums, dtype=numpy.int64)
+        frac = 1.0 / base
+        while numpy.any(rem > 0):
+            pnts[:, dim] += frac * (rem % base)
+            rem //= base
+            frac /= base
+    return pnts
+
+
+def _latin_hypercube(ndim, nsamp, seed):
+    """ Latin hypercube of nsamp points: each torsion has one point in
+        each of nsamp equal strata, placed randomly within the stratum
+    """
+    rng = numpy.random.default_rng(seed)
+    strata = numpy.array([rng.permutation(nsamp) for _ in range(ndim)]).T
+    return (strata + rng.random((nsamp, ndim))) / nsamp
+
+
+def _primes(num):
+    """ The first num primes, the bases of the Halton sequence
+    """
+    primes = []
+    cand = 2
+    while len(primes) < num:
+        if all(cand % prime for prime in primes if prime * prime <= cand):
+            primes.append(cand)
+        cand += 1
+    return primes
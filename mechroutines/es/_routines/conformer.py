@@ -2,11 +2,11 @@
 """
 
 import shutil
-import time
 import automol
 import elstruct
 import autofile
 from autofile import fs
+from autorun import execute_function_in_parallel
 from mechanalyzer.inf import thy as tinfo
 from mechlib import filesys
 from mechlib.amech_io.printer import info_message, warning_message
@@ -14,6 +14,7 @@ from mechlib.amech_io.printer import debug_message, error_message, obj
 from mechlib.amech_io.printer import existing_path, bad_conformer, checking
 from mechroutines.es import runner as es_runner
 from mechroutines.es._routines import _util as util
+from mechroutines.es._routines import _sample as sampling
 from mechroutines.es._routines._geom import remove_imag
 
 
@@ -314,7 +315,7 @@ def single_conformer(zma, spc_info, mod_thy_info,
 
         # Run the optimization
         info_message('Optimizing a single conformer...')
-        success, ret = es_runner.execute_job(
+        es_runner.run_job(
             job=elstruct.Job.OPTIMIZATION,
             script_str=script_str,
             run_fs=run_fs,
@@ -328,15 +329,14 @@ def single_conformer(zma, spc_info, mod_thy_info,
             retryfail=retryfail,
             **kwargs
         )
+        success, ret = es_runner.read_parsed_job(
+            job=elstruct.Job.OPTIMIZATION, run_fs=run_fs)
 
         if success:
-            inf_obj, _, out_str = ret
-            prog = inf_obj.prog
-            method = inf_obj.method
-            ene = elstruct.reader.energy(prog, method, out_str)
-            geo = elstruct.reader.opt_geometry(prog, out_str)
+            ene = filesys.parsed.value(ret, 'energy')
+            geo = filesys.parsed.value(ret, 'opt_geometry')
             # zma = elstruct.reader.opt_zmatrix(prog, out_str)
-            saved_locs, saved_geos, saved_enes = _saved_cnf_info(
+            _, saved_geos, saved_enes = _saved_cnf_info(
                 cnf_save_fs, mod_thy_info)
 
             if _geo_unique(geo, ene, saved_geos, saved_enes, zrxn=zrxn):
@@ -372,9 +372,8 @@ def single_conformer(zma, spc_info, mod_thy_info,
                         ret, None, cnf_save_fs, mod_thy_info[1:],
                         zrxn=zrxn, init_zma=zma,
                         rng_locs=(locs[0],), tors_locs=(locs[1],))
-                    saved_geos.append(geo)
-                    saved_enes.append(ene)
-                    saved_locs.append(locs)
+                    filesys.cnfidx.add(
+                        cnf_save_fs, mod_thy_info, locs, geo, ene)
 
                     # Update the conformer trajectory file
                     obj('vspace')
@@ -392,8 +391,20 @@ def conformer_sampling(zma, spc_info, thy_info,
                        zrxn=None, two_stage=False,
                        retryfail=False, resave=False,
                        repulsion_thresh=40.0, print_debug=True,
+                       njobs=1,
                        **kwargs):
     """ run sampling algorithm to find conformers
+
+        If njobs > 1, samples are generated in batches of njobs and the
+        optimizations of each batch are run concurrently. The optimized
+        structures are then read and saved one at a time, so the uniqueness
+        checks against the save filesystem are unchanged.
+
+        The torsions are placed by the sampling strategy given in nsamp_par
+        (see _sample.strategy). The index of the next point of the sequence,
+        counting the candidates rejected for repulsion, is saved in the run
+        filesystem of the ring after each batch so that a restarted search
+        continues the sequence.
     """
 
     # Check if any saving needs to be done before hand
@@ -411,6 +422,12 @@ def conformer_sampling(zma, spc_info, thy_info,
         tors_names, nsamp_par, zma, zrxn=zrxn)
     nsamp0 = nsamp
     nsampd = util.calc_nsampd(cnf_save_fs, cnf_run_fs, rid)
+    samp_strategy = sampling.strategy(nsamp_par)
+    # Searches run before the index was saved continue from the number
+    # of samples run for the ring
+    idx_path = cnf_run_fs[1].path([rid])
+    pnt_idx = sampling.next_index(
+        idx_path, samp_strategy, default=len(cnf_run_fs[-1].existing([rid])))
 
     tot_samp = nsamp - nsampd
     brk_tot_samp = nsamp * 5
@@ -423,7 +440,17 @@ def conformer_sampling(zma, spc_info, thy_info,
         info_message(
             f'Running {nsamp-nsampd} samples...', newline=1)
 
+    # Set the frozen coordinates for two-stage optimizations
+    tors_names = tuple(tors_range_dct.keys()) if tors_range_dct else ()
+    if two_stage and tors_names:
+        frozen_coords_lst = (tors_names, ())
+    else:
+        frozen_coords_lst = None
+
     # Generate all of the conformers, as needed
+    ref_pot = automol.pot.intramol_interaction_potential_sum(
+        automol.zmat.geometry(zma))
+    screen = None
     samp_idx = 1
     samp_attempt_idx = 1
     while True:
@@ -434,27 +461,119 @@ def conformer_sampling(zma, spc_info, thy_info,
                 'Requested number of samples have been completed.',
                 'Conformer search complete.')
             break
-        if samp_attempt_idx == brk_tot_samp:
+        if samp_attempt_idx >= brk_tot_samp:
             info_message(
                 f'Max sample num: 5*{nsamp} attempted, ending search',
                 'Run again if more samples desired.')
             break
 
-        # Run the conformer sampling
-        if nsampd > 0:
-            samp_zma, = automol.zmat.samples(zma, 1, tors_range_dct)
+        # Build a batch of sample Z-Matrices and their run filesystems,
+        # no larger than the number of samples still to be done
+        nbatch = min(njobs, nsamp0 - nsampd, brk_tot_samp - samp_attempt_idx)
+        samp_lst = ()
+        for _ in range(nbatch):
+            if nsampd > 0 or samp_lst:
+                if screen is None:
+                    screen = sampling.RepulsionScreen(zma, tors_range_dct)
+                samp_zma, pnt_idx = _low_repulsion_sample(
+                    zma, tors_range_dct, ref_pot, screen, pnt_idx,
+                    samp_strategy=samp_strategy, nsamp=nsamp0,
+                    repulsion_thresh=repulsion_thresh,
+                    print_debug=print_debug)
+            else:
+                samp_zma = zma
+
+            cid = autofile.schema.generate_new_conformer_id()
+            locs = [rid, cid]
+            cnf_run_fs[-1].create(locs)
+            samp_lst += ((samp_zma, locs),)
+        sampling.save_next_index(idx_path, samp_strategy, pnt_idx)
+
+        # Run the optimizations for the batch
+        if nbatch == 1:
+            info_message(f"Run {samp_idx}/{tot_samp}")
+            samp_zma, locs = samp_lst[0]
+            run_fs = autofile.fs.run(cnf_run_fs[-1].path(locs))
+            success, ret = _optimize_sample(
+                samp_zma, run_fs, spc_info, thy_info, script_str,
+                overwrite, frozen_coords_lst=frozen_coords_lst,
+                zrxn=zrxn, retryfail=retryfail, **kwargs)
+            rets = ((samp_zma, locs, success, ret),)
         else:
-            samp_zma = zma
+            info_message(
+                f"Runs {samp_idx}-{samp_idx+nbatch-1}/{tot_samp}",
+                f"running concurrently on {nbatch} workers")
+            args = (cnf_run_fs, spc_info, thy_info, script_str, overwrite,
+                    frozen_coords_lst, zrxn, retryfail, kwargs)
+            _ = execute_function_in_parallel(
+                _optimize_sample_batch, samp_lst, args, nprocs=nbatch)
+            rets = ()
+            for samp_zma, locs in samp_lst:
+                run_fs = autofile.fs.run(cnf_run_fs[-1].path(locs))
+                success, ret = es_runner.read_parsed_job(
+                    job=elstruct.Job.OPTIMIZATION, run_fs=run_fs)
+                rets += ((samp_zma, locs, success, ret),)
+
+        # Save the successful optimizations serially
+        for samp_zma, locs, success, ret in rets:
+            if success:
+                save_conformer(
+                    ret, cnf_run_fs, cnf_save_fs, locs, thy_info,
+                    zrxn=zrxn, orig_ich=spc_info[0], rid_traj=True,
+                    init_zma=samp_zma)
+
+                nsampd = util.calc_nsampd(cnf_save_fs, cnf_run_fs, rid)
+                nsampd += 1
+                samp_idx += 1
+                inf_obj.nsamp = nsampd
+                cnf_save_fs[1].file.info.write(inf_obj, [rid])
+                cnf_run_fs[1].file.info.write(inf_obj, [rid])
+
+            # Increment attempt counter
+            samp_attempt_idx += 1
+
+
+def _low_repulsion_sample(zma, tors_range_dct, ref_pot, screen, pnt_idx,
+                          samp_strategy='random', nsamp=None,
+                          repulsion_thresh=40.0, print_debug=True):
+    """ Generate a sample Z-Matrix whose intramolecular repulsion
+        does not exceed that of the reference by more than the threshold
+
+        Samples are taken from the sequence of the sampling strategy
+        starting at pnt_idx; the index of the next sample is returned
+        along with the Z-Matrix. Candidates are pre-screened in batches
+        of _sample.SCREEN_BATCH, and only those that pass the screen are
+        built and checked with automol.pot. If none of 1001 candidates
+        pass, the last one is returned.
+    """
 
-        info_message(
-            'Generating sample Z-Matrix that does not have',
-            'high intramolecular repulsion...')
-        bad_geo_cnt = 0
-        ref_pot = automol.pot.intramol_interaction_potential_sum(
-            automol.zmat.geometry(zma))
-        samp_pot = automol.pot.intramol_interaction_potential_sum(
-            automol.zmat.geometry(samp_zma))
-        while samp_pot-ref_pot > repulsion_thresh and bad_geo_cnt < 1000:
+    info_message(
+        'Generating sample Z-Matrix that does not have',
+        'high intramolecular repulsion...')
+    max_ncand = 1001
+    ncand = 0
+    samp_zma = zma
+    while ncand < max_ncand:
+        nscreen = min(sampling.SCREEN_BATCH, max_ncand - ncand)
+        names, vals = sampling.torsion_values(
+            tors_range_dct, range(pnt_idx, pnt_idx + nscreen),
+            samp_strategy=samp_strategy, nsamp=nsamp)
+        low_rep_lst = screen.low_repulsion(vals, repulsion_thresh)
+        if print_debug and not all(low_rep_lst):
+            warning_message(
+                f'{nscreen - sum(low_rep_lst)} of {nscreen} sample',
+                'Z-Matrices rejected by the repulsion pre-screen.')
+        for row, low_rep in enumerate(low_rep_lst):
+            ncand += 1
+            pnt_idx += 1
+            if not (low_rep or ncand == max_ncand):
+                continue
+            samp_zma, = sampling.zmas_from_values(
+                zma, names, vals[row:row+1])
+            samp_pot = automol.pot.intramol_interaction_potential_sum(
+                automol.zmat.geometry(samp_zma))
+            if samp_pot-ref_pot <= repulsion_thresh:
+                return samp_zma, pnt_idx
             if print_debug:
                 warning_message('Structure has high repulsion.')
                 warning_message(
@@ -463,67 +582,70 @@ def conformer_sampling(zma, spc_info, thy_info,
                     f'Diff:{samp_pot-ref_pot:.2f}')
                 warning_message(
                     'Generating new sample Z-Matrix')
-            samp_zma, = automol.zmat.samples(zma, 1, tors_range_dct)
-            samp_pot = automol.pot.intramol_interaction_potential_sum(
-                automol.zmat.geometry(samp_zma))
-            bad_geo_cnt += 1
 
-        cid = autofile.schema.generate_new_conformer_id()
-        locs = [rid, cid]
+    return samp_zma, pnt_idx
 
-        cnf_run_fs[-1].create(locs)
-        cnf_run_path = cnf_run_fs[-1].path(locs)
-        run_fs = autofile.fs.run(cnf_run_path)
 
-        info_message(f"Run {samp_idx}/{tot_samp}")
-        tors_names = tuple(tors_range_dct.keys())
-        print('two_stage test:', two_stage, tors_names)
-        if two_stage and tors_names:
-            frozen_coords_lst = (tors_names, ())
-            success, ret = es_runner.multi_stage_optimization(
-                script_str=script_str,
-                run_fs=run_fs,
-                geo=samp_zma,
-                spc_info=spc_info,
-                thy_info=thy_info,
-                frozen_coords_lst=frozen_coords_lst,
-                zrxn=zrxn,
-                overwrite=overwrite,
-                saddle=bool(zrxn is not None),
-                retryfail=retryfail,
-                **kwargs
-            )
-        else:
-            success, ret = es_runner.execute_job(
-                job=elstruct.Job.OPTIMIZATION,
-                script_str=script_str,
-                run_fs=run_fs,
-                geo=samp_zma,
-                spc_info=spc_info,
-                thy_info=thy_info,
-                zrxn=zrxn,
-                overwrite=overwrite,
-                saddle=bool(zrxn is not None),
-                retryfail=retryfail,
-                **kwargs
-            )
+def _optimize_sample(samp_zma, run_fs, spc_info, thy_info,
+                     script_str, overwrite,
+                     frozen_coords_lst=None, zrxn=None, retryfail=False,
+                     **kwargs):
+    """ Optimize a sample Z-Matrix, in two stages if frozen
+        coordinates are given
+    """
 
-        # save function added here
-        if success:
-            save_conformer(
-                ret, cnf_run_fs, cnf_save_fs, locs, thy_info,
-                zrxn=zrxn, orig_ich=spc_info[0], rid_traj=True,
-                init_zma=samp_zma)
+    if frozen_coords_lst is not None:
+        success, ret = es_runner.multi_stage_optimization(
+            script_str=script_str,
+            run_fs=run_fs,
+            geo=samp_zma,
+            spc_info=spc_info,
+            thy_info=thy_info,
+            frozen_coords_lst=frozen_coords_lst,
+            zrxn=zrxn,
+            overwrite=overwrite,
+            saddle=bool(zrxn is not None),
+            retryfail=retryfail,
+            **kwargs
+        )
+    else:
+        success, ret = es_runner.execute_job(
+            job=elstruct.Job.OPTIMIZATION,
+            script_str=script_str,
+            run_fs=run_fs,
+            geo=samp_zma,
+            spc_info=spc_info,
+            thy_info=thy_info,
+            zrxn=zrxn,
+            overwrite=overwrite,
+            saddle=bool(zrxn is not None),
+            retryfail=retryfail,
+            **kwargs
+        )
 
-            nsampd = util.calc_nsampd(cnf_save_fs, cnf_run_fs, rid)
-            nsampd += 1
-            samp_idx += 1
-            inf_obj.nsamp = nsampd
-            cnf_save_fs[1].file.info.write(inf_obj, [rid])
-            cnf_run_fs[1].file.info.write(inf_obj, [rid])
+    return success, ret
+
+
+def _optimize_sample_batch(cnf_run_fs, spc_info, thy_info,
+                           script_str, overwrite,
+                           frozen_coords_lst, zrxn, retryfail, kwargs,
+                           samp_lst, output_queue=None):
+    """ Optimize the (sample Z-Matrix, locs) handed to a worker process.
+        Results are left in the run filesystem to be read by the parent.
+    """
 
-        # Increment attempt counter
-        samp_attempt_idx += 1
+    ran_locs = ()
+    try:
+        for samp_zma, locs in samp_lst:
+            run_fs = autofile.fs.run(cnf_run_fs[-1].path(locs))
+            _optimize_sample(
+                samp_zma, run_fs, spc_info, thy_info,
+                script_str, overwrite,
+                frozen_coords_lst=frozen_coords_lst,
+                zrxn=zrxn, retryfail=retryfail, **kwargs)
+            ran_locs += (tuple(locs),)
+    finally:
+        output_queue.put((ran_locs,))
 
 
 def _num_samp_zmas(ring_atoms, nsamp_par):
@@ -576,7 +698,10 @@ def ring_conformer_sampling(
         ring_atoms = [int(idx)-1 for idx in ring_atoms.split('-')]
         dist_value_dct = automol.zmat.ring_distances(zma, ring_atoms)
         nsamp = _num_samp_zmas(ring_atoms, nsamp_par)
-        samp_zmas = automol.zmat.samples(zma, nsamp, samp_range_dct)
+        names, vals = sampling.torsion_values(
+            samp_range_dct, range(nsamp),
+            samp_strategy=sampling.strategy(nsamp_par), nsamp=nsamp)
+        samp_zmas = sampling.zmas_from_values(zma, names, vals)
         for samp_zma in samp_zmas:
             if automol.zmat.ring_distances_reasonable(
                     samp_zma, ring_atoms, dist_value_dct):
@@ -702,7 +827,7 @@ def _presamp_save(spc_info, cnf_run_fs, cnf_save_fs,
                     print(f"\nReading from conformer run at {cnf_run_path}")
 
                     # Read the electronic structure optimization job
-                    success, ret = es_runner.read_job(
+                    success, ret = es_runner.read_parsed_job(
                         job=job, run_fs=run_fs)
 
                     if success:
@@ -730,11 +855,8 @@ def save_conformer(ret, cnf_run_fs, cnf_save_fs, locs, thy_info, zrxn=None,
     saved_locs, saved_geos, saved_enes = _saved_cnf_info(
         cnf_save_fs, thy_info, locs)
 
-    inf_obj, _, out_str = ret
-    prog = inf_obj.prog
-    method = inf_obj.method
-    ene = elstruct.reader.energy(prog, method, out_str)
-    geo = elstruct.reader.opt_geometry(prog, out_str)
+    ene = filesys.parsed.value(ret, 'energy')
+    geo = filesys.parsed.value(ret, 'opt_geometry')
     zma = None
     if init_zma is not None:
         zma = filesys.save.read_zma_from_geo(init_zma, geo)
@@ -761,6 +883,7 @@ def save_conformer(ret, cnf_run_fs, cnf_save_fs, locs, thy_info, zrxn=None,
                     ret, None, cnf_save_fs, thy_info[1:],
                     init_zma=init_zma,  zrxn=zrxn,
                     rng_locs=(locs[0],), tors_locs=(locs[1],))
+                filesys.cnfidx.add(cnf_save_fs, thy_info, locs, geo, ene)
             else:
                 sym_locs = saved_locs[sym_id]
                 filesys.save.sym_indistinct_conformer(
@@ -790,48 +913,8 @@ def save_conformer(ret, cnf_run_fs, cnf_save_fs, locs, thy_info, zrxn=None,
 def _saved_cnf_info(cnf_save_fs, mod_thy_info, orig_locs=None):
     """ get the locs, geos and enes for saved conformers
     """
-
-    saved_locs = list(cnf_save_fs[-1].existing())
-    saved_locs = [locs for locs in saved_locs if not locs == orig_locs]
-    saved_geos = [cnf_save_fs[-1].file.geometry.read(locs)
-                  for locs in saved_locs]
-    found_saved_locs = []
-    found_saved_geos = []
-    found_saved_enes = []
-    for idx, locs in enumerate(saved_locs):
-        path = cnf_save_fs[-1].path(locs)
-        sp_save_fs = autofile.fs.single_point(path)
-        if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
-            found_saved_enes.append(sp_save_fs[-1].file.energy.read(
-                mod_thy_info[1:4]))
-            found_saved_locs.append(saved_locs[idx])
-            found_saved_geos.append(saved_geos[idx])
-        else:
-            info_message(
-                f'No energy saved in single point directory for {path}')
-            # geo_inf_obj = cnf_save_fs[-1].file.geometry_info.read(
-            #     mod_thy_info[1:4])
-            geo_inf_obj = cnf_save_fs[-1].file.geometry_info.read(
-                locs)
-            geo_end_time = geo_inf_obj.utc_end_time
-            current_time = autofile.schema.utc_time()
-            if (current_time - geo_end_time).total_seconds() < 120:
-                last_time = (current_time - geo_end_time).total_seconds()
-                wait_time = 120 - last_time
-                info_message(
-                    f'Geo was saved in the last {last_time:3.2f} seconds, '
-                    f'waiting for {wait_time:3.2f} seconds')
-                time.sleep(wait_time)
-                if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
-                    found_saved_enes.append(sp_save_fs[-1].file.energy.read(
-                        mod_thy_info[1:4]))
-                    found_saved_locs.append(saved_locs[idx])
-                    found_saved_geos.append(saved_geos[idx])
-                    info_message('the energy is now found')
-                else:
-                    info_message('waiting helped nothing')
-
-    return found_saved_locs, found_saved_geos, found_saved_enes
+    return filesys.cnfidx.saved_info(
+        cnf_save_fs, mod_thy_info, orig_locs=orig_locs)
 
 
 def _init_geom_is_running(cnf_run_fs):
@@ -844,6 +927,8 @@ def _init_geom_is_running(cnf_run_fs):
         run_fs = autofile.fs.run(cnf_run_path)
         inf_obj = run_fs[-1].file.info.read([job])
         status = inf_obj.status
+        if _job_abandoned(run_fs[-1].path([job])):
+            continue
         if status == autofile.schema.RunStatus.RUNNING:
             start_time = inf_obj.utc_start_time
             current_time = autofile.schema.utc_time()
@@ -890,10 +975,19 @@ def this_conformer_is_running(zma, cnf_run_fs):
 
     running = False
     job = elstruct.Job.OPTIMIZATION
+
+    # Skip reading the info files of jobs the ledger has finished
+    ledger_dct = filesys.ledger.statuses(cnf_run_fs[0].path(), job=job)
+    running_status = str(autofile.schema.RunStatus.RUNNING)
+
     for locs in cnf_run_fs[-1].existing(ignore_bad_formats=True):
         cnf_run_path = cnf_run_fs[-1].path(locs)
         run_fs = autofile.fs.run(cnf_run_path)
         run_path = run_fs[-1].path([job])
+        if ledger_dct.get(run_path, running_status) != running_status:
+            continue
+        if _job_abandoned(run_path):
+            continue
         if run_fs[-1].file.info.exists([job]):
             inf_obj = run_fs[-1].file.info.read([job])
             status = inf_obj.status
@@ -917,6 +1011,13 @@ def this_conformer_is_running(zma, cnf_run_fs):
     return running
 
 
+def _job_abandoned(run_path):
+    """ Assess if a job was left running by a process that has died,
+        from the lease on the job expiring
+    """
+    return filesys.lease.is_stale(filesys.lease.job_lease_path(run_path))
+
+
 def _geo_connected(geo, rxn):
     """ Assess if geometry is connected. Right now only works for
         minima
@@ -946,21 +1047,8 @@ def _geo_unique(geo, ene, seen_geos, seen_enes, zrxn=None):
         Need to pass the torsions
     """
 
-    if zrxn is None:
-        check_dct = {'dist': 0.3, 'tors': None}
-    else:
-        check_dct = {'dist': 0.3}
-
-    no_similar_energies = True
-    for sene in seen_enes:
-        if abs(sene - ene) < 1e-5:
-            no_similar_energies = False
-
-    if no_similar_energies:
-        unique = True
-    else:
-        unique, _ = automol.geom.is_unique(
-            geo, seen_geos, check_dct=check_dct)
+    unique = filesys.dedup.geo_unique(
+        geo, ene, seen_geos, seen_enes, zrxn=zrxn)
 
     if not unique:
         bad_conformer('not unique')
@@ -1002,20 +1090,11 @@ def _sym_unique(geo, ene, saved_geos, saved_enes, ethresh=1.0e-5):
         existing conformers in the filesystem
     """
 
-    sym_idx = None
-    new_saved_geos = []
-    idx_dct = {}
-    for i, (sene, sgeo) in enumerate(zip(saved_enes, saved_geos)):
-        if abs(ene - sene) < ethresh:
-            idx_dct[len(new_saved_geos)] = i
-            new_saved_geos.append(sgeo)
-    if new_saved_geos:
-        _, sym_idx = automol.geom.is_unique(
-            geo, new_saved_geos, check_dct={'coulomb': 1e-2})
+    sym_idx = filesys.dedup.sym_unique(
+        geo, ene, saved_geos, saved_enes, ethresh=ethresh)
 
     if sym_idx is not None:
         print(' - Structure is not symmetrically unique.')
-        sym_idx = idx_dct[sym_idx]
 
     return sym_idx
 
@@ -3,6 +3,7 @@
 
 import automol
 import elstruct
+from autorun import execute_function_in_parallel
 from mechlib.amech_io import printer as ioprinter
 from mechroutines.es.runner import scan, qchem_params
 
@@ -15,8 +16,19 @@ def hindered_rotor_scans(
         zrxn=None,
         saddle=False,
         increment=0.5235987756,
-        retryfail=True):
+        retryfail=True,
+        njobs=1,
+        full_sweep=False):
     """ Perform scans over each of the torsional coordinates
+
+        For rigid scans with njobs > 1, the points of all of the rotors
+        are run together on njobs processes. For relaxed scans, the rotors
+        are run as up to njobs concurrent chains of scan points.
+
+        After the forward sweep of a relaxed scan, the backsteps only
+        re-optimize the points flagged as discontinuities from their
+        neighbors, unless full_sweep requests the full reverse sweep of
+        the grid followed by the usual backsteps.
     """
 
     if tors_model != '1dhrfa':
@@ -25,7 +37,8 @@ def hindered_rotor_scans(
         scn_typ = 'relaxed'
         update_guess = True
         backstep = True
-        reverse_sweep = True
+        reverse_sweep = full_sweep
+        repair_sweep = not full_sweep
     else:
         script_str, kwargs = qchem_params(
             method_dct, job=elstruct.Job.ENERGY)
@@ -33,6 +46,7 @@ def hindered_rotor_scans(
         update_guess = False
         backstep = False
         reverse_sweep = False
+        repair_sweep = False
 
     # backstep = False
     run_tors_names = automol.rotor.names(rotors)
@@ -43,16 +57,109 @@ def hindered_rotor_scans(
         zma, run_tors_names, tors_model)
 
     ioprinter.run_rotors(run_tors_names, const_names)
-    for tors_names, tors_grids in zip(run_tors_names, run_tors_grids):
 
+    # Set the scan info for each rotor
+    rotor_lst = tuple(
+        (tors_names, tors_grids,
+         automol.zmat.constraint_dct(zma, const_names, tors_names))
+        for tors_names, tors_grids in zip(run_tors_names, run_tors_grids))
+
+    if scn_typ == 'rigid' and njobs > 1:
+        scan.execute_rigid_scans(
+            zma=zma,
+            spc_info=spc_info,
+            mod_thy_info=mod_thy_info,
+            scan_lst=rotor_lst,
+            scn_run_fs=scn_run_fs,
+            scn_save_fs=scn_save_fs,
+            script_str=script_str,
+            overwrite=overwrite,
+            njobs=njobs,
+            zrxn=zrxn,
+            retryfail=retryfail,
+            **kwargs,
+        )
+        return
+
+    args = (zma, spc_info, mod_thy_info, scn_run_fs, scn_save_fs,
+            scn_typ, script_str, overwrite, zrxn, update_guess,
+            reverse_sweep, repair_sweep, backstep, saddle, retryfail,
+            kwargs)
+
+    if njobs > 1 and len(rotor_lst) > 1:
+        # Each rotor is an independent chain of scan points, so run
+        # the rotors at the same time on up to njobs processes
+        for tors_names, _, constraint_dct in rotor_lst:
+            coord_locs = (
+                tors_names if constraint_dct is None else constraint_dct)
+            scn_run_fs[1].create([coord_locs])
+            scn_save_fs[1].create([coord_locs])
+        nprocs = min(njobs, len(rotor_lst))
         ioprinter.info_message(
-            f'Running Rotor: {"-".join(tors_names)}', newline=1)
+            f'Running {len(rotor_lst)} rotors on {nprocs} processes',
+            newline=1)
+        execute_function_in_parallel(
+            _scan_rotors, rotor_lst, args, nprocs=nprocs)
+    else:
+        for tors_names, tors_grids, constraint_dct in rotor_lst:
+            _scan_rotor(*args, tors_names, tors_grids, constraint_dct)
 
-        # Setting the constraints
-        constraint_dct = automol.zmat.constraint_dct(
-            zma, const_names, tors_names)
 
-        scan.execute_scan(
+def _scan_rotors(zma, spc_info, mod_thy_info, scn_run_fs, scn_save_fs,
+                 scn_typ, script_str, overwrite, zrxn, update_guess,
+                 reverse_sweep, repair_sweep, backstep, saddle, retryfail,
+                 kwargs, rotor_lst, output_queue=None):
+    """ Run the scans for the rotors handed to a worker process,
+        labeling the output of each rotor
+    """
+
+    args = (zma, spc_info, mod_thy_info, scn_run_fs, scn_save_fs,
+            scn_typ, script_str, overwrite, zrxn, update_guess,
+            reverse_sweep, repair_sweep, backstep, saddle, retryfail,
+            kwargs)
+    ran_rotors = ()
+    try:
+        for tors_names, tors_grids, constraint_dct in rotor_lst:
+            rotor_label = '-'.join(tors_names)
+            with ioprinter.prefixed_output(f'[hr {rotor_label}] '):
+                _scan_rotor(*args, tors_names, tors_grids, constraint_dct)
+            ran_rotors += (tuple(tors_names),)
+    finally:
+        output_queue.put((ran_rotors,))
+
+
+def _scan_rotor(zma, spc_info, mod_thy_info, scn_run_fs, scn_save_fs,
+                scn_typ, script_str, overwrite, zrxn, update_guess,
+                reverse_sweep, repair_sweep, backstep, saddle, retryfail,
+                kwargs, tors_names, tors_grids, constraint_dct):
+    """ Run the scan and backsteps for a single rotor
+    """
+
+    ioprinter.info_message(
+        f'Running Rotor: {"-".join(tors_names)}', newline=1)
+
+    scan.execute_scan(
+        zma=zma,
+        spc_info=spc_info,
+        mod_thy_info=mod_thy_info,
+        coord_names=tors_names,
+        coord_grids=tors_grids,
+        scn_run_fs=scn_run_fs,
+        scn_save_fs=scn_save_fs,
+        scn_typ=scn_typ,
+        script_str=script_str,
+        overwrite=overwrite,
+        zrxn=zrxn,
+        update_guess=update_guess,
+        reverse_sweep=reverse_sweep,
+        saddle=saddle,
+        constraint_dct=constraint_dct,
+        retryfail=retryfail,
+        **kwargs,
+    )
+    if backstep:
+        ioprinter.info_message('Attempting backstep routine')
+        scan.run_backsteps(
             zma=zma,
             spc_info=spc_info,
             mod_thy_info=mod_thy_info,
@@ -63,32 +170,12 @@ def hindered_rotor_scans(
             scn_typ=scn_typ,
             script_str=script_str,
             overwrite=overwrite,
-            zrxn=zrxn,
-            update_guess=update_guess,
-            reverse_sweep=reverse_sweep,
             saddle=saddle,
             constraint_dct=constraint_dct,
             retryfail=retryfail,
+            targeted=repair_sweep,
             **kwargs,
         )
-        if backstep:
-            ioprinter.info_message('Attempting backstep routine')
-            scan.run_backsteps(
-                zma=zma,
-                spc_info=spc_info,
-                mod_thy_info=mod_thy_info,
-                coord_names=tors_names,
-                coord_grids=tors_grids,
-                scn_run_fs=scn_run_fs,
-                scn_save_fs=scn_save_fs,
-                scn_typ=scn_typ,
-                script_str=script_str,
-                overwrite=overwrite,
-                saddle=saddle,
-                constraint_dct=constraint_dct,
-                retryfail=retryfail,
-                **kwargs,
-            )
 
 
 def check_hr_pot(tors_pots, tors_zmas, tors_paths, emax=-0.5, emin=-10.0):
@@ -5,13 +5,18 @@ import numpy
 import automol
 import elstruct
 import autofile
-from phydat import phycon
+from autorun import execute_function_in_parallel
 from mechlib import filesys
 from mechlib.amech_io.printer import reading, info_message
 from mechlib.amech_io.printer import debug_message, warning_message
 from mechlib.amech_io.printer import save_geo, save_energy
 from mechroutines.es import runner as es_runner
 from mechroutines.es._routines import _util as util
+from mechroutines.es._routines import _sample as sampling
+
+
+# Number of samples run between checks of the convergence of the MC PF
+PF_CHECK_BATCH = 25
 
 
 def tau_sampling(zma, ref_ene, spc_info,
@@ -23,8 +28,13 @@ def tau_sampling(zma, ref_ene, spc_info,
                  tors_names=(),
                  repulsion_thresh=40.0,
                  zrxn=None, resave=False,
+                 pf_tol=None, njobs=1, seed=None,
                  **kwargs):
     """ Sample over torsions optimizing all other coordinates
+
+        If pf_tol is given, sampling stops before the requested number of
+        samples once the relative error of the Monte Carlo partition
+        function is below pf_tol at all of the filesys.taupf.PF_TEMPS.
     """
 
     if resave:
@@ -32,7 +42,8 @@ def tau_sampling(zma, ref_ene, spc_info,
             tau_run_fs=tau_run_fs,
             tau_save_fs=tau_save_fs,
             mod_thy_info=mod_thy_info,
-            db_style=db_style
+            db_style=db_style,
+            resave=True
         )
 
     run_tau(
@@ -47,6 +58,11 @@ def tau_sampling(zma, ref_ene, spc_info,
         tors_names=tors_names,
         repulsion_thresh=repulsion_thresh,
         zrxn=zrxn,
+        pf_tol=pf_tol,
+        ref_ene=ref_ene,
+        db_style=db_style,
+        njobs=njobs,
+        seed=seed,
         **kwargs,
     )
 
@@ -59,7 +75,7 @@ def tau_sampling(zma, ref_ene, spc_info,
 
     info_message(
         'Assessing the convergence of the Monte Carlo Partition Function...')
-    assess_pf_convergence(tau_save_fs, ref_ene)
+    assess_pf_convergence(tau_save_fs, ref_ene, db_style=db_style)
 
 
 def run_tau(zma, spc_info, thy_info,
@@ -67,8 +83,33 @@ def run_tau(zma, spc_info, thy_info,
             nsamp_par=(False, 3, 3, 1, 50, 50),
             tors_names=(),
             repulsion_thresh=40.0,
-            zrxn=None, **kwargs):
+            zrxn=None,
+            pf_tol=None, ref_ene=None, db_style='directory',
+            njobs=1, seed=None,
+            **kwargs):
     """ run sampling algorithm to find tau dependent geometries
+
+        Samples are run in batches of njobs concurrent optimizations. The
+        sample Z-Matrices and their locs are all built by the parent
+        process, so the workers never draw random numbers or generate
+        tau ids themselves.
+
+        :param pf_tol: relative error of the MC PF at which to stop
+            sampling, checked every PF_CHECK_BATCH samples (requires ref_ene).
+            The Boltzmann sums of the MC PF are read from the saved samples
+            once, and then the energies of each batch are added to them as
+            it is run; the batches are saved together after sampling.
+        :type pf_tol: float
+        :param njobs: number of optimizations to run concurrently
+        :type njobs: int
+        :param seed: seed for the torsions of the samples; the i-th sample
+            of a species is drawn from its own stream seeded by (seed, i),
+            so a seed always gives the same samples for any njobs
+        :type seed: int
+
+        The torsions are placed by the sampling strategy given in nsamp_par
+        (see _sample.strategy); each sample is built from its index in
+        the sequence of samples of the species.
     """
 
     # Set the filesystem objects
@@ -82,6 +123,7 @@ def run_tau(zma, spc_info, thy_info,
         tors_names, nsamp_par, zma, zrxn=zrxn)
     nsamp0 = nsamp
     nsampd = util.calc_nsampd(tau_save_fs, tau_run_fs, rid=None)
+    samp_strategy = sampling.strategy(nsamp_par)
 
     num_to_samp = nsamp - nsampd
 
@@ -96,6 +138,17 @@ def run_tau(zma, spc_info, thy_info,
 
     # Set the filesystem objects
     inf_obj = autofile.schema.info_objects.tau_trunk(0, tors_range_dct)
+    frozen_coords = tuple(tors_range_dct) if tors_range_dct else ()
+
+    ref_pot = automol.pot.intramol_interaction_potential_sum(
+        automol.zmat.geometry(zma))
+
+    # Boltzmann sums of the MC PF over the samples run so far
+    conv_dct = None
+    if pf_tol is not None:
+        save_tau(tau_run_fs, tau_save_fs, thy_info, db_style=db_style)
+        conv_dct = filesys.taupf.assess(
+            tau_save_fs, ref_ene, db_style=db_style)
 
     while True:
         nsamp = nsamp0 - nsampd
@@ -107,54 +160,82 @@ def run_tau(zma, spc_info, thy_info,
                 'Tau sampling complete.')
             break
 
-        samp_zma, = automol.zmat.samples(zma, 1, tors_range_dct)
-        tid = autofile.schema.generate_new_tau_id()
-        locs = [tid]
+        # Break the while loop if the MC PF has converged
+        if (pf_tol is not None and samp_idx > 1 and
+                (samp_idx - 1) % PF_CHECK_BATCH == 0):
+            if _pf_converged(conv_dct, pf_tol):
+                info_message(
+                    'MC partition function converged to within',
+                    f'{pf_tol} at all temperatures. Tau sampling complete.')
+                break
+
+        # Set the size of the batch, stopping at the next PF check
+        nbatch = min(max(njobs, 1), nsamp)
+        if pf_tol is not None:
+            nbatch = min(
+                nbatch, PF_CHECK_BATCH - (samp_idx - 1) % PF_CHECK_BATCH)
+
+        # Build the sample Z-Matrices of the batch and their run dirs
+        samp_lst = ()
+        batch_tids = set()
+        names, batch_vals = sampling.torsion_values(
+            tors_range_dct, range(nsampd, nsampd + nbatch),
+            samp_strategy=samp_strategy, nsamp=nsamp0, seed=seed)
+        batch_zmas = sampling.zmas_from_values(zma, names, batch_vals)
+        for samp_zma in batch_zmas:
+            tid = autofile.schema.generate_new_tau_id()
+            while tid in batch_tids or tau_run_fs[-1].exists([tid]):
+                tid = autofile.schema.generate_new_tau_id()
+            batch_tids.add(tid)
+            locs = [tid]
+
+            tau_run_fs[-1].create(locs)
+
+            info_message(f"\nRun {samp_idx}/{num_to_samp}")
+            samp_idx += 1
 
-        tau_run_fs[-1].create(locs)
-        tau_run_prefix = tau_run_fs[-1].path(locs)
-        run_fs = autofile.fs.run(tau_run_prefix)
-
-        info_message(f"\nRun {samp_idx}/{num_to_samp}")
-        samp_idx += 1
-
-        info_message(
-            'Generating sample Z-Matrix that does not have',
-            'high intramolecular repulsion...')
-        ref_pot = automol.pot.intramol_interaction_potential_sum(
-            automol.zmat.geometry(zma))
-        samp_pot = automol.pot.intramol_interaction_potential_sum(
-            automol.zmat.geometry(samp_zma))
-        if samp_pot-ref_pot < repulsion_thresh:
-            debug_message('ZMA fine.')
-            es_runner.run_job(
-                job=elstruct.Job.OPTIMIZATION,
-                script_str=script_str,
-                run_fs=run_fs,
-                geo=samp_zma,
-                spc_info=spc_info,
-                thy_info=thy_info,
-                saddle=bool(zrxn is not None),
-                overwrite=overwrite,
-                frozen_coordinates=tors_range_dct.keys(),
-                **kwargs
-            )
+            info_message(
+                'Generating sample Z-Matrix that does not have',
+                'high intramolecular repulsion...')
+            samp_pot = automol.pot.intramol_interaction_potential_sum(
+                automol.zmat.geometry(samp_zma))
+            if samp_pot-ref_pot < repulsion_thresh:
+                debug_message('ZMA fine.')
+                samp_lst += ((samp_zma, locs),)
+            else:
+                warning_message('repulsive ZMA:')
+                inp_str = elstruct.writer.optimization(
+                    geo=samp_zma,
+                    charge=spc_info[1],
+                    mult=spc_info[2],
+                    method=thy_info[1],
+                    basis=thy_info[2],
+                    prog=thy_info[0],
+                    orb_type=thy_info[3],
+                    mol_options=['nosym'],
+                    frozen_coordinates=frozen_coords,
+                )
+                tau_run_fs[-1].file.geometry_input.write(inp_str, locs)
+                warning_message(
+                    'geometry for bad ZMA at', tau_run_fs[-1].path(locs))
+
+        # Run the optimizations of the batch
+        if len(samp_lst) > 1:
+            info_message(
+                f"Running {len(samp_lst)} samples concurrently")
+            args = (tau_run_fs, spc_info, thy_info, script_str, overwrite,
+                    frozen_coords, zrxn, kwargs)
+            _ = execute_function_in_parallel(
+                _optimize_tau_batch, samp_lst, args, nprocs=len(samp_lst))
         else:
-            warning_message('repulsive ZMA:')
-            inp_str = elstruct.writer.optimization(
-                geo=samp_zma,
-                charge=spc_info[1],
-                mult=spc_info[2],
-                method=thy_info[1],
-                basis=thy_info[2],
-                prog=thy_info[0],
-                orb_type=thy_info[3],
-                mol_options=['nosym'],
-                frozen_coordinates=tors_range_dct.keys(),
-            )
-            tau_run_fs[-1].file.geometry_input.write(inp_str, locs)
-            warning_message(
-                'geometry for bad ZMA at', tau_run_fs[-1].path(locs))
+            for samp_zma, locs in samp_lst:
+                _optimize_tau(
+                    samp_zma, locs, tau_run_fs, spc_info, thy_info,
+                    script_str, overwrite, frozen_coords,
+                    zrxn=zrxn, **kwargs)
+        if conv_dct is not None:
+            conv_dct = filesys.taupf.add_samples(
+                conv_dct, _run_energies(tau_run_fs, samp_lst), ref_ene)
 
         if tau_save_fs[0].file.info.exists():
             inf_obj_s = tau_save_fs[0].file.info.read()
@@ -162,44 +243,93 @@ def run_tau(zma, spc_info, thy_info,
         elif tau_run_fs[0].file.info.exists():
             inf_obj_r = tau_run_fs[0].file.info.read()
             nsampd = inf_obj_r.nsamp
-        nsampd += 1
+        nsampd += nbatch
         inf_obj.nsamp = nsampd
         tau_save_fs[0].file.info.write(inf_obj)
         tau_run_fs[0].file.info.write(inf_obj)
 
 
-def save_tau(tau_run_fs, tau_save_fs, mod_thy_info, db_style='directory'):
+def _optimize_tau(samp_zma, locs, tau_run_fs, spc_info, thy_info,
+                  script_str, overwrite, frozen_coords,
+                  zrxn=None, **kwargs):
+    """ Optimize a sample Z-Matrix with its torsions frozen
+    """
+    run_fs = autofile.fs.run(tau_run_fs[-1].path(locs))
+    es_runner.run_job(
+        job=elstruct.Job.OPTIMIZATION,
+        script_str=script_str,
+        run_fs=run_fs,
+        geo=samp_zma,
+        spc_info=spc_info,
+        thy_info=thy_info,
+        saddle=bool(zrxn is not None),
+        overwrite=overwrite,
+        frozen_coordinates=frozen_coords,
+        **kwargs
+    )
+
+
+def _optimize_tau_batch(tau_run_fs, spc_info, thy_info,
+                        script_str, overwrite, frozen_coords, zrxn, kwargs,
+                        samp_lst, output_queue=None):
+    """ Optimize the (sample Z-Matrix, locs) handed to a worker process.
+        Results are left in the run filesystem to be saved by save_tau.
+    """
+
+    ran_locs = ()
+    try:
+        for samp_zma, locs in samp_lst:
+            _optimize_tau(
+                samp_zma, locs, tau_run_fs, spc_info, thy_info,
+                script_str, overwrite, frozen_coords,
+                zrxn=zrxn, **kwargs)
+            ran_locs += (tuple(locs),)
+    finally:
+        output_queue.put((ran_locs,))
+
+
+def save_tau(tau_run_fs, tau_save_fs, mod_thy_info, db_style='directory',
+             resave=False):
     """ save the tau dependent geometries that have been found so far
+
+        Only the runs that are new or have been rerun since the last
+        save are read (see filesys.manifest), unless resave is requested,
+        in which case all of the runs are read and saved again.
     """
 
-    if db_style == 'jsondb':
-        saved_locs = tau_save_fs[-1].json_existing()
-        saved_geos = tau_save_fs[-1].json.geometry.read_all(saved_locs)
-    elif db_style == 'directory':
-        saved_geos = [tau_save_fs[-1].file.geometry.read(locs)
-                      for locs in tau_save_fs[-1].existing()]
+    job = elstruct.Job.OPTIMIZATION
     if not tau_run_fs[0].exists():
         info_message("No tau geometries to save. Skipping...")
     else:
         if db_style == 'jsondb':
             save_info = [[], [], [], [], []]
             sp_save_info = [[], [], [], [], []]
+        tau_save_fs[0].create()
+        man_dct = {} if resave else filesys.manifest.load(
+            tau_save_fs[0].path())
+        nsaved = 0
         for locs in tau_run_fs[-1].existing():
             run_path = tau_run_fs[-1].path(locs)
             run_fs = autofile.fs.run(run_path)
             save_path = tau_save_fs[-1].root.path()
 
+            man_key, man_sig = filesys.manifest.entry(
+                tau_run_fs[0].path(), run_fs[-1].file.output.path([job]))
+            if filesys.manifest.is_saved(man_dct, man_key, man_sig):
+                continue
+
             reading("tau run", run_path)
 
-            success, ret = es_runner.read_job(
-                job=elstruct.Job.OPTIMIZATION, run_fs=run_fs)
+            success, ret = es_runner.read_parsed_job(
+                job=job, run_fs=run_fs)
+            if man_sig is not None:
+                man_dct[man_key] = man_sig
             if success:
-                inf_obj, inp_str, out_str = ret
-                prog = inf_obj.prog
-                method = inf_obj.method
-                ene = elstruct.reader.energy(prog, method, out_str)
+                nsaved += 1
+                inf_obj, inp_str, _, parsed = ret
+                ene = parsed.get('energy')
 
-                geo = elstruct.reader.opt_geometry(prog, out_str)
+                geo = parsed.get('opt_geometry')
                 if db_style == 'directory':
                     save_geo(save_path)
                     tau_save_fs[-1].create(locs)
@@ -236,19 +366,15 @@ def save_tau(tau_run_fs, tau_save_fs, mod_thy_info, db_style='directory'):
                     sp_save_fs[-1].json.info.write(inf_obj, mod_thy_info[1:4])
                     sp_save_fs[-1].json.energy.write(ene, mod_thy_info[1:4])
 
-                saved_geos.append(geo)
-
-        print('\nWriting the geometries and energies into JSON file...')
-        if db_style == 'jsondb':
+        if db_style == 'jsondb' and nsaved:
+            print('\nWriting the geometries and energies into JSON file...')
             tau_save_fs[-1].json_create()
-            tau_save_fs[-1].json.geometry_info.write_all(
-                save_info[1], save_info[0])
-            tau_save_fs[-1].json.geometry_input.write_all(
-                save_info[2], save_info[0])
-            tau_save_fs[-1].json.energy.write_all(
-                save_info[3], save_info[0])
-            tau_save_fs[-1].json.geometry.write_all(
-                save_info[4], save_info[0])
+            json_locs = tau_save_fs[-1].json_existing()
+            for idx, name in enumerate(('geometry_info', 'geometry_input',
+                                        'energy', 'geometry')):
+                _write_all_json(
+                    tau_save_fs, name, json_locs,
+                    save_info[0], save_info[idx+1])
 
             for i, sp_save_fs_i in enumerate(sp_save_info[0]):
                 sp_save_fs_i[-1].json.input.write(
@@ -258,37 +384,76 @@ def save_tau(tau_run_fs, tau_save_fs, mod_thy_info, db_style='directory'):
                 sp_save_fs_i[-1].json.energy.write(
                     sp_save_info[4][i], sp_save_info[1][i])
 
-        # update the tau trajectory file
-        filesys.mincnf.traj_sort(tau_save_fs, mod_thy_info)
+        # update the tau trajectory file and the manifest of saved runs
+        if nsaved:
+            filesys.mincnf.traj_sort(tau_save_fs, mod_thy_info)
+        else:
+            info_message("No new tau geometries to save.")
+        filesys.manifest.dump(tau_save_fs[0].path(), man_dct)
+
+
+def _write_all_json(tau_save_fs, name, json_locs, locs_lst, vals):
+    """ Write one type of data for a set of samples to the JSON database,
+        along with the data already saved for the other samples in
+        json_locs, so that the samples saved by earlier passes are kept
+    """
+
+    data = getattr(tau_save_fs[-1].json, name)
+    new_locs = set(tuple(locs) for locs in locs_lst)
+    old_locs_lst = [
+        locs for locs in json_locs
+        if tuple(locs) not in new_locs and data.exists(locs)]
+    old_vals = data.read_all(old_locs_lst) if old_locs_lst else []
+
+    data.write_all(list(old_vals) + list(vals),
+                   list(old_locs_lst) + list(locs_lst))
 
 
 def assess_pf_convergence(tau_save_fs, ref_ene,
-                          temps=(300., 500., 750., 1000., 1500.)):
+                          temps=filesys.taupf.PF_TEMPS,
+                          db_style='directory'):
     """ Determine how much the partition function has converged
     """
 
-    # Calculate sigma values at various temperatures for the PF
-    for temp in temps:
-        sumq = 0.
-        sum2 = 0.
-        idx = 0
-        debug_message('integral convergence for T = ', temp)
-        inf_obj_s = tau_save_fs[0].file.info.read()
-        nsamp = inf_obj_s.nsamp
-        saved_locs = tau_save_fs[-1].json_existing()
-        ratio = len(saved_locs) / float(nsamp)
-        for locs in saved_locs:
-            idx += 1
-            ene = tau_save_fs[-1].json.energy.read(locs)
-            ene = (ene - ref_ene) * phycon.EH2KCAL
-            tmp = numpy.exp(-ene*349.7/(0.695*temp))
-            sumq = sumq + tmp
-            sum2 = sum2 + tmp**2
-            sigma = numpy.sqrt(
-                (abs(sum2/float(idx)-(sumq/float(idx))**2))/float(idx))
-            debug_message(
-                sumq/float(idx), sigma, 100.*sigma*float(idx)/sumq, idx)
-        info_message('Ratio of good to sampled geometries: ', ratio)
+    conv_dct = filesys.taupf.assess(
+        tau_save_fs, ref_ene, temps=temps, db_style=db_style)
+    for temp, rel_err in zip(conv_dct['temps'], conv_dct['rel_err']):
+        debug_message(
+            f'integral convergence for T = {temp}: ',
+            f'{100.*rel_err:.4f}% over {conv_dct["nsamp"]} samples')
+    info_message(
+        'Ratio of good to sampled geometries: ', conv_dct['ratio'])
+
+
+def _pf_converged(conv_dct, pf_tol):
+    """ Assess if the MC partition function of the samples run so far
+        has converged to within pf_tol at all of the PF_TEMPS
+    """
+
+    info_message(
+        f' - Relative error of MC PF over {conv_dct["nsamp"]} samples:',
+        ', '.join(f'{err:.4f} ({temp:.0f} K)'
+                  for temp, err in zip(conv_dct['temps'],
+                                       conv_dct['rel_err'])))
+
+    return (conv_dct['nsamp'] >= PF_CHECK_BATCH and
+            numpy.max(conv_dct['rel_err']) < pf_tol)
+
+
+def _run_energies(tau_run_fs, samp_lst):
+    """ Read the energies of the successful optimizations of a batch of
+        samples; the parsed outputs are cached for save_tau
+    """
+
+    enes = ()
+    for _, locs in samp_lst:
+        run_fs = autofile.fs.run(tau_run_fs[-1].path(locs))
+        success, ret = es_runner.read_parsed_job(
+            job=elstruct.Job.OPTIMIZATION, run_fs=run_fs)
+        if success:
+            enes += (ret[3].get('energy'),)
+
+    return enes
 
 
 def _check_vma(zma, tau_save_fs):
@@ -13,6 +13,10 @@ from mechroutines.es._routines import sp
 from mechroutines.es.runner import qchem_params
 
 
+# Spacing, in grid points, of the first pass of an adaptive scan
+ADAPT_STRIDE = 4
+
+
 # Scans along coordinate(s)
 def internal_coordinates_scan(ts_zma, zrxn,
                               ts_info, rxn_class,
@@ -41,27 +45,34 @@ def internal_coordinates_scan(ts_zma, zrxn,
         method_dct, job=elstruct.Job.OPTIMIZATION)
     kwargs.update(mref_params)
 
-    es_runner.scan.execute_scan(
-        zma=ts_zma,
-        spc_info=ts_info,
-        mod_thy_info=mod_thy_info,
-        coord_names=coord_names,
-        coord_grids=coord_grids,
-        scn_run_fs=scn_run_fs,
-        scn_save_fs=scn_save_fs,
-        scn_typ='relaxed',
-        script_str=script_str,
-        overwrite=es_keyword_dct['overwrite'],
-        update_guess=update_guess,
-        reverse_sweep=False,
-        saddle=False,
-        constraint_dct=constraint_dct,
-        retryfail=False,
-        **kwargs,
-    )
+    scan_kwargs = {
+        'spc_info': ts_info,
+        'mod_thy_info': mod_thy_info,
+        'coord_names': coord_names,
+        'scn_run_fs': scn_run_fs,
+        'scn_save_fs': scn_save_fs,
+        'scn_typ': 'relaxed',
+        'script_str': script_str,
+        'overwrite': es_keyword_dct['overwrite'],
+        'update_guess': update_guess,
+        'reverse_sweep': False,
+        'saddle': False,
+        'constraint_dct': constraint_dct,
+        'retryfail': False,
+    }
+    scan_kwargs.update(kwargs)
+
+    include_endpts = not mref_params
+    if (find_max and es_keyword_dct.get('adapt_scan', False) and
+            len(coord_names) == 1):
+        coord_grids = _adaptive_scan(
+            ts_zma, coord_grids, scan_kwargs,
+            include_endpts=include_endpts)
+    else:
+        es_runner.scan.execute_scan(
+            zma=ts_zma, coord_grids=coord_grids, **scan_kwargs)
 
     if find_max:
-        include_endpts = not mref_params
         max_zmas = rxngrid.grid_maximum_zmatrices(
             zrxn.class_, ts_zma, coord_grids, coord_names, scn_save_fs,
             mod_thy_info, constraint_dct, include_endpts=include_endpts)
@@ -71,6 +82,91 @@ def internal_coordinates_scan(ts_zma, zrxn,
     return max_zmas
 
 
+def _adaptive_scan(ts_zma, coord_grids, scan_kwargs,
+                   stride=ADAPT_STRIDE, include_endpts=True):
+    """ Run a 1D scan along a reaction coordinate by first running every
+        stride-th point of the grid, then repeatedly running the points
+        of the grid at half the previous spacing in the bracket around
+        the current maximum. Refinement always goes down to the full grid
+        spacing and stops once both neighbors of the maximum have been run.
+
+        :param stride: spacing of the coarse grid in grid points
+        :type stride: int
+        :returns: the grid of the points that were run
+        :rtype: tuple(tuple(float))
+    """
+
+    grid = tuple(coord_grids[0])
+    npts = len(grid)
+    coord_names = scan_kwargs['coord_names']
+    scn_save_fs = scan_kwargs['scn_save_fs']
+    constraint_dct = scan_kwargs['constraint_dct']
+
+    def _max_idx(idxs):
+        """ Get the grid index of the maximum of the points run so far
+        """
+        max_pos = rxngrid.grid_maximum_index(
+            tuple(grid[idx] for idx in idxs), coord_names[0], scn_save_fs,
+            scan_kwargs['mod_thy_info'], constraint_dct,
+            include_endpts=include_endpts)
+        return None if max_pos is None else idxs[max_pos]
+
+    def _run_points(idxs, start_idx):
+        """ Run a sequence of grid points, starting from the structure
+            of a point that was already run
+        """
+        locs = [coord_names, [grid[start_idx]]]
+        if constraint_dct is not None:
+            locs = [constraint_dct] + locs
+        if scn_save_fs[-1].file.zmatrix.exists(locs):
+            guess_zma = scn_save_fs[-1].file.zmatrix.read(locs)
+        else:
+            guess_zma = ts_zma
+        es_runner.scan.execute_scan(
+            zma=guess_zma, coord_grids=(tuple(grid[idx] for idx in idxs),),
+            **scan_kwargs)
+
+    # Run the coarse grid
+    stride = max(min(stride, npts - 1), 1)
+    run_idxs = sorted(set(range(0, npts, stride)) | {npts - 1})
+    ioprinter.info_message(
+        f'Running {len(run_idxs)} of {npts} scan points on a coarse grid')
+    es_runner.scan.execute_scan(
+        zma=ts_zma, coord_grids=(tuple(grid[idx] for idx in run_idxs),),
+        **scan_kwargs)
+    max_idx = _max_idx(run_idxs)
+
+    # Refine the bracket around the maximum down to the full grid spacing,
+    # following the maximum if it moves to the edge of the bracket
+    while max_idx is not None:
+        stride = max(stride // 2, 1)
+        pos = run_idxs.index(max_idx)
+        low_idx = run_idxs[max(pos - 1, 0)]
+        high_idx = run_idxs[min(pos + 1, len(run_idxs) - 1)]
+        low_new = [idx for idx in range(low_idx, max_idx, stride)
+                   if idx not in run_idxs]
+        high_new = [idx for idx in range(max_idx, high_idx, stride)
+                    if idx not in run_idxs]
+        if not low_new and not high_new:
+            if stride == 1:
+                break
+            continue
+        ioprinter.info_message(
+            f'Refining scan around maximum at point {max_idx+1} '
+            f'with {len(low_new) + len(high_new)} points')
+        if low_new:
+            _run_points(low_new, low_idx)
+        if high_new:
+            _run_points(high_new, max_idx)
+        run_idxs = sorted(set(run_idxs) | set(low_new) | set(high_new))
+        max_idx = _max_idx(run_idxs)
+
+    ioprinter.info_message(
+        f'Adaptive scan ran {len(run_idxs)} of {npts} points')
+
+    return (tuple(grid[idx] for idx in run_idxs),)
+
+
 # Infinite Separation Energy
 def inf_sep_ene(ts_dct, thy_inf_dct, thy_method_dct, mref_params,
                 savefs_dct, runfs_dct, es_keyword_dct):
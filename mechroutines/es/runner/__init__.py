@@ -8,6 +8,7 @@
 from mechroutines.es.runner._run import execute_job
 from mechroutines.es.runner._run import run_job
 from mechroutines.es.runner._run import read_job
+from mechroutines.es.runner._run import read_parsed_job
 from mechroutines.es.runner._opt import multi_stage_optimization
 from mechroutines.es.runner._par import qchem_params
 from mechroutines.es.runner._par import molpro_opts_mat
@@ -19,6 +20,7 @@ __all__ = [
     'execute_job',
     'run_job',
     'read_job',
+    'read_parsed_job',
     'multi_stage_optimization',
     'qchem_params',
     'molpro_opts_mat',
@@ -5,6 +5,7 @@ import functools
 import elstruct
 import autofile
 import automol
+from mechlib import filesys
 from . import _seq as optseq
 
 
@@ -125,12 +126,12 @@ def run_job(job, script_str, run_fs,
         do_run = True
         print(f" - Running {job} job at {run_path}")
     else:
-        if not run_fs[-1].file.info.exists([job]):
+        job_status = _job_status(run_fs, job)
+        if job_status is None:
             do_run = True
             print(f" - Running {job} job at {run_path}")
         else:
-            inf_obj = run_fs[-1].file.info.read([job])
-            if inf_obj.status == autofile.schema.RunStatus.FAILURE:
+            if job_status == str(autofile.schema.RunStatus.FAILURE):
                 print(f" - Found failed {job} job at {run_path}")
                 if retryfail:
                     print(" - Retrying...")
@@ -140,60 +141,107 @@ def run_job(job, script_str, run_fs,
                     do_run = False
             else:
                 do_run = False
-                if inf_obj.status == autofile.schema.RunStatus.SUCCESS:
+                if job_status == str(autofile.schema.RunStatus.SUCCESS):
                     print(f" - Found completed {job} job at {run_path}")
+                elif job_status == filesys.ledger.STALE:
+                    print(f" - Found abandoned {job} job at {run_path}")
+                    print(" - Process running job has died, rerunning...")
+                    do_run = True
+                elif filesys.lease.is_stale(
+                        filesys.lease.job_lease_path(run_path)):
+                    print(f" - Found abandoned {job} job at {run_path}")
+                    print(" - Lease on job has expired, rerunning...")
+                    do_run = True
                 else:
                     print(f" - Found running {job} job at {run_path}")
                     print(" - Skipping...")
 
+    job_lease = None
     if do_run:
-        # Create the run directory
-        status = autofile.schema.RunStatus.RUNNING
-        prog = thy_info[0]
-        method = thy_info[1]
-        basis = thy_info[2]
-        inf_obj = autofile.schema.info_objects.run(
-            job=job, prog=prog, version='',
-            method=method, basis=basis, status=status)
-        inf_obj.utc_start_time = autofile.schema.utc_time()
-        run_fs[-1].file.info.write(inf_obj, [job])
-
-        # Write the initial geo/zma
-        _write_input_geo(geo, job, run_fs)
-
-        # Set job runner based on user request; set special options as needed
-        runner = JOB_RUNNER_DCT[job]
-
-        if job == elstruct.Job.OPTIMIZATION:
-            runner = functools.partial(
-                runner, feedback=feedback,
-                frozen_coordinates=frozen_coordinates,
-                freeze_dummy_atoms=freeze_dummy_atoms)
-        inp_str, out_str = runner(
-            script_str, run_path, geo=geo, chg=spc_info[1],
-            mul=spc_info[2], method=thy_info[1], basis=thy_info[2],
-            orb_type=thy_info[3], prog=thy_info[0], zrxn=zrxn,
-            errors=errors, options_mat=options_mat, **kwargs
-        )
-
-        inf_obj.utc_end_time = autofile.schema.utc_time()
-        prog = inf_obj.prog
-        if is_successful_output(out_str, job, prog):
-            run_fs[-1].file.output.write(out_str, [job])
-            print(" - Run succeeded.")
-            status = autofile.schema.RunStatus.SUCCESS
-        else:
-            # Added writing output at point even for fail
-            # Need to check if this is bad. But read_job changes
-            # should address this hopefully
-            run_fs[-1].file.output.write(out_str, [job])
-            print(" - Run failed.")
-            status = autofile.schema.RunStatus.FAILURE
-        version = elstruct.reader.program_version(prog, out_str)
-        inf_obj.version = version
-        inf_obj.status = status
-        run_fs[-1].file.info.write(inf_obj, [job])
-        run_fs[-1].file.input.write(inp_str, [job])
+        job_lease = filesys.lease.claim(
+            filesys.lease.job_lease_path(run_path))
+        if job_lease is None:
+            print(f" - {job} job at {run_path} claimed by another process")
+            print(" - Skipping...")
+            do_run = False
+
+    if do_run:
+        with job_lease:
+            # Create the run directory
+            status = autofile.schema.RunStatus.RUNNING
+            prog = thy_info[0]
+            method = thy_info[1]
+            basis = thy_info[2]
+            inf_obj = autofile.schema.info_objects.run(
+                job=job, prog=prog, version='',
+                method=method, basis=basis, status=status)
+            inf_obj.utc_start_time = autofile.schema.utc_time()
+            run_fs[-1].file.info.write(inf_obj, [job])
+            filesys.ledger.record_start(run_path, job, status)
+
+            # Write the initial geo/zma
+            _write_input_geo(geo, job, run_fs)
+
+            # Set job runner based on user request; set special options
+            runner = JOB_RUNNER_DCT[job]
+
+            if job == elstruct.Job.OPTIMIZATION:
+                runner = functools.partial(
+                    runner, feedback=feedback,
+                    frozen_coordinates=frozen_coordinates,
+                    freeze_dummy_atoms=freeze_dummy_atoms)
+            inp_str, out_str = runner(
+                script_str, run_path, geo=geo, chg=spc_info[1],
+                mul=spc_info[2], method=thy_info[1], basis=thy_info[2],
+                orb_type=thy_info[3], prog=thy_info[0], zrxn=zrxn,
+                errors=errors, options_mat=options_mat, **kwargs
+            )
+
+            inf_obj.utc_end_time = autofile.schema.utc_time()
+            prog = inf_obj.prog
+            if is_successful_output(out_str, job, prog):
+                run_fs[-1].file.output.write(out_str, [job])
+                print(" - Run succeeded.")
+                status = autofile.schema.RunStatus.SUCCESS
+            else:
+                # Added writing output at point even for fail
+                # Need to check if this is bad. But read_job changes
+                # should address this hopefully
+                run_fs[-1].file.output.write(out_str, [job])
+                print(" - Run failed.")
+                status = autofile.schema.RunStatus.FAILURE
+            version = elstruct.reader.program_version(prog, out_str)
+            inf_obj.version = version
+            inf_obj.status = status
+            run_fs[-1].file.info.write(inf_obj, [job])
+            run_fs[-1].file.input.write(inp_str, [job])
+            filesys.ledger.record_end(run_path, job, status)
+
+
+def _job_status(run_fs, job):
+    """ Get the status of a job in the RUN filesys, from the job ledger
+        if it has a record of the job, otherwise from the info file.
+
+        The ledger is only trusted while the info file of the job exists,
+        so a job whose RUN directory was removed is run again. A job the
+        ledger has as running on this host by a process that has died is
+        marked as stale.
+
+        :rtype: str
+    """
+
+    if not run_fs[-1].file.info.exists([job]):
+        return None
+
+    run_path = run_fs[-1].path([job])
+    job_status = filesys.ledger.status(run_path, job)
+    if (job_status == filesys.ledger.RUNNING and
+            filesys.ledger.mark_stale(path=run_path, job=job)):
+        job_status = filesys.ledger.STALE
+    if job_status is None:
+        job_status = str(run_fs[-1].file.info.read([job]).status)
+
+    return job_status
 
 
 def read_job(job, run_fs):
@@ -237,6 +285,58 @@ def read_job(job, run_fs):
     return success, ret
 
 
+def read_parsed_job(job, run_fs):
+    """ Read a job as in read_job, but also parse the quantities saved
+        from the job and return their record, which is cached in a sidecar
+        next to the output so the output is only parsed once over all of
+        the passes that save the job (see filesys.parsed). Used by the
+        passes that harvest many jobs; read_job is kept as the cheap check
+        of a job that was just run.
+
+        :param job: label for job formatted to elstruct package definitions
+        :type job: str
+        :param run_fs: filesystem object for the run filesys where job is run
+        :type run_fs: autofile.fs.run object
+        :rtype: (bool, (autofile.info_object object, str, str,
+            filesys.parsed.ParsedOutput))
+    """
+
+    inf_exists = run_fs[-1].file.info.exists([job])
+    inp_exists = run_fs[-1].file.input.exists([job])
+    out_exists = run_fs[-1].file.output.exists([job])
+
+    if inf_exists and inp_exists and out_exists:
+        inf_obj = run_fs[-1].file.info.read([job])
+        inp_str = run_fs[-1].file.input.read([job])
+        out_str = run_fs[-1].file.output.read([job])
+        parsed = filesys.parsed.ParsedOutput(
+            run_fs[-1].path([job]), inf_obj.prog, inf_obj.method, out_str)
+        ret = (inf_obj, inp_str, out_str, parsed)
+
+        success = parsed.get(
+            'success',
+            reader=lambda prog, _, out: bool(
+                is_successful_output(out, job, prog)))
+        if success:
+            print(" - Reading successful output...")
+
+        # Parse what is saved from the job and write the sidecar once
+        parsed.parse(
+            filesys.parsed.JOB_QUANTITY_DCT.get(job, ()) if success else ())
+    else:
+        if not out_exists:
+            print(" - No output file found.")
+        if not inp_exists:
+            print(" - No input file found.")
+        if not inf_exists:
+            print(" - No info file found.")
+        print("Skipping...")
+        success = False
+        ret = None
+
+    return success, ret
+
+
 def is_successful_output(out_str, job, prog):
     """ Parses the output string of the electronic structure job
         and calls the appropraite elstruct status readers to assess
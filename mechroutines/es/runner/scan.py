@@ -8,11 +8,12 @@ import numpy
 import automol
 import autofile
 import elstruct
+from autorun import execute_function_in_parallel
 from phydat import phycon
 from mechlib import filesys
 from mechlib.amech_io import printer as ioprinter
 from mechroutines.es.runner._run import execute_job
-from mechroutines.es.runner._run import read_job
+from mechroutines.es.runner._run import read_parsed_job
 
 
 def execute_scan(zma, spc_info, mod_thy_info,
@@ -29,7 +30,6 @@ def execute_scan(zma, spc_info, mod_thy_info,
 
         Function will first assess whether the scan has been run by
         searching the filesystem.
-
     """
 
     # Need a resave option
@@ -58,6 +58,113 @@ def execute_scan(zma, spc_info, mod_thy_info,
             mod_thy_info=mod_thy_info)
 
 
+def execute_rigid_scans(zma, spc_info, mod_thy_info,
+                        scan_lst, scn_run_fs, scn_save_fs,
+                        script_str, overwrite, njobs,
+                        zrxn=None, retryfail=True,
+                        **kwargs):
+    """ Run the energy calculations for the grid points of several rigid
+        scans at once and save the resulting information for each scan.
+
+        Rigid scan points do not depend on one another, so the points of
+        all of the scans that have not been finished are run together on
+        up to njobs processes.
+
+        :param scan_lst: (coord_names, coord_grids, constraint_dct) of scans
+        :type scan_lst: tuple(tuple(tuple(str), tuple(float), dict))
+        :param njobs: number of energy jobs to run at the same time
+        :type njobs: int
+    """
+
+    job = _set_job('rigid')
+
+    # Set up the scans and collect the points that still need to be run
+    point_lst, run_scan_lst = (), ()
+    for coord_names, coord_grids, constraint_dct in scan_lst:
+
+        ioprinter.info_message(
+            f'Setting up Rotor: {"-".join(coord_names)}', newline=1)
+        if _scan_finished(
+                coord_names, coord_grids, scn_save_fs,
+                constraint_dct=constraint_dct, overwrite=overwrite):
+            continue
+
+        coord_locs = coord_names if constraint_dct is None else constraint_dct
+        scn_save_fs[1].create([coord_locs])
+        inf_obj = autofile.schema.info_objects.scan_branch(
+            dict(zip(coord_names, coord_grids)))
+        scn_save_fs[1].file.info.write(inf_obj, [coord_locs])
+        run_scan_lst += ((coord_names, constraint_dct),)
+
+        grid_vals = automol.pot.coords(coord_grids)
+        if _scan_is_running(
+                grid_vals, coord_names, constraint_dct, scn_run_fs, job):
+            continue
+
+        for vals in grid_vals:
+            locs = [coord_names, vals]
+            if constraint_dct is not None:
+                locs = [constraint_dct] + locs
+            if not scn_save_fs[-1].file.geometry.exists(locs) or overwrite:
+                scn_run_fs[-1].create(locs)
+                point_lst += ((coord_names, vals, locs),)
+
+    # Run all of the energy jobs
+    if point_lst:
+        nprocs = min(njobs, len(point_lst))
+        ioprinter.info_message(
+            f'Running {len(point_lst)} rigid scan points '
+            f'on {nprocs} processes', newline=1)
+        args = (zma, spc_info, mod_thy_info, scn_run_fs,
+                script_str, overwrite, zrxn, retryfail, kwargs)
+        execute_function_in_parallel(
+            _run_rigid_scan_points, point_lst, args, nprocs=nprocs)
+
+    # Save the scans
+    for coord_names, constraint_dct in run_scan_lst:
+        save_scan(
+            scn_run_fs=scn_run_fs,
+            scn_save_fs=scn_save_fs,
+            scn_typ='rigid',
+            coord_names=coord_names,
+            constraint_dct=constraint_dct,
+            mod_thy_info=mod_thy_info)
+
+
+def _run_rigid_scan_points(guess_zma, spc_info, mod_thy_info, scn_run_fs,
+                           script_str, overwrite, zrxn, retryfail, kwargs,
+                           point_lst, output_queue=None):
+    """ Run the energy jobs for the (coord_names, vals, locs) of the rigid
+        scan points handed to a worker process. Results are left in the run
+        filesystem to be saved by the parent.
+    """
+
+    job = _set_job('rigid')
+    ran_locs = ()
+    try:
+        for coord_names, vals, locs in point_lst:
+            ioprinter.info_message(f'Running Scan Point {vals}')
+            run_fs = autofile.fs.run(scn_run_fs[-1].path(locs))
+            zma = automol.zmat.set_values_by_name(
+                guess_zma, dict(zip(coord_names, vals)),
+                angstrom=False, degree=False)
+            execute_job(
+                job=job,
+                script_str=script_str,
+                run_fs=run_fs,
+                geo=zma,
+                spc_info=spc_info,
+                thy_info=mod_thy_info,
+                zrxn=zrxn,
+                overwrite=overwrite,
+                retryfail=retryfail,
+                **kwargs
+            )
+            ran_locs += (locs,)
+    finally:
+        output_queue.put((ran_locs,))
+
+
 def run_scan(zma, spc_info, mod_thy_info,
              coord_names, coord_grids,
              scn_run_fs, scn_save_fs, scn_typ,
@@ -110,6 +217,54 @@ def run_scan(zma, spc_info, mod_thy_info,
         )
 
 
+def _saved_scan_potential(grid_vals_lst, coord_names, constraint_dct,
+                          scn_save_fs, mod_thy_info):
+    """ Read the potential (kcal/mol) of a scan from the save filesystem,
+        taking the lower of the forward and reverse-sweep energies
+    """
+
+    pot = {}
+    for grid_vals in grid_vals_lst:
+        back_vals = tuple(val + 4*numpy.pi for val in grid_vals)
+        enes = ()
+        for vals in (grid_vals, back_vals):
+            locs = _scan_point_locs(coord_names, vals, constraint_dct)
+            sp_save_fs = autofile.fs.single_point(scn_save_fs[-1].path(locs))
+            if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
+                enes += (sp_save_fs[-1].file.energy.read(mod_thy_info[1:4]),)
+        if enes:
+            pot[grid_vals] = min(enes) * phycon.EH2KCAL
+
+    return pot
+
+
+def _degree_potential(pot):
+    """ Convert a potential to degrees relative to its first point
+    """
+    ref_ene = tuple(pot.values())[0]
+    return {(vals[0] * phycon.RAD2DEG,): ene - ref_ene
+            for vals, ene in pot.items()}
+
+
+def _bad_point(pot, thresh=0.018):
+    """ Angle (degrees) of the point of a 1D potential flagged as a
+        discontinuity by the Akima/cubic spline comparison, if any
+    """
+    # Energies relative to the first point help with numerical issues
+    # related to the spline fitting
+    return filesys.read.identify_bad_point(
+        _degree_potential(pot), thresh=thresh)
+
+
+def _scan_point_locs(coord_names, vals, constraint_dct):
+    """ Build the locs for a point of a scan
+    """
+    locs = [coord_names, vals]
+    if constraint_dct is not None:
+        locs = [constraint_dct] + locs
+    return locs
+
+
 def run_backsteps(
         zma, spc_info, mod_thy_info,
         coord_names, coord_grids,
@@ -119,10 +274,16 @@ def run_backsteps(
         saddle=False,
         constraint_dct=None, retryfail=True,
         errors=(), options_mat=(),
+        targeted=False,
         **kwargs):
     """ run backward steps along a scan and stop once there
         is no hystersis (dont judge me i dont feel like googling
         the spelling right now)
+
+        If targeted, only the point flagged as a discontinuity is
+        re-optimized, starting from its lower-energy neighbor, and the
+        check is repeated until no new point is flagged, rather than
+        stepping back along the grid from the end of the scan.
     """
     # Set up info that is constant across the scan
     # i.e., jobtype, frozen_coords
@@ -142,58 +303,39 @@ def run_backsteps(
         coord_locs = constraint_dct
         frozen_coordinates = tuple(coord_names) + tuple(constraint_dct)
 
-    # Set the initial zma
-    guess_zma = zma
-
     scn_save_fs[1].create([coord_locs])
     inf_obj = autofile.schema.info_objects.scan_branch(
         dict(zip(coord_locs, coord_grids)))
     scn_save_fs[1].file.info.write(inf_obj, [coord_locs])
 
+    # Arguments for the backstep jobs
+    job_args = (job, spc_info, mod_thy_info, scn_run_fs, scn_save_fs,
+                script_str, overwrite, zrxn, frozen_coordinates,
+                errors, options_mat, retryfail, saddle, kwargs)
+
+    # Read the potential, taking the lower of the forward and backstep
+    # energies at each point
+    pot = _saved_scan_potential(
+        mixed_grid_vals_lst, coord_names, constraint_dct,
+        scn_save_fs, mod_thy_info)
+    if not pot:
+        return
+
+    if targeted:
+        _repair_bad_points(
+            pot, mixed_grid_vals_lst, coord_names, constraint_dct,
+            job_args)
+        return
+
+    # Set the initial zma
+    guess_zma = zma
+
     # Build the grid of values
     rev_grid_vals_orig_lst = tuple(reversed(mixed_grid_vals_lst))
     rev_grid_vals_lst = tuple(tuple(val + 4*numpy.pi for val in grid)
                               for grid in rev_grid_vals_orig_lst)
 
-    pot = {}
-    for idx, grid_vals in enumerate(mixed_grid_vals_lst):
-
-        locs = [coord_names, grid_vals]
-        back_locs = [coord_names, rev_grid_vals_lst[idx]]
-        if constraint_dct is not None:
-            locs = [constraint_dct] + locs
-            back_locs = [constraint_dct] + back_locs
-        path = scn_save_fs[-1].path(locs)
-        back_path = scn_save_fs[-1].path(back_locs)
-        sp_save_fs = autofile.fs.single_point(path)
-        back_sp_save_fs = autofile.fs.single_point(back_path)
-        ene = None
-        if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
-            ene = sp_save_fs[-1].file.energy.read(mod_thy_info[1:4])
-            ene = ene * phycon.EH2KCAL
-        if back_sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
-            back_ene = back_sp_save_fs[-1].file.energy.read(mod_thy_info[1:4])
-            back_ene = back_ene * phycon.EH2KCAL
-            if ene is None:
-                ene = back_ene
-            if back_ene < ene:
-                ene = back_ene
-        if ene:
-            pot[grid_vals] = ene
-
-    # Convert the energies to a baseline relative to the first point;
-    # helps with numerical issues related to the spline fitting
-    ref_ene = pot[mixed_grid_vals_lst[0]]
-    for grid_vals, ene in pot.items():
-        pot[grid_vals] = ene - ref_ene
-
-    # Convert units to degrees (will need to fix for 2-D stuff)
-    conv_pot = {}
-    for grid_vals, ene in pot.items():
-        conv_grid_vals = (grid_vals[0] * phycon.RAD2DEG,)
-        conv_pot[conv_grid_vals] = ene
-
-    bad_grid_vals = (filesys.read.identify_bad_point(conv_pot, thresh=0.018),)
+    bad_grid_vals = (_bad_point(pot),)
     if bad_grid_vals[0] is not None:
         print('Akima spline identified potential hysteresis at ',
               bad_grid_vals[0]*phycon.DEG2RAD)
@@ -204,47 +346,17 @@ def run_backsteps(
                 passed_bad_point = True
 
             # Get locs for reading and running filesysten
-            locs = [coord_names, rev_grid_vals]
-            locs_orig = [coord_names, rev_grid_vals_orig_lst[idx]]
-            if constraint_dct is not None:
-                locs = [constraint_dct] + locs
-                locs_orig = [constraint_dct] + locs_orig
-            scn_run_fs[-1].create(locs)
-            run_fs = autofile.fs.run(scn_run_fs[-1].path(locs))
-
-            # Build the zma
-            zma = automol.zmat.set_values_by_name(
-                guess_zma, dict(zip(coord_names, rev_grid_vals)),
-                angstrom=False, degree=False)
+            locs = _scan_point_locs(coord_names, rev_grid_vals, constraint_dct)
+            locs_orig = _scan_point_locs(
+                coord_names, rev_grid_vals_orig_lst[idx], constraint_dct)
 
             # Run an optimization or energy job, as needed.
             geo_exists = scn_save_fs[-1].file.geometry.exists(locs)
             ioprinter.info_message("Taking a backstep at ", rev_grid_vals)
             if not geo_exists or overwrite:
-                success, ret = execute_job(
-                    job=job,
-                    script_str=script_str,
-                    run_fs=run_fs,
-                    geo=zma,
-                    spc_info=spc_info,
-                    thy_info=mod_thy_info,
-                    zrxn=zrxn,
-                    overwrite=overwrite,
-                    frozen_coordinates=frozen_coordinates,
-                    errors=errors,
-                    options_mat=options_mat,
-                    retryfail=retryfail,
-                    saddle=saddle,
-                    **kwargs
-                )
-                # Read the output for the zma and geo
-                if success:
-                    opt_zma = filesys.save.read_job_zma(ret, init_zma=zma)
-                    guess_zma = opt_zma
-                    filesys.save.scan_point_structure(
-                        ret, scn_save_fs, locs, mod_thy_info[1:], job,
-                        init_zma=zma, init_geo=None)
-                else:
+                guess_zma = _run_backstep_point(
+                    guess_zma, coord_names, rev_grid_vals, locs, *job_args)
+                if guess_zma is None:
                     break
             else:
                 guess_zma = scn_save_fs[-1].file.zmatrix.read(locs)
@@ -283,24 +395,130 @@ def run_backsteps(
                 break
 
 
+def _repair_bad_points(pot, grid_vals_lst, coord_names, constraint_dct,
+                       job_args):
+    """ Re-optimize the point of a 1D potential flagged by _bad_point from
+        the structure of its lower-energy neighbor, saving it at the
+        backstep locs, until no new point is flagged
+    """
+
+    # Only 1D potentials are checked
+    npts = len(grid_vals_lst)
+    if len(coord_names) != 1 or len(pot) < 4 or len(pot) < npts:
+        return
+
+    scn_save_fs, mod_thy_info = job_args[4], job_args[2]
+    repaired_idxs = ()
+    while len(repaired_idxs) < npts:
+
+        # Find the worst point in the current potential
+        bad_angle = _bad_point(pot)
+        if bad_angle is None:
+            ioprinter.info_message('No discontinuities found in the scan')
+            break
+        bad_idx = int(numpy.argmin(
+            [abs(((vals[0] * phycon.RAD2DEG - bad_angle) + 180.0) % 360.0
+                 - 180.0) for vals in grid_vals_lst]))
+        if bad_idx in repaired_idxs:
+            break
+        repaired_idxs += (bad_idx,)
+
+        # Start from the lower-energy neighbor of the bad point
+        nbr_idxs = ((bad_idx - 1) % npts, (bad_idx + 1) % npts)
+        nbr_idx = min(nbr_idxs, key=lambda idx: pot[grid_vals_lst[idx]])
+        nbr_locs = _scan_point_locs(
+            coord_names, grid_vals_lst[nbr_idx], constraint_dct)
+        if not scn_save_fs[-1].file.zmatrix.exists(nbr_locs):
+            break
+        guess_zma = scn_save_fs[-1].file.zmatrix.read(nbr_locs)
+
+        bad_vals = grid_vals_lst[bad_idx]
+        back_vals = tuple(val + 4*numpy.pi for val in bad_vals)
+        ioprinter.info_message(
+            f'Re-optimizing scan point at {bad_vals} starting from '
+            f'neighboring point at {grid_vals_lst[nbr_idx]}')
+        locs = _scan_point_locs(coord_names, back_vals, constraint_dct)
+        if _run_backstep_point(
+                guess_zma, coord_names, back_vals, locs, *job_args) is None:
+            break
+
+        pot = _saved_scan_potential(
+            grid_vals_lst, coord_names, constraint_dct,
+            scn_save_fs, mod_thy_info)
+
+
+def _run_backstep_point(guess_zma, coord_names, vals, locs,
+                        job, spc_info, mod_thy_info, scn_run_fs, scn_save_fs,
+                        script_str, overwrite, zrxn, frozen_coordinates,
+                        errors, options_mat, retryfail, saddle, kwargs):
+    """ Run and save the job for a single backstep point, returning the
+        optimized zma, or None if the job failed
+    """
+
+    scn_run_fs[-1].create(locs)
+    run_fs = autofile.fs.run(scn_run_fs[-1].path(locs))
+
+    # Build the zma
+    zma = automol.zmat.set_values_by_name(
+        guess_zma, dict(zip(coord_names, vals)),
+        angstrom=False, degree=False)
+
+    success, ret = execute_job(
+        job=job,
+        script_str=script_str,
+        run_fs=run_fs,
+        geo=zma,
+        spc_info=spc_info,
+        thy_info=mod_thy_info,
+        zrxn=zrxn,
+        overwrite=overwrite,
+        frozen_coordinates=frozen_coordinates,
+        errors=errors,
+        options_mat=options_mat,
+        retryfail=retryfail,
+        saddle=saddle,
+        **kwargs
+    )
+
+    # Read the output for the zma and save the point
+    opt_zma = None
+    if success:
+        opt_zma = filesys.save.read_job_zma(ret, init_zma=zma)
+        filesys.save.scan_point_structure(
+            ret, scn_save_fs, locs, mod_thy_info[1:], job,
+            init_zma=zma, init_geo=None)
+        filesys.scantab.update(scn_save_fs, (locs,), mod_thy_info[1:4])
+
+    return opt_zma
+
+
 def _scan_is_running(grid_vals, coord_names, constraint_dct, scn_run_fs, job):
     """ Is the rotor you requested currently being progressed on?
     """
     rotor_is_running = False
+
+    # Statuses of the points from the job ledger, if one is being kept
+    ledger_dct = filesys.ledger.statuses(scn_run_fs[0].path(), job=job)
+
     for vals in grid_vals:
         locs = [coord_names, vals]
         if constraint_dct is not None:
             locs = [constraint_dct] + locs
         if scn_run_fs[-1].exists(locs):
             run_fs = autofile.fs.run(scn_run_fs[-1].path(locs))
+            job_status = None
             if run_fs[-1].file.info.exists([job]):
-                inf_obj = run_fs[-1].file.info.read([job])
-                if inf_obj.status == autofile.schema.RunStatus.RUNNING:
-                    rotor_is_running = True
-                    ioprinter.info_message(
-                        'scan job is currently running at ',
-                        coord_names, locs)
-                    break
+                job_status = ledger_dct.get(run_fs[-1].path([job]))
+                if job_status is None:
+                    job_status = str(run_fs[-1].file.info.read([job]).status)
+            if (job_status == str(autofile.schema.RunStatus.RUNNING) and
+                    not filesys.lease.is_stale(filesys.lease.job_lease_path(
+                        run_fs[-1].path([job])))):
+                rotor_is_running = True
+                ioprinter.info_message(
+                    'scan job is currently running at ',
+                    coord_names, locs)
+                break
         # else:
         #            break
         # This else turns on and off letting the scan run
@@ -443,16 +661,32 @@ def save_scan(scn_run_fs, scn_save_fs, scn_typ,
     if not scn_run_fs[1].exists([coord_locs]):
         ioprinter.info_message("No scan to save. Skipping...")
     else:
-        locs_lst = []
+        # Only read the points that are new or rerun since the last save
+        scn_save_fs[1].create([coord_locs])
+        man_path = scn_save_fs[1].path([coord_locs])
+        man_dct = filesys.manifest.load(man_path)
+
+        locs_lst, new_locs_lst = [], []
         for locs in save_locs:
 
             # Set run filesys
             run_path = scn_run_fs[-1].path(locs)
             run_fs = autofile.fs.run(run_path)
+
+            man_key, man_sig = filesys.manifest.entry(
+                scn_run_fs[1].path([coord_locs]),
+                run_fs[-1].file.output.path([job]))
+            if filesys.manifest.is_saved(man_dct, man_key, man_sig):
+                if scn_save_fs[-1].exists(locs):
+                    locs_lst.append(locs)
+                continue
+
             ioprinter.info_message(f"Reading from scan run at {run_path}")
 
             # Save the structure
-            success, ret = read_job(job, run_fs)
+            success, ret = read_parsed_job(job, run_fs)
+            if man_sig is not None:
+                man_dct[man_key] = man_sig
             if success:
                 # Need to get the init zma structure in here
                 # could write init zma to run filesys; wont work retro
@@ -465,10 +699,16 @@ def save_scan(scn_run_fs, scn_save_fs, scn_typ,
                     ret, scn_save_fs, locs, mod_thy_info[1:], job,
                     init_zma=init_zma, init_geo=None)
                 locs_lst.append(locs)
+                new_locs_lst.append(locs)
 
-        # Build the trajectory file
-        if locs_lst:
+        # Build the trajectory file and the energy table of the scan
+        if new_locs_lst:
             write_traj(coord_locs, scn_save_fs, mod_thy_info, locs_lst)
+            filesys.scantab.update(
+                scn_save_fs, new_locs_lst, mod_thy_info[1:4])
+        else:
+            ioprinter.info_message("No new scan points to save.")
+        filesys.manifest.dump(man_path, man_dct)
 
 
 def scan_locs(scn_save_fs, coord_names, constraint_dct=None):
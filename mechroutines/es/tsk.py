@@ -223,6 +223,7 @@ def conformer_tsk(job, spc_dct, spc_name,
             two_stage = saddle
             mc_nsamp = spc_dct_i['mc_nsamp']
             resave = es_keyword_dct['resave']
+            njobs = es_keyword_dct['njobs']
 
             # Read the geometry and zma from the ini file system
             geo = ini_cnf_save_fs[-1].file.geometry.read(ini_locs)
@@ -264,7 +265,7 @@ def conformer_tsk(job, spc_dct, spc_name,
                 zrxn=zrxn, two_stage=two_stage,
                 retryfail=retryfail, resave=resave,
                 repulsion_thresh=40.0, print_debug=print_debug,
-                **kwargs)
+                njobs=njobs, **kwargs)
         else:
             ioprinter.info_message(
                 'Missing conformers. Skipping task...')
@@ -607,6 +608,9 @@ def tau_tsk(job, spc_dct, spc_name,
                 tors_names=tors_names,
                 repulsion_thresh=40.0,
                 zrxn=zrxn, resave=resave,
+                pf_tol=es_keyword_dct['pf_tol'],
+                njobs=es_keyword_dct['njobs'],
+                seed=es_keyword_dct['seed'],
                 **kwargs)
 
         elif job in ('energy', 'grad'):
@@ -871,7 +875,9 @@ def hr_tsk(job, spc_dct, spc_name,
                     zrxn=zrxn,
                     saddle=saddle,
                     increment=increment,
-                    retryfail=retryfail)
+                    retryfail=retryfail,
+                    njobs=es_keyword_dct['njobs'],
+                    full_sweep=es_keyword_dct['full_sweep'])
 
             elif job == 'reopt':
 
@@ -962,6 +968,9 @@ def hr_tsk(job, spc_dct, spc_name,
                             zrxn=zrxn,
                             retryfail=retryfail, **kwargs)
                         ioprinter.obj('vspace')
+                    if scn_locs:
+                        filesys.scantab.update(
+                            scn_save_fs, scn_locs, mod_thy_info[1:4])
         else:
             ioprinter.info_message('No torsional modes in the species')
 
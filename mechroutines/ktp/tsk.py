@@ -6,6 +6,7 @@ import ioformat
 import mess_io
 import chemkin_io
 import autorun
+from autorun import execute_function_in_parallel
 import ratefit
 from mechlib import filesys
 from mechlib.amech_io import writer
@@ -111,26 +112,50 @@ def write_messrate_task(pesgrp_num, pes_inf, rxn_lst,
             aux_dct=dats, input_name='mess.inp')
 
 
-def run_messrate_task(rate_paths_dct, pes_inf):
-    """ Run the MESSRATE input file.
+def run_messrate_task(rate_paths_dct, pes_infs, nprocs=1):
+    """ Run the MESSRATE input files for a set of PESs.
 
-        First tries to run a well-extended file, then tries to
-        run the base file if it exists.
+        For each PES, first tries to run a well-extended file, then tries to
+        run the base file if it exists. The MESSRATE runs for all of the
+        PESs are independent, so they are run on up to `nprocs` processes.
 
         Need an overwrite task
     """
-    path_dct = rate_paths_dct[pes_inf]
-    for typ in ('wext', 'base'):
-        path = path_dct[typ]
-        mess_inp = os.path.join(path, 'mess.inp')
-        mess_out = os.path.join(path, 'mess.out')
-        if os.path.exists(mess_inp) and not os.path.exists(mess_out):
-            ioprinter.obj('vspace')
-            ioprinter.obj('line_dash')
-            ioprinter.info_message(f'Found MESS input file at {path}')
-            ioprinter.running('MESS input file')
+
+    # Determine which MESS file, if any, needs to be run for each PES
+    run_paths = ()
+    for pes_inf in pes_infs:
+        path_dct = rate_paths_dct[pes_inf]
+        for typ in ('wext', 'base'):
+            path = path_dct[typ]
+            mess_inp = os.path.join(path, 'mess.inp')
+            mess_out = os.path.join(path, 'mess.out')
+            if os.path.exists(mess_inp) and not os.path.exists(mess_out):
+                ioprinter.obj('vspace')
+                ioprinter.obj('line_dash')
+                ioprinter.info_message(f'Found MESS input file at {path}')
+                run_paths += (path,)
+                break
+
+    # Run all of the MESS files
+    if run_paths:
+        nprocs = max(min(nprocs, len(run_paths)), 1)
+        ioprinter.running(
+            f'{len(run_paths)} MESS input files on {nprocs} processes')
+        execute_function_in_parallel(
+            _run_messrate, run_paths, (), nprocs=nprocs)
+
+
+def _run_messrate(run_paths, output_queue=None):
+    """ Run MESSRATE in each of the paths handed to a worker process
+    """
+    ran_paths = ()
+    try:
+        for path in run_paths:
             autorun.run_script(autorun.SCRIPT_DCT['messrate'], path)
-            break
+            ran_paths += (path,)
+    finally:
+        output_queue.put((ran_paths,))
 
 
 def run_fits_task(pes_grp_rlst, pes_param_dct, rate_paths_dct, mdriver_path,
@@ -3,6 +3,8 @@
 """
 
 import os
+import hashlib
+import numpy
 import autorun
 import automol.pot
 import automol.geom
@@ -14,6 +16,10 @@ from mechroutines.models import typ
 from mechroutines.models import _tors as tors
 
 
+# ProjRot results for each set of inputs, keyed by a hash of the inputs
+_PROJROT_CACHE = {}
+
+
 def full_vib_analysis(
         spc_dct_i, pf_filesystems, spc_mod_dct_i,
         run_prefix, zrxn=None):
@@ -216,6 +222,15 @@ def tors_projected_freqs(pf_filesystems, mess_hr_str, projrot_hr_str,
     tors_geo = tors_cnf_fs[-1].file.geometry.read(tors_min_locs)
     ioprinter.reading('Hessian', harm_cnf_fs[-1].path(harm_min_locs))
 
+    # Use the results of a previous ProjRot run on identical inputs
+    saddle = zrxn is not None
+    cache_key = _projrot_cache_key(
+        harm_geo, tors_geo, hess, mess_hr_str, projrot_hr_str, saddle)
+    if cache_key in _PROJROT_CACHE:
+        ioprinter.info_message(
+            'Using projected frequencies from previous ProjRot run')
+        return _PROJROT_CACHE[cache_key]
+
     fml_str = automol.geom.formula_string(harm_geo)
     vib_path = job_path(prefix, 'PROJROT', 'FREQ', fml_str, print_path=True)
     # print('proj test:', vib_path)
@@ -231,7 +246,7 @@ def tors_projected_freqs(pf_filesystems, mess_hr_str, projrot_hr_str,
         tors_geo, harm_geo, hess,
         dist_cutoff_dct1=dist_cutoff_dct1,
         dist_cutoff_dct2=dist_cutoff_dct2,
-        saddle=(zrxn is not None))
+        saddle=saddle)
 
     # Obtain the displacements
     disp_path = os.path.join(vib_path, 'DISP')
@@ -240,7 +255,26 @@ def tors_projected_freqs(pf_filesystems, mess_hr_str, projrot_hr_str,
 
     proj_freqs, proj_imag, _, harm_freqs, tors_freqs = proj_inf
 
-    return proj_freqs, harm_freqs, tors_freqs, proj_imag, harm_disps
+    ret = (proj_freqs, harm_freqs, tors_freqs, proj_imag, harm_disps)
+    _PROJROT_CACHE[cache_key] = ret
+
+    return ret
+
+
+def _projrot_cache_key(harm_geo, tors_geo, hess,
+                       mess_hr_str, projrot_hr_str, saddle):
+    """ Hash of all of the inputs that determine the results
+        of the projected frequency calculation
+    """
+
+    sha = hashlib.sha256()
+    sha.update(repr((harm_geo, tors_geo)).encode())
+    sha.update(numpy.asarray(hess, dtype=float).tobytes())
+    for inp_str in (mess_hr_str, projrot_hr_str, saddle):
+        sha.update(str(inp_str).encode())
+        sha.update(b'\0')
+
+    return sha.hexdigest()
 
 
 def tors_projected_scaled_zpe(pf_filesystems, mess_hr_str, projrot_hr_str,
@@ -6,6 +6,7 @@
   and calculate electronic and zero-point vibrational energies.
 """
 
+import copy
 import automol
 import autofile
 import autorun
@@ -27,6 +28,10 @@ from mechroutines.thermo import basis
 # import thermfit
 
 
+# Data read for each species and TS, stored for the rest of the run
+_DATA_CACHE = {}
+
+
 # General readers
 def read_spc_data(spc_dct, spc_name,
                   pes_mod_dct_i, spc_mod_dct_i,
@@ -61,6 +66,14 @@ def read_spc_data(spc_dct, spc_name,
     ioprinter.obj('line_plus')
     ioprinter.reading(f'filesystem info for {spc_name}', newline=1)
 
+    # Use the data if it was already read for another channel
+    cache_key = _data_cache_key(
+        spc_name, pes_mod_dct_i, spc_mod_dct_i,
+        run_prefix, save_prefix, spc_locs, calc_chn_ene)
+    if cache_key in _DATA_CACHE:
+        return _cached_data(cache_key, spc_name, chn_basis_ene_dct)
+    init_basis_ene_dct = dict(chn_basis_ene_dct)
+
     vib_model = spc_mod_dct_i['vib']['mod']
     tors_model = spc_mod_dct_i['tors']['mod']
     spc_dct_i = spc_dct[spc_name]
@@ -88,6 +101,8 @@ def read_spc_data(spc_dct, spc_name,
     # Add writer to inf dct
     inf_dct['writer'] = writer
 
+    _cache_data(cache_key, inf_dct, init_basis_ene_dct, chn_basis_ene_dct)
+
     return inf_dct, chn_basis_ene_dct
 
 
@@ -126,6 +141,14 @@ def read_ts_data(spc_dct, tsname, rcts, prds,
     ioprinter.obj('line_plus')
     ioprinter.reading(f'Reading filesystem info for {tsname}', newline=1)
 
+    # Use the data if it was already read for another channel
+    cache_key = _data_cache_key(
+        tsname, tuple(rcts), tuple(prds), pes_mod_dct_i, spc_mod_dct_i,
+        run_prefix, save_prefix, spc_locs)
+    if cache_key in _DATA_CACHE:
+        return _cached_data(cache_key, tsname, chn_basis_ene_dct)
+    init_basis_ene_dct = dict(chn_basis_ene_dct)
+
     ts_dct = spc_dct[tsname]
     reac_dcts = [spc_dct[name] for name in rcts]
     prod_dcts = [spc_dct[name] for name in prds]
@@ -203,9 +226,50 @@ def read_ts_data(spc_dct, tsname, rcts, prds,
     # Add writer to inf dct
     inf_dct['writer'] = writer
 
+    _cache_data(cache_key, inf_dct, init_basis_ene_dct, chn_basis_ene_dct)
+
     return inf_dct, chn_basis_ene_dct
 
 
+def clear_data_cache():
+    """ Remove all of the species and TS data stored during the run,
+        so that it is read from the SAVE filesystem again.
+    """
+    _DATA_CACHE.clear()
+
+
+def _data_cache_key(name, *args):
+    """ Key for the data of a species or TS, built from its name and
+        the models, filesystems, and conformer locs used to read it
+    """
+    return (name, repr(args))
+
+
+def _cache_data(cache_key, inf_dct, init_basis_ene_dct, chn_basis_ene_dct):
+    """ Store a copy of the data read for a species or TS, along with any
+        basis species energies that were calculated while reading it
+    """
+    new_basis_ene_dct = {
+        name: basis_ene for name, basis_ene in chn_basis_ene_dct.items()
+        if name not in init_basis_ene_dct}
+    _DATA_CACHE[cache_key] = (copy.deepcopy(inf_dct), new_basis_ene_dct)
+
+
+def _cached_data(cache_key, name, chn_basis_ene_dct):
+    """ Get a copy of the data stored for a species or TS, adding the
+        basis species energies calculated for it into chn_basis_ene_dct
+    """
+
+    ioprinter.info_message(
+        f'Using filesystem info already read for {name}')
+    inf_dct, new_basis_ene_dct = _DATA_CACHE[cache_key]
+    for basis_name, basis_ene in new_basis_ene_dct.items():
+        if basis_name not in chn_basis_ene_dct:
+            chn_basis_ene_dct[basis_name] = basis_ene
+
+    return copy.deepcopy(inf_dct), chn_basis_ene_dct
+
+
 # Data Readers
 def atm_data(spc_dct, spc_name,
              pes_mod_dct_i, spc_mod_dct_i,
@@ -700,66 +764,36 @@ def tau_data(spc_dct_i,
 
     db_style = 'jsondb'
     vib_model = spc_mod_dct_i['vib']['mod']
-    if vib_model == 'tau':
-        if db_style == 'directory':
-            tau_locs = [locs for locs in tau_save_fs[-1].existing()
-                        if tau_save_fs[-1].file.hessian.exists(locs)]
-        elif db_style == 'jsondb':
-            tau_locs = [locs for locs in tau_save_fs[-1].json_existing()
-                        if tau_save_fs[-1].json.hessian.exists(locs)]
-    else:
-        if db_style == 'directory':
-            tau_locs = tau_save_fs[-1].existing()
-        elif db_style == 'jsondb':
-            tau_locs = tau_save_fs[-1].json_existing()
+    tau_locs = filesys.taupf.saved_locs(
+        tau_save_fs, db_style=db_style, with_hessian=(vib_model == 'tau'))
 
+    # Read the data for all of the samples in a single pass for each type
     ioprinter.info_message(
         'Reading data for the Monte Carlo samples from db.json'
         f'at path {tau_save_fs[0].path()}')
-    samp_geoms, samp_enes, samp_grads, samp_hessians = [], [], [], []
-    tot_locs = len(tau_locs)
-    for idx, locs in enumerate(tau_locs):
-
-        if db_style == 'directory':
-            geo = tau_save_fs[-1].file.geometry.read(locs)
-        elif db_style == 'jsondb':
-            geo = tau_save_fs[-1].json.geometry.read(locs)
-
-        # geo_str = autofile.data_types.swrite.geometry(geo)
-        samp_geoms.append(geo)
-
-        if db_style == 'directory':
-            tau_ene = tau_save_fs[-1].file.energy.read(locs)
-        elif db_style == 'jsondb':
-            tau_ene = tau_save_fs[-1].json.energy.read(locs)
-        rel_ene = (tau_ene - min_cnf_ene) * phycon.EH2KCAL
-        # ene_str = autofile.data_types.swrite.energy(rel_ene)
-        samp_enes.append(rel_ene)
-
-        if vib_model == 'tau':
-            if db_style == 'directory':
-                grad = tau_save_fs[-1].file.gradient.read(locs)
-            elif db_style == 'jsondb':
-                grad = tau_save_fs[-1].json.gradient.read(locs)
-            # grad_str = autofile.data_types.swrite.gradient(grad)
-            samp_grads.append(grad)
-
-            if db_style == 'directory':
-                hess = tau_save_fs[-1].file.hessian.read(locs)
-            elif db_style == 'jsondb':
-                hess = tau_save_fs[-1].json.hessian.read(locs)
-            # hess_str = autofile.data_types.swrite.hessian(hess)
-            samp_hessians.append(hess)
-       
-        # Print progress message (every 150 geoms read)
-        if idx % 149 == 0:
-            print(f'Read {idx+1}/{tot_locs} samples...')
-
-    # Determine the successful conformer ratio
+    samp_geoms = list(filesys.taupf.saved_data(
+        tau_save_fs, tau_locs, 'geometry', db_style=db_style))
+    tau_enes = filesys.taupf.saved_data(
+        tau_save_fs, tau_locs, 'energy', db_style=db_style)
+    samp_enes = [(tau_ene - min_cnf_ene) * phycon.EH2KCAL
+                 for tau_ene in tau_enes]
+    samp_grads, samp_hessians = [], []
+    if vib_model == 'tau':
+        samp_grads = list(filesys.taupf.saved_data(
+            tau_save_fs, tau_locs, 'gradient', db_style=db_style))
+        samp_hessians = list(filesys.taupf.saved_data(
+            tau_save_fs, tau_locs, 'hessian', db_style=db_style))
+    print(f'Read {len(tau_locs)} samples...')
+
+    # Determine the successful conformer ratio and the convergence of the PF
+    conv_dct = filesys.taupf.pf_convergence(tau_enes, min_cnf_ene)
     inf_obj = tau_save_fs[0].file.info.read()
     excluded_volume_factor = len(samp_geoms) / inf_obj.nsamp
     print('excluded volume factor test:',
           excluded_volume_factor, len(samp_geoms), inf_obj.nsamp)
+    for temp, rel_err in zip(conv_dct['temps'], conv_dct['rel_err']):
+        ioprinter.info_message(
+            f'Relative error of MC PF at {temp:.0f} K: {rel_err:.4f}')
 
     # Create info dictionary
     keys = ['geom', 'sym_factor', 'elec_levels',
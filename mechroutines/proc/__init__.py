@@ -3,9 +3,11 @@
 
 from mechroutines.proc.tsk import run_tsk
 from mechroutines.proc._util import write_missing_data_report
+from mechroutines.proc._util import write_job_ledger_report
 
 
 __all__ = [
     'run_tsk',
-    'write_missing_data_report'
+    'write_missing_data_report',
+    'write_job_ledger_report'
 ]
@@ -361,6 +361,40 @@ def partition_function(
     )
 
 
+def tau_convergence(
+        spc_name, spc_dct_i, spc_mod_dct_i,
+        pes_mod_dct_i,
+        locs, cnf_fs, run_prefix, save_prefix):
+    """ collect the convergence of the Monte Carlo partition function
+        of the tau samples at the thermo temperatures
+    """
+
+    spc_info = sinfo.from_dct(spc_dct_i)
+    thy_info = spc_mod_dct_i['vib']['geolvl'][1][1]
+    mod_thy_info = tinfo.modify_orb_label(thy_info, spc_info)
+
+    _, tau_save_fs = filesys.build_fs(
+        run_prefix, save_prefix, 'TAU',
+        spc_locs=spc_info, thy_locs=mod_thy_info[1:])
+
+    temps = pes_mod_dct_i['therm_temps']
+    ref_ene = filesys.read.energy(cnf_fs, locs, mod_thy_info)
+    if ref_ene is None or not tau_save_fs[0].exists():
+        miss_data = (spc_name + '_'.join(locs), mod_thy_info, 'tau')
+        conv_row = [tau_save_fs[0].path(), None, None,
+                    *[None for _ in temps]]
+    else:
+        ioprinter.reading('Tau samples', tau_save_fs[0].path())
+        conv_dct = filesys.taupf.assess(tau_save_fs, ref_ene, temps=temps)
+        miss_data = None
+        conv_row = [tau_save_fs[0].path(), conv_dct['nsamp'],
+                    conv_dct['ratio'], *conv_dct['rel_err']]
+
+    col_array = [f'Rel. Error {temp:.0f} K' for temp in temps]
+
+    return (col_array, conv_row), miss_data
+
+
 def messpf_input(
         spc_name, spc_dct_i, spc_mod_dct_i,
         pes_mod_dct_i,
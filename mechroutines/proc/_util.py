@@ -5,6 +5,7 @@ import os
 import pandas
 import ioformat
 import automol
+import autofile
 from autofile import io_ as io
 from mechanalyzer.inf import spc as sinfo
 from mechanalyzer.inf import thy as tinfo
@@ -255,6 +256,12 @@ def write_csv_data(tsk, csv_data, filelabel, col_array, prefix):
         all_data = '\n'.join(spc_data for spc_data in csv_data.values())
         io.write_file(filelabel, all_data)
 
+    elif 'tau_conv' in tsk:
+        dframe = pandas.DataFrame.from_dict(
+            csv_data, orient='index',
+            columns=['Path', 'Samples', 'Ratio', *col_array])
+        dframe.to_csv(filelabel, float_format='%.5f')
+
     elif 'pf' in tsk:
         dframe = pandas.DataFrame.from_dict(
             csv_data, orient='index',
@@ -277,6 +284,29 @@ def write_missing_data_report(miss_data):
         print(f'{name:<20s}{method:<12s}{basis:<12s}{dat:<12s}')
 
 
+def write_job_ledger_report():
+    """ Write a summary of the jobs recorded in the job ledger, if one is
+        being kept, after marking the jobs abandoned by dead processes
+        on this host
+    """
+
+    if not filesys.ledger.is_active():
+        return
+
+    filesys.ledger.mark_stale()
+
+    print('\n\n\nJobs Recorded in the Job Ledger')
+    print(f'{"Status":<12s}{"Count":<12s}')
+    for job_status, count in sorted(filesys.ledger.summary().items()):
+        print(f'{job_status:<12s}{count:<12d}')
+
+    print(f'\n{"Status":<12s}{"Job":<16s}{"Host":<20s}{"Path"}')
+    for job_status in (filesys.ledger.RUNNING, filesys.ledger.STALE,
+                       str(autofile.schema.RunStatus.FAILURE)):
+        for path, job, host, _, _ in filesys.ledger.jobs(job_status):
+            print(f'{job_status:<12s}{job:<16s}{str(host):<20s}{path}')
+
+
 def write_data_dirs(data_dirs, prefix):
     """ write a series of data files for similar typ in a directory
     """
@@ -368,6 +398,10 @@ def get_file_label(tsk, model_dct, proc_keyword_dct, spc_mod_dct_i):
     elif 'messpf_inp' in tsk:
         filelabel = 'messpf_input_global'
         filelabel += '.txt'
+    elif 'tau_conv' in tsk:
+        filelabel = 'tau_conv'
+        filelabel += f'_m{spc_mod_dct_i["vib"]["geolvl"][0]}'
+        filelabel += '.csv'
     elif 'pf' in tsk:
         filelabel = 'pf_global'
         filelabel += '.csv'
@@ -161,6 +161,15 @@ def run_tsk(tsk, obj_queue,
                     print(csv_data_i)
                     csv_data[label] = csv_data_i
 
+                elif 'tau_conv' in tsk:
+                    ret = collect.tau_convergence(
+                        spc_name, spc_dct_i, spc_mod_dct_i,
+                        pes_mod_dct_i, locs,
+                        cnf_fs, run_prefix, save_prefix)
+                    csv_data_i, miss_data_i = ret
+                    csv_data[label] = csv_data_i[1]
+                    col_array = csv_data_i[0]
+
                 elif 'pf' in tsk:
                     ret = collect.partition_function(
                         spc_name, spc_dct_i, spc_mod_dct_i,
@@ -2,6 +2,7 @@
 """
 
 import autorun
+from autorun import execute_function_in_parallel
 from automol.inchi import formula_string as fstring
 import thermfit
 from mechlib import filesys
@@ -49,23 +50,43 @@ def run_messpf_task(
         run_messpf_tsk, spc_locs_dct, spc_dct,
         thm_paths_dct):
     """ Run messpf input file
+
+        The MESSPF runs for all species, conformer locs, and models are
+        independent, so they are run on a pool of `nprocs` processes.
+        The partition functions are combined once all of the runs finish.
     """
     ioprinter.messpf('run_header')
 
     spc_mods, _ = parser.models.extract_models(run_messpf_tsk)
+    nprocs = run_messpf_tsk[-1]['nprocs']
 
+    # Run MESSPF for all requested species, locs, and models
+    messpf_paths = ()
     for spc_name in spc_locs_dct:
         ioprinter.therm_paths_messpf_run_locations(
             spc_name, spc_locs_dct[spc_name], spc_mods, thm_paths_dct)
-        # Run MESSPF for all requested models, combine the PFS at the end
-        ioprinter.message(f'Run MESSPF: {spc_name}', newline=1)
+        for spc_locs in spc_locs_dct[spc_name]:
+            for spc_mod in spc_mods:
+                messpf_path = (
+                    thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0])
+                if messpf_path not in messpf_paths:
+                    messpf_paths += (messpf_path,)
+
+    if messpf_paths:
+        nprocs = max(min(nprocs, len(messpf_paths)), 1)
+        ioprinter.message(
+            f'Running {len(messpf_paths)} MESSPF jobs '
+            f'on {nprocs} processes', newline=1)
+        execute_function_in_parallel(
+            _run_messpf, messpf_paths, (), nprocs=nprocs)
+
+    # Combine the PFS of the models for each species
+    for spc_name in spc_locs_dct:
+        ioprinter.message(f'Combine MESSPF: {spc_name}', newline=1)
         _locs_pfs = []
         for spc_locs in spc_locs_dct[spc_name]:
             _mod_pfs = []
             for spc_mod in spc_mods:
-                autorun.run_script(
-                    autorun.SCRIPT_DCT['messpf'],
-                    thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0])
                 _mod_pfs.append(
                     reader.mess.messpf(
                         thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0]))
@@ -83,6 +104,18 @@ def run_messpf_task(
             _locs_pfs.append(final_pf)
 
 
+def _run_messpf(messpf_paths, output_queue=None):
+    """ Run MESSPF in each of the paths handed to a worker process
+    """
+    ran_paths = ()
+    try:
+        for messpf_path in messpf_paths:
+            autorun.run_script(autorun.SCRIPT_DCT['messpf'], messpf_path)
+            ran_paths += (messpf_path,)
+    finally:
+        output_queue.put((ran_paths,))
+
+
 def produce_boltzmann_weighted_conformers_pf(
         run_messpf_tsk, spc_locs_dct, spc_dct,
         thm_paths_dct):
@@ -231,41 +264,69 @@ def get_heats_of_formation(
 
 def nasa_polynomial_task(
         mdriver_path, spc_locs_dct, thm_paths_dct, spc_dct,
-        spc_mod_dct, spc_mods, sort_info_lst, ref_scheme):
+        spc_mod_dct, spc_mods, sort_info_lst, ref_scheme, nprocs=1):
     """ generate the nasa polynomials
+
+        The ThermP+PAC99 fits for each species and set of conformer locs
+        are run concurrently on up to `nprocs` processes. The CHEMKIN
+        strings are then assembled in the order of the species queue, so
+        the result does not depend on the order the fits finish in. A fit
+        that fails does not stop the other fits: every failed fit is
+        reported with its species once all of them have finished, and an
+        error is then raised, as in a serial run.
     """
+    ckin_path = output_path('CKIN', prefix=mdriver_path)
+
+    # Gather the fits for each set of locs and the combined locs
+    fit_lst = ()
+    for spc_name in spc_locs_dct:
+        for idx, spc_locs in enumerate(spc_locs_dct[spc_name], start=1):
+            fit_lst += ((spc_name, idx,
+                         thm_paths_dct[spc_name][tuple(spc_locs)]['mod_total'],
+                         idx-1),)
+        fit_lst += ((spc_name, 0,
+                     thm_paths_dct[spc_name]['spc_total'],
+                     'final'),)
+
+    # Run the fits to get the polynomial strings
+    poly_str_dct = {}
+    if fit_lst:
+        nprocs = max(min(nprocs, len(fit_lst)), 1)
+        args = (spc_dct, ','.join(spc_mods))
+        poly_str_dct_lst = execute_function_in_parallel(
+            _build_polynomials, fit_lst, args, nprocs=nprocs)
+        for _poly_str_dct in poly_str_dct_lst:
+            poly_str_dct.update(_poly_str_dct)
+
+    # Report the fits that failed or were lost with their worker
+    failed_lst = ()
+    for spc_name, idx, _, spc_locs_idx in fit_lst:
+        poly_str, err = poly_str_dct.get(
+            (spc_name, idx), (None, 'no result returned by the worker'))
+        if poly_str is None:
+            ioprinter.error_message(
+                f'NASA polynomial fit failed for {spc_name}',
+                f'(locs {spc_locs_idx}): {err}')
+            failed_lst += (f'{spc_name} (locs {spc_locs_idx})',)
+    if failed_lst:
+        raise RuntimeError(
+            'NASA polynomial fits failed for: ' + ', '.join(failed_lst))
+
+    # Assemble the CHEMKIN strings in species order
     ckin_nasa_str_dct = {}
     ckin_nasa_str_dct[0] = ''
-    ckin_path = output_path('CKIN', prefix=mdriver_path)
     for spc_name in spc_locs_dct:
         for idx, spc_locs in enumerate(spc_locs_dct[spc_name], start=1):
             if idx not in ckin_nasa_str_dct:
                 ckin_nasa_str_dct[idx] = ''
             spc_locs = tuple(spc_locs)
             ioprinter.nasa('calculate', spc_name)
-            # for spc_mod in spc_mods:
-            #     ioprinter.message('for: ', spc_locs, spc_mod)
-            #     # Write the header describing the models used in thermo calcs
-            #     ckin_nasa_str += writer.ckin.model_header(
-            #         [spc_mod], spc_mod_dct, refscheme=ref_scheme)
-            #     # Build and write NASA polynomial in CHEMKIN-format string
-            #     # Call dies if you haven't run "write mess" task
-            #     ckin_nasa_str += nasapoly.build_polynomial(
-            #         spc_name, spc_dct,
-            #         thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0],
-            #         thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][1],
-            #         spc_locs=spc_locs, spc_mod=spc_mod)
-            #     ckin_nasa_str += '\n\n'
             ioprinter.message('for: ', spc_locs, ' combined models')
             ckin_nasa_str_dct[idx] += writer.ckin.model_header(
                 spc_mods, spc_mod_dct,
                 sort_info_lst=sort_info_lst,
                 refscheme=ref_scheme)
-            ckin_nasa_str_dct[idx] += nasapoly.build_polynomial(
-                spc_name, spc_dct,
-                thm_paths_dct[spc_name][tuple(spc_locs)]['mod_total'][0],
-                thm_paths_dct[spc_name][tuple(spc_locs)]['mod_total'][1],
-                spc_locs_idx=idx-1, spc_mod=','.join(spc_mods))
+            ckin_nasa_str_dct[idx] += poly_str_dct[(spc_name, idx)][0]
             ckin_nasa_str_dct[idx] += '\n\n'
             ioprinter.info_message('CKIN NASA STR\n')
             ioprinter.info_message(ckin_nasa_str_dct[idx])
@@ -274,12 +335,30 @@ def nasa_polynomial_task(
             spc_mods, spc_mod_dct,
             sort_info_lst=sort_info_lst,
             refscheme=ref_scheme)
-        ckin_nasa_str_dct[0] += nasapoly.build_polynomial(
-            spc_name, spc_dct,
-            thm_paths_dct[spc_name]['spc_total'][0],
-            thm_paths_dct[spc_name]['spc_total'][1],
-            spc_locs_idx='final', spc_mod=','.join(spc_mods))
+        ckin_nasa_str_dct[0] += poly_str_dct[(spc_name, 0)][0]
         ckin_nasa_str_dct[0] += '\n\n'
         ioprinter.info_message('CKIN NASA STR\n')
         ioprinter.info_message(ckin_nasa_str_dct[0])
     return ckin_nasa_str_dct, ckin_path
+
+
+def _build_polynomials(spc_dct, spc_mod, fit_lst, output_queue=None):
+    """ Run the ThermP+PAC99 fits handed to a worker process
+
+        :param fit_lst: (spc name, ckin idx, (pf path, nasa path), locs idx)
+        :returns: (polynomial string, None), or (None, error) for a fit
+            that failed, for each (spc name, ckin idx)
+    """
+    poly_str_dct = {}
+    try:
+        for spc_name, idx, (pf_path, nasa_path), spc_locs_idx in fit_lst:
+            try:
+                poly_str = nasapoly.build_polynomial(
+                    spc_name, spc_dct, pf_path, nasa_path,
+                    spc_locs_idx=spc_locs_idx, spc_mod=spc_mod)
+                poly_str_dct[(spc_name, idx)] = (poly_str, None)
+            except Exception as err:  # pylint: disable=broad-except
+                poly_str_dct[(spc_name, idx)] = (
+                    None, f'{type(err).__name__}: {err}')
+    finally:
+        output_queue.put((poly_str_dct,))
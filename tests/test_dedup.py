@@ -0,0 +1,108 @@
+""" Test the batched screening of conformer duplicates against the
+    loops over all saved conformers that it replaces
+"""
+
+import numpy
+import automol
+from mechlib.filesys import dedup
+
+
+SYMBS = ('C', 'C', 'O', 'H', 'H', 'H', 'H', 'H', 'H')
+XYZS = numpy.array([
+    [0.000, 0.000, 0.000],
+    [2.874, 0.000, 0.000],
+    [3.731, 2.496, 0.000],
+    [-0.732, 1.935, 0.000],
+    [-0.732, -0.968, 1.676],
+    [-0.732, -0.968, -1.676],
+    [3.606, -0.968, 1.676],
+    [3.606, -0.968, -1.676],
+    [5.542, 2.496, 0.000]])
+
+
+def _geo(xyzs):
+    """ geometry from cartesian coordinates (bohr)
+    """
+    return automol.geom.from_data(SYMBS, xyzs, angstrom=False)
+
+
+def _old_geo_unique(geo, ene, seen_geos, seen_enes, zrxn=None):
+    """ loop formerly used by the conformer routines
+    """
+    if zrxn is None:
+        check_dct = {'dist': 0.3, 'tors': None}
+    else:
+        check_dct = {'dist': 0.3}
+
+    no_similar_energies = True
+    for sene in seen_enes:
+        if abs(sene - ene) < 1e-5:
+            no_similar_energies = False
+
+    if no_similar_energies:
+        unique = True
+    else:
+        unique, _ = automol.geom.is_unique(
+            geo, seen_geos, check_dct=check_dct)
+
+    return unique
+
+
+def _old_sym_unique(geo, ene, saved_geos, saved_enes, ethresh=1.0e-5):
+    """ loop formerly used by the conformer routines
+    """
+    sym_idx = None
+    new_saved_geos = []
+    idx_dct = {}
+    for i, (sene, sgeo) in enumerate(zip(saved_enes, saved_geos)):
+        if abs(ene - sene) < ethresh:
+            idx_dct[len(new_saved_geos)] = i
+            new_saved_geos.append(sgeo)
+    if new_saved_geos:
+        _, sym_idx = automol.geom.is_unique(
+            geo, new_saved_geos, check_dct={'coulomb': 1e-2})
+    if sym_idx is not None:
+        sym_idx = idx_dct[sym_idx]
+
+    return sym_idx
+
+
+def test__geo_unique():
+    """ test dedup.geo_unique
+    """
+
+    rng = numpy.random.default_rng(7)
+    ref_ene = -154.0
+    saved_geos = tuple(
+        _geo(XYZS + rng.normal(scale=scale, size=XYZS.shape))
+        for scale in (0.0, 0.05, 0.1, 0.2, 0.4, 0.8))
+    saved_enes = tuple(ref_ene + 2.0e-6 * idx
+                       for idx in range(len(saved_geos)))
+
+    for scale in (0.0, 0.02, 0.1, 0.3, 1.0):
+        geo = _geo(XYZS + rng.normal(scale=scale, size=XYZS.shape))
+        for ene in (ref_ene, ref_ene + 5.0e-6, ref_ene + 1.0e-3):
+            assert (dedup.geo_unique(geo, ene, saved_geos, saved_enes) ==
+                    _old_geo_unique(geo, ene, saved_geos, saved_enes))
+            assert (dedup.sym_unique(geo, ene, saved_geos, saved_enes) ==
+                    _old_sym_unique(geo, ene, saved_geos, saved_enes))
+
+
+def test__fingerprint_candidates():
+    """ test dedup.fingerprint_candidates at the threshold
+    """
+
+    geo = _geo(XYZS)
+
+    # Stretch one bond so a distance differs by exactly the threshold
+    xyzs = XYZS.copy()
+    xyzs[8, 0] += dedup.DIST_THRESH
+    edge_geo = _geo(xyzs)
+    xyzs = XYZS.copy()
+    xyzs[8, 0] += 4.0 * dedup.DIST_THRESH
+    far_geo = _geo(xyzs)
+
+    idxs = dedup.fingerprint_candidates(
+        geo, (geo, edge_geo, far_geo), dedup.DIST_THRESH)
+    assert tuple(idxs) == (0, 1)
+
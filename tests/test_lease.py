@@ -0,0 +1,116 @@
+""" Test the leases on work shared by several instances of MechDriver
+"""
+
+import os
+import time
+import tempfile
+from mechlib.filesys import lease
+
+
+def test__claim():
+    """ test lease.claim and Lease.release
+    """
+
+    lease.activate()
+    path = lease.task_lease_path(tempfile.mkdtemp(), 'task')
+
+    lease1 = lease.claim(path)
+    assert lease1 is not None
+    assert lease.is_held(path)
+    assert not lease.is_stale(path)
+
+    # The lease can only be held by one claim at a time
+    assert lease.claim(path) is None
+
+    with lease1:
+        assert lease.is_held(path)
+    assert not os.path.exists(path)
+    assert not lease.is_held(path)
+
+    lease2 = lease.claim(path)
+    assert lease2 is not None
+    lease2.release()
+
+    lease.deactivate()
+
+
+def test__expire():
+    """ test that a lease without heartbeats expires and can be reclaimed
+    """
+
+    lease.activate()
+    path = lease.task_lease_path(tempfile.mkdtemp(), 'task')
+
+    lease1 = lease.claim(path)
+    old_time = time.time() - lease.TIMEOUT - 1.0
+    os.utime(path, (old_time, old_time))
+    assert lease.is_stale(path)
+    assert not lease.is_held(path)
+
+    lease2 = lease.claim(path)
+    assert lease2 is not None
+    assert lease.is_held(path)
+
+    # The expired lease does not remove the lease that replaced it
+    lease1.release()
+    assert lease.is_held(path)
+    lease2.release()
+    assert not os.path.exists(path)
+
+    lease.deactivate()
+
+
+def test__done():
+    """ test Lease.mark_done and lease.is_done
+    """
+
+    lease.activate()
+    path = lease.task_lease_path(tempfile.mkdtemp(), 'task')
+
+    lease1 = lease.claim(path)
+    assert not lease.is_done(path)
+    lease1.mark_done()
+    lease1.release()
+    assert lease.is_done(path)
+    assert not lease.is_held(path)
+
+    lease.deactivate()
+
+    # No files are written unless leases are active
+    path = os.path.join(tempfile.mkdtemp(), 'task.lease')
+    lease1 = lease.claim(path)
+    lease1.mark_done()
+    lease1.release()
+    assert not os.path.exists(path)
+    assert not lease.is_done(path)
+
+
+def test__session():
+    """ test that done marks only count in the session they were made in
+    """
+
+    lease.activate()
+    run_prefix = tempfile.mkdtemp()
+    path = lease.task_lease_path(run_prefix, 'task')
+
+    session1 = lease.start_session(run_prefix)
+    lease1 = lease.claim(path)
+    lease1.mark_done()
+    lease1.release()
+    assert lease.is_done(path)
+
+    # An instance started while another is running joins its session
+    inst1 = lease._LEASES['instance']  # pylint: disable=protected-access
+    lease._LEASES['instance'] = None  # pylint: disable=protected-access
+    assert lease.start_session(run_prefix) == session1
+    assert lease.is_done(path)
+    lease.end_session()
+    inst1.release()
+
+    # Running again once all instances have finished starts a new session
+    session2 = lease.start_session(run_prefix)
+    assert session2 != session1
+    assert not lease.is_done(path)
+    lease.end_session()
+
+    lease.deactivate()
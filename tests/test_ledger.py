@@ -0,0 +1,115 @@
+""" Test the ledger of electronic structure jobs
+"""
+
+import os
+import tempfile
+import multiprocessing
+import autofile
+from mechlib.filesys import ledger
+
+
+RUNNING = str(autofile.schema.RunStatus.RUNNING)
+SUCCESS = str(autofile.schema.RunStatus.SUCCESS)
+FAILURE = str(autofile.schema.RunStatus.FAILURE)
+
+
+def _record_start(run_prefix, path, job):
+    """ record a job from a process that then exits
+    """
+    ledger.activate(run_prefix)
+    ledger.record_start(path, job, RUNNING)
+
+
+def test__status():
+    """ test ledger.status, ledger.statuses, ledger.jobs and ledger.summary
+    """
+
+    run_prefix = tempfile.mkdtemp()
+    path1 = os.path.join(run_prefix, 'SPC', 'RUN', 'OPT')
+    path2 = os.path.join(run_prefix, 'SPC', 'RUN', 'HESS')
+    path3 = os.path.join(run_prefix, 'SPC_2', 'RUN', 'OPT')
+
+    # Nothing is recorded until the ledger is activated
+    ledger.record_start(path1, 'optimization', RUNNING)
+    assert ledger.status(path1, 'optimization') is None
+
+    ledger.activate(run_prefix)
+    ledger.record_start(path1, 'optimization', RUNNING)
+    ledger.record_start(path2, 'hessian', RUNNING)
+    ledger.record_start(path3, 'optimization', RUNNING)
+    ledger.record_end(path2, 'hessian', SUCCESS)
+    ledger.record_end(path3, 'optimization', FAILURE)
+
+    assert ledger.status(path1, 'optimization') == RUNNING
+    assert ledger.status(path2, 'hessian') == SUCCESS
+    assert ledger.status(path2, 'optimization') is None
+    assert ledger.statuses(os.path.join(run_prefix, 'SPC')) == {
+        path1: RUNNING, path2: SUCCESS}
+    assert ledger.statuses(run_prefix, job='optimization') == {
+        path1: RUNNING, path3: FAILURE}
+    assert tuple(row[0] for row in ledger.jobs(FAILURE)) == (path3,)
+    assert ledger.summary() == {RUNNING: 1, SUCCESS: 1, FAILURE: 1}
+
+    ledger.deactivate()
+
+
+def test__mark_stale():
+    """ test ledger.mark_stale
+    """
+
+    run_prefix = tempfile.mkdtemp()
+    live_path = os.path.join(run_prefix, 'LIVE', 'RUN', 'OPT')
+    dead_path = os.path.join(run_prefix, 'DEAD', 'RUN', 'OPT')
+
+    # Job left running by a process that has exited
+    proc = multiprocessing.Process(
+        target=_record_start,
+        args=(run_prefix, dead_path, 'optimization'))
+    proc.start()
+    proc.join()
+
+    ledger.activate(run_prefix)
+    ledger.record_start(live_path, 'optimization', RUNNING)
+
+    assert ledger.mark_stale() == ((dead_path, 'optimization'),)
+    assert ledger.status(dead_path, 'optimization') == ledger.STALE
+    assert ledger.status(live_path, 'optimization') == RUNNING
+    assert not ledger.mark_stale()
+
+    ledger.deactivate()
+
+
+def test__hosts(monkeypatch):
+    """ test that each host writes to its own ledger and that the latest
+        record of a job over all of the ledgers is read
+    """
+
+    run_prefix = tempfile.mkdtemp()
+    path1 = os.path.join(run_prefix, 'SPC', 'RUN', 'OPT')
+    path2 = os.path.join(run_prefix, 'SPC', 'RUN', 'HESS')
+
+    monkeypatch.setattr(ledger.socket, 'gethostname', lambda: 'node1')
+    ledger.activate(run_prefix)
+    ledger.record_start(path1, 'optimization', RUNNING)
+    ledger.record_end(path1, 'optimization', FAILURE)
+
+    # The job is rerun on another host
+    monkeypatch.setattr(ledger.socket, 'gethostname', lambda: 'node2')
+    ledger.activate(run_prefix)
+    ledger.record_start(path1, 'optimization', RUNNING)
+    ledger.record_end(path1, 'optimization', SUCCESS)
+    ledger.record_start(path2, 'hessian', RUNNING)
+
+    assert sorted(os.listdir(os.path.join(run_prefix, ledger.LEDGER_DIR))) == [
+        'node1.sqlite', 'node2.sqlite']
+    assert ledger.status(path1, 'optimization') == SUCCESS
+    assert ledger.summary() == {SUCCESS: 1, RUNNING: 1}
+    assert not ledger.jobs(FAILURE)
+
+    # Only the jobs of this host are checked for dead processes
+    monkeypatch.setattr(ledger.socket, 'gethostname', lambda: 'node1')
+    ledger.activate(run_prefix)
+    assert not ledger.mark_stale()
+    assert ledger.status(path2, 'hessian') == RUNNING
+
+    ledger.deactivate()
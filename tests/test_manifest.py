@@ -0,0 +1,49 @@
+""" Test the manifest of the saved jobs of the run filesystem
+"""
+
+import os
+import tempfile
+from mechlib.filesys import manifest
+
+
+def _write(path, out_str):
+    """ write an output file
+    """
+    with open(path, 'w', encoding='utf-8') as out_file:
+        out_file.write(out_str)
+
+
+def test__manifest():
+    """ test manifest.entry, manifest.is_saved, manifest.load and
+        manifest.dump
+    """
+
+    run_root = tempfile.mkdtemp()
+    save_path = tempfile.mkdtemp()
+    out_path = os.path.join(run_root, 'output.out')
+
+    # No record of a job without an output
+    man_dct = manifest.load(save_path)
+    assert not man_dct
+    key, sig = manifest.entry(run_root, out_path)
+    assert key == 'output.out'
+    assert sig is None
+    assert not manifest.is_saved(man_dct, key, sig)
+
+    # The job is skipped once it has been saved
+    _write(out_path, 'Optimization converged\n')
+    key, sig = manifest.entry(run_root, out_path)
+    assert not manifest.is_saved(man_dct, key, sig)
+    man_dct[key] = sig
+    manifest.dump(save_path, man_dct)
+
+    man_dct = manifest.load(save_path)
+    assert manifest.is_saved(man_dct, *manifest.entry(run_root, out_path))
+
+    # The job is saved again once it is rerun
+    _write(out_path, 'Optimization converged after a rerun\n')
+    assert not manifest.is_saved(man_dct, *manifest.entry(run_root, out_path))
+
+    # An unreadable manifest is treated as empty
+    _write(os.path.join(save_path, manifest.MANIFEST_NAME), '{')
+    assert not manifest.load(save_path)
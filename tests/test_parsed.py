@@ -0,0 +1,56 @@
+""" Test the sidecar cache of quantities parsed from job outputs
+"""
+
+import os
+import tempfile
+from mechlib.filesys import parsed
+
+
+OUT_STR = 'Final energy is -100.0\n'
+NEW_OUT_STR = 'Final energy is -100.5\n'
+
+
+def _reader(calls):
+    """ reader that records each output it parses
+    """
+    def _read(_prog, _method, out_str):
+        calls.append(out_str)
+        return float(out_str.split()[-1])
+    return _read
+
+
+def test__sidecar(monkeypatch):
+    """ test ParsedOutput.get and ParsedOutput.parse
+    """
+
+    calls = []
+    monkeypatch.setitem(parsed.READER_DCT, 'energy', _reader(calls))
+    run_path = tempfile.mkdtemp()
+    sc_path = os.path.join(run_path, parsed.SIDECAR_NAME)
+
+    # Getting a quantity does not write the sidecar
+    rec = parsed.ParsedOutput(run_path, 'psi4', 'hf', OUT_STR)
+    assert rec.get('energy') == -100.0
+    assert rec.get('energy') == -100.0
+    assert calls == [OUT_STR]
+    assert not os.path.exists(sc_path)
+
+    # Parsing writes every quantity parsed so far at once
+    assert rec.parse(('energy',)) == (-100.0,)
+    assert os.path.exists(sc_path)
+    mtime = os.stat(sc_path).st_mtime_ns
+    assert rec.parse(('energy',)) == (-100.0,)
+    assert os.stat(sc_path).st_mtime_ns == mtime
+
+    # The sidecar is read back for the same output
+    rec = parsed.ParsedOutput(run_path, 'psi4', 'hf', OUT_STR)
+    assert rec.parse(('energy',)) == (-100.0,)
+    assert calls == [OUT_STR]
+
+    # The sidecar is rebuilt for a new output
+    rec = parsed.ParsedOutput(run_path, 'psi4', 'hf', NEW_OUT_STR)
+    assert rec.parse(('energy',)) == (-100.5,)
+    assert calls == [OUT_STR, NEW_OUT_STR]
+    rec = parsed.ParsedOutput(run_path, 'psi4', 'hf', NEW_OUT_STR)
+    assert rec.get('energy') == -100.5
+    assert calls == [OUT_STR, NEW_OUT_STR]
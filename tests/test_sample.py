@@ -0,0 +1,84 @@
+""" Test the placement of the torsions of the sample Z-Matrices
+"""
+
+import tempfile
+import numpy
+import automol
+from mechroutines.es._routines import _sample as sampling
+
+
+# 1-pentanol
+ICH = 'InChI=1S/C5H12O/c1-2-3-4-5-6/h6H,2-5H2,1H3'
+
+
+def test__unit_points():
+    """ test _sample.unit_points
+    """
+
+    # Halton sequence in bases 2 and 3
+    pnts = sampling.unit_points(2, range(3), samp_strategy='halton')
+    assert numpy.allclose(
+        pnts, [[1/2, 1/3], [1/4, 2/3], [3/4, 1/9]])
+
+    # Each Latin hypercube of nsamp points has one point in every stratum
+    pnts = sampling.unit_points(3, range(12), samp_strategy='lhs', nsamp=6)
+    for blk in (pnts[:6], pnts[6:]):
+        for dim in range(3):
+            assert sorted(numpy.floor(blk[:, dim] * 6).astype(int)) == list(
+                range(6))
+
+
+def test__restart():
+    """ test that a restarted search continues the sequence of samples
+    """
+
+    for samp_strategy in ('halton', 'lhs'):
+        for seed in (None, 11):
+            pnts = sampling.unit_points(
+                3, range(12), samp_strategy=samp_strategy,
+                nsamp=6, seed=seed)
+            restart_pnts = numpy.vstack((
+                sampling.unit_points(
+                    3, range(4), samp_strategy=samp_strategy,
+                    nsamp=6, seed=seed),
+                sampling.unit_points(
+                    3, range(4, 12), samp_strategy=samp_strategy,
+                    nsamp=6, seed=seed)))
+            assert numpy.allclose(pnts, restart_pnts)
+
+    # The index of the next point is saved for each strategy
+    path = tempfile.mkdtemp()
+    assert sampling.next_index(path, 'lhs') == 0
+    assert sampling.next_index(path, 'lhs', default=4) == 4
+    sampling.save_next_index(path, 'lhs', 7)
+    sampling.save_next_index(path, 'halton', 3)
+    assert sampling.next_index(path, 'lhs', default=4) == 7
+    assert sampling.next_index(path, 'halton') == 3
+    assert sampling.next_index(path, 'random') == 0
+
+
+def test__repulsion_screen():
+    """ test that _sample.RepulsionScreen never rejects a sample that
+        passes the automol repulsion check
+    """
+
+    zma = automol.geom.zmatrix(automol.inchi.geometry(ICH))
+    ref_pot = automol.pot.intramol_interaction_potential_sum(
+        automol.zmat.geometry(zma))
+
+    # Sample every dihedral, which gives many badly clashing structures
+    tors_range_dct = {
+        name_row[2]: (0.0, 2.0*numpy.pi)
+        for name_row in automol.zmat.name_matrix(zma)[3:]}
+    screen = sampling.RepulsionScreen(zma, tors_range_dct)
+
+    for thresh in (10.0, 40.0, 100.0):
+        names, vals = sampling.torsion_values(
+            tors_range_dct, range(500), samp_strategy='halton')
+        low_rep_lst = screen.low_repulsion(vals, thresh)
+        for samp_zma, low_rep in zip(
+                sampling.zmas_from_values(zma, names, vals), low_rep_lst):
+            samp_pot = automol.pot.intramol_interaction_potential_sum(
+                automol.zmat.geometry(samp_zma))
+            if samp_pot - ref_pot <= thresh:
+                assert low_rep
@@ -0,0 +1,65 @@
+""" Test the table of the energies saved along a scan
+"""
+
+import os
+import tempfile
+import autofile
+from mechlib.filesys import scantab
+
+
+THY_LOCS = ('hf', 'sto-3g', 'R')
+NAMES = ('D5',)
+GRID = ((0.0,), (2.0944,), (4.1888,))
+
+
+def _save_energy(scn_fs, vals, ene):
+    """ save the energy of a scan point
+    """
+    locs = [NAMES, vals]
+    scn_fs[-1].create(locs)
+    sp_fs = autofile.fs.single_point(scn_fs[-1].path(locs))
+    sp_fs[-1].create(THY_LOCS)
+    sp_fs[-1].file.energy.write(ene, THY_LOCS)
+    return locs
+
+
+def test__energies():
+    """ test scantab.energies and scantab.update
+    """
+
+    scn_fs = autofile.fs.scan(tempfile.mkdtemp())
+    locs_lst = [_save_energy(scn_fs, vals, -100.0 - 0.01*idx)
+                for idx, vals in enumerate(GRID[:2])]
+    all_locs_lst = locs_lst + [[NAMES, GRID[2]]]
+    tab_path = scantab.table_path(scn_fs, locs_lst[0])
+
+    # Reading does not write the table
+    assert scantab.energies(scn_fs, all_locs_lst, THY_LOCS) == (
+        -100.0, -100.01, None)
+    assert not os.path.exists(tab_path)
+
+    # The energies are read from the table once it is built
+    scantab.update(scn_fs, locs_lst, THY_LOCS)
+    assert os.path.exists(tab_path)
+    sp_fs = autofile.fs.single_point(scn_fs[-1].path(locs_lst[0]))
+    os.remove(sp_fs[-1].file.energy.path(THY_LOCS))
+    assert scantab.energies(scn_fs, all_locs_lst, THY_LOCS) == (
+        -100.0, -100.01, None)
+    with open(tab_path, 'rb') as tab_file:
+        tab_str = tab_file.read()
+
+    # A new point invalidates the table, and the files are read instead
+    _save_energy(scn_fs, GRID[2], -100.02)
+    assert scantab.energies(scn_fs, all_locs_lst, THY_LOCS) == (
+        None, -100.01, -100.02)
+    with open(tab_path, 'rb') as tab_file:
+        assert tab_file.read() == tab_str
+
+    # Energies at other levels of theory are not in the table
+    assert scantab.energies(
+        scn_fs, all_locs_lst, ('mp2', 'sto-3g', 'R')) == (None, None, None)
+
+    # Rebuilding the table picks up all of the saved energies
+    scantab.update(scn_fs, all_locs_lst, THY_LOCS)
+    assert scantab.energies(scn_fs, all_locs_lst, THY_LOCS) == (
+        None, -100.01, -100.02)
@@ -0,0 +1,69 @@
+""" Test the convergence analysis of the Monte Carlo partition function
+    of the tau samples
+"""
+
+import numpy
+from phydat import phycon
+from mechlib.filesys import taupf
+
+
+REF_ENE = -154.0
+ENES = (-154.0, -153.9995, -153.999, -153.998, -153.996, -153.99)
+
+
+def _loop_pf_convergence(enes, ref_ene, temp):
+    """ sums formerly built one sample at a time at a single temperature
+    """
+    qsum, q2sum = 0.0, 0.0
+    for ene in enes:
+        rel_ene = (ene - ref_ene) * phycon.EH2KCAL
+        boltz = numpy.exp(-rel_ene * 349.7 / (0.695 * temp))
+        qsum += boltz
+        q2sum += boltz**2
+    nsamp = len(enes)
+    sigma = numpy.sqrt(abs(q2sum/nsamp - (qsum/nsamp)**2) / nsamp)
+    return qsum, q2sum, sigma, sigma*nsamp/qsum
+
+
+def test__pf_convergence():
+    """ test taupf.pf_convergence
+    """
+
+    conv_dct = taupf.pf_convergence(ENES, REF_ENE)
+    assert conv_dct['nsamp'] == len(ENES)
+    assert numpy.allclose(conv_dct['temps'], taupf.PF_TEMPS)
+    for idx, temp in enumerate(taupf.PF_TEMPS):
+        qsum, q2sum, sigma, rel_err = _loop_pf_convergence(
+            ENES, REF_ENE, temp)
+        assert numpy.isclose(conv_dct['qsum'][idx], qsum)
+        assert numpy.isclose(conv_dct['q2sum'][idx], q2sum)
+        assert numpy.isclose(conv_dct['sigma'][idx], sigma)
+        assert numpy.isclose(conv_dct['rel_err'][idx], rel_err)
+
+    # The error falls off as more samples are taken
+    conv_dct2 = taupf.pf_convergence(ENES * 4, REF_ENE)
+    assert numpy.allclose(conv_dct2['rel_err'], conv_dct['rel_err'] / 2.0)
+
+    # Identical samples give no error
+    conv_dct = taupf.pf_convergence((REF_ENE,) * 3, REF_ENE, temps=(300.,))
+    assert numpy.allclose(conv_dct['qsum'], 3.0)
+    assert numpy.allclose(conv_dct['rel_err'], 0.0)
+
+    # No samples
+    conv_dct = taupf.pf_convergence((), REF_ENE)
+    assert conv_dct['nsamp'] == 0
+    assert numpy.all(numpy.isinf(conv_dct['rel_err']))
+
+
+def test__add_samples():
+    """ test taupf.add_samples
+    """
+
+    conv_dct = taupf.pf_convergence(ENES, REF_ENE)
+    add_dct = taupf.pf_convergence((), REF_ENE)
+    for idx in range(0, len(ENES), 4):
+        add_dct = taupf.add_samples(add_dct, ENES[idx:idx+4], REF_ENE)
+
+    assert add_dct['nsamp'] == conv_dct['nsamp']
+    for key in ('qsum', 'q2sum', 'sigma', 'rel_err'):
+        assert numpy.allclose(add_dct[key], conv_dct[key])